@@ -0,0 +1,2 @@
+# Benchmark scripts for TalentTrek, run from the server directory with
+# `python -m benchmarks.<name>`.
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Track the cold import cost of the API (what a worker pays before serving).
+
+Imports the module in fresh interpreters under `python -X importtime`,
+reports the median total and the slowest top-level packages, and checks
+that the lazily loaded backends (scrapers, Supabase, plotting) stay out of
+startup. Exits non-zero when a lazy module is imported or the median is
+over --budget-ms, so it can gate CI.
+
+Usage:
+    python -m benchmarks.bench_import_time [--module src.api] [--runs 5] [--budget-ms 1500]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Packages that must only be imported on first use
+LAZY_PACKAGES = ("selenium", "webdriver_manager", "bs4", "supabase", "matplotlib", "seaborn", "pandas", "pyarrow")
+
+
+def import_times(module):
+    """Run one cold import; returns {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.api")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    totals = []
+    per_package = defaultdict(list)
+    loaded = set()
+    for _ in range(args.runs):
+        times = import_times(args.module)
+        totals.append(sum(self_us for self_us, _ in times.values()) / 1000)
+        package_us = defaultdict(int)
+        for name, (self_us, _) in times.items():
+            package_us[name.split(".")[0]] += self_us
+        for package, us in package_us.items():
+            per_package[package].append(us / 1000)
+        loaded.update(times)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f})")
+    print("\nSlowest top-level packages (median self time, ms):")
+    ranked = sorted(per_package.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, values in ranked[:args.top]:
+        print(f"  {package:<28} {statistics.median(values):8.1f}")
+
+    failed = False
+    eager = sorted(package for package in LAZY_PACKAGES
+                   if any(name == package or name.startswith(f"{package}.") for name in loaded))
+    if eager:
+        print(f"\nFAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\nFAIL: median {median:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
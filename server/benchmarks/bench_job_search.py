@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Measure /api/jobs/search query latency on a large synthetic job_postings table.
+
+Populates a database (a throwaway SQLite file by default, or the one given with
+--database-url) with synthetic postings through the regular bulk upsert path,
+then runs a fixed query mix through search_job_postings and prints latency
+percentiles per query.
+
+Usage:
+    python -m benchmarks.bench_job_search --rows 1000000
+    python -m benchmarks.bench_job_search --database-url postgresql://... --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data.job_store import upsert_job_postings, upsert_sources
+from src.data.models import Base, JobPosting
+from src.data.search import search_job_postings
+
+TITLES = ["Python Developer", "Data Engineer", "Backend Engineer", "Frontend Developer", "DevOps Engineer",
+          "Machine Learning Engineer", "QA Engineer", "Product Manager", "Site Reliability Engineer",
+          "Full Stack Developer", "Data Scientist", "Security Engineer"]
+LEVELS = ["", "Junior ", "Senior ", "Staff ", "Lead ", "Principal "]
+LOCATIONS = ["Remote", "New York, NY", "Berlin", "London", "Austin, TX", "Toronto", "Paris", "Remote, US"]
+WORDS = ("django fastapi flask postgres kubernetes docker aws gcp spark kafka airflow react typescript "
+         "terraform pandas numpy pytorch rust golang java scala graphql redis celery linux ci cd").split()
+
+QUERIES = [
+    ("common term", {"query": "engineer"}),
+    ("two terms", {"query": "senior python"}),
+    ("rare term", {"query": "principal security"}),
+    ("description term", {"query": "kafka airflow"}),
+    ("with source filter", {"query": "developer", "source": "bench_b"}),
+    ("with location filter", {"query": "data", "location": "berlin"}),
+]
+
+SOURCES = [
+    {"id": "bench_a", "name": "Bench A", "search_url": "https://a.example.com/"},
+    {"id": "bench_b", "name": "Bench B", "search_url": "https://b.example.com/"},
+]
+
+
+def populate(session, rows, batch_size, seed=7):
+    rng = random.Random(seed)
+    source_ids = upsert_sources(session, SOURCES)
+    session.commit()
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        jobs = []
+        for idx in range(offset, min(rows, offset + batch_size)):
+            jobs.append({
+                "title": rng.choice(LEVELS) + rng.choice(TITLES),
+                "company": f"Company {rng.randint(1, 20000)}",
+                "location": rng.choice(LOCATIONS),
+                "salary": f"${rng.randint(60, 220)},000",
+                "description": " ".join(rng.choice(WORDS) for _ in range(30)),
+                "url": f"https://jobs.example.com/{idx}",
+            })
+        upsert_job_postings(session, jobs, source_id=source_ids[rng.choice(SOURCES)["id"]])
+        session.commit()
+    return time.perf_counter() - start
+
+
+def measure(session, repeat, limit):
+    results = []
+    for name, params in QUERIES:
+        params = dict(params)
+        query = params.pop("query")
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            page = search_job_postings(session, query, limit=limit, **params)
+            timings.append(time.perf_counter() - start)
+        # Second page through the cursor, to show keyset pagination cost
+        cursor_ms = None
+        if page["next_cursor"]:
+            start = time.perf_counter()
+            search_job_postings(session, query, limit=limit, cursor=page["next_cursor"], **params)
+            cursor_ms = (time.perf_counter() - start) * 1000
+        timings.sort()
+        results.append({
+            "query": name,
+            "p50_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "page2_ms": cursor_ms,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url", help="existing database to populate (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'search_bench.db')}"
+        engine = create_engine(database_url)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        existing = session.query(JobPosting).count()
+        if existing < args.rows:
+            print(f"Populating {args.rows - existing} synthetic postings...")
+            elapsed = populate(session, args.rows - existing, args.batch_size)
+            print(f"Inserted in {elapsed:.1f}s ({(args.rows - existing) / elapsed:.0f} rows/s)")
+        print(f"job_postings rows: {session.query(JobPosting).count()} ({engine.dialect.name})")
+
+        print(f"{'query':<22} {'p50 ms':>8} {'p95 ms':>8} {'page 2 ms':>10}")
+        for result in measure(session, args.repeat, args.limit):
+            page2 = f"{result['page2_ms']:.1f}" if result["page2_ms"] is not None else "-"
+            print(f"{result['query']:<22} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {page2:>10}")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measure storage and read-latency of report payloads per compression codec.
+
+Builds a synthetic corpus of reports (jobs with generated descriptions), stores
+it in a throwaway SQLite database once per codec and reports the database size
+and the time needed to fetch and decode every payload.
+
+Usage:
+    python -m benchmarks.bench_report_compression --reports 200 --jobs 100
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data.models import Base, User, UserReport
+from src.utils.compression import zstandard
+
+WORDS = (
+    "python developer engineer remote senior data backend cloud team product "
+    "experience platform design build scale django fastapi postgres docker "
+    "kubernetes aws analytics pipeline customers mission growth benefits salary "
+    "equity flexible hours collaborate ownership testing quality delivery"
+).split()
+
+
+def make_job(rng):
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(150, 400)))
+    return {
+        "title": " ".join(rng.choice(WORDS) for _ in range(3)).title(),
+        "company": f"Company {rng.randint(1, 500)}",
+        "location": rng.choice(["Remote", "New York, NY", "Berlin", "London", "Austin, TX"]),
+        "salary": f"${rng.randint(60, 200)},000",
+        "date_posted": f"{rng.randint(1, 30)} days ago",
+        "description": description,
+        "url": f"https://jobs.example.com/{rng.randint(1, 10 ** 6)}",
+        "source": rng.choice(["Python.org", "ZipRecruiter", "LinkedIn"]),
+    }
+
+
+def make_corpus(report_count, jobs_per_report, seed=42):
+    rng = random.Random(seed)
+    return [json.dumps([make_job(rng) for _ in range(jobs_per_report)]) for _ in range(report_count)]
+
+
+def run_codec(codec, corpus, workdir):
+    db_path = os.path.join(workdir, f"reports_{codec}.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    user = User(email="bench@talenttrek.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+
+    start = time.perf_counter()
+    for idx, payload in enumerate(corpus):
+        report = UserReport(user_id=user.id, title=f"Report {idx}", job_count=0)
+        report.store_jobs_data(payload, codec=codec)
+        session.add(report)
+    session.commit()
+    write_time = time.perf_counter() - start
+    session.close()
+    engine.dispose()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    session = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    total_chars = 0
+    for report in session.query(UserReport):
+        total_chars += len(report.jobs_data)
+    read_time = time.perf_counter() - start
+    session.close()
+    engine.dispose()
+
+    return {
+        "codec": codec,
+        "db_bytes": os.path.getsize(db_path),
+        "write_s": write_time,
+        "read_s": read_time,
+        "chars": total_chars,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=100, help="jobs per report")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.reports, args.jobs)
+    raw_bytes = sum(len(payload.encode("utf-8")) for payload in corpus)
+    print(f"Synthetic corpus: {args.reports} reports x {args.jobs} jobs, {raw_bytes / 1e6:.1f} MB of JSON")
+
+    codecs = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [run_codec(codec, corpus, workdir) for codec in codecs]
+
+    baseline = results[0]
+    print(f"{'codec':<6} {'db size MB':>11} {'ratio':>7} {'write s':>9} {'read s':>8} {'read vs none':>13}")
+    for result in results:
+        assert result["chars"] == baseline["chars"], "decoded payloads differ between codecs"
+        print(
+            f"{result['codec']:<6} {result['db_bytes'] / 1e6:>11.2f} "
+            f"{baseline['db_bytes'] / result['db_bytes']:>6.1f}x "
+            f"{result['write_s']:>9.3f} {result['read_s']:>8.3f} "
+            f"{result['read_s'] / baseline['read_s']:>12.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
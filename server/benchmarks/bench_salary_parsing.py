@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Time the column salary parser against calling extract_numeric_salary per value.
+
+Generates salary strings in the shapes scrapers return (ranges, "k" suffixes,
+currency symbols and codes, hourly and monthly rates, missing values), checks
+that both paths agree and prints the timings.
+
+Usage:
+    python -m benchmarks.bench_salary_parsing --rows 1000000
+"""
+
+import argparse
+import math
+import random
+import time
+
+from src.analysis.statistics import extract_numeric_salaries, extract_numeric_salary, parse_salary_text
+
+
+def make_salaries(count, distinct, seed=7):
+    rng = random.Random(seed)
+    shapes = [
+        lambda: f"${rng.randint(40, 200)},000 - ${rng.randint(200, 300)},000 per year",
+        lambda: f"USD {rng.randint(40, 250) * 1000} annually",
+        lambda: f"€{rng.randint(30, 120)}k",
+        lambda: f"${rng.randint(50, 150)}-{rng.randint(150, 250)}k",
+        lambda: f"£{rng.randint(15, 90)} per hour",
+        lambda: f"{rng.randint(3, 9)}.{rng.randint(100, 999)} € / month",
+        lambda: "Not disclosed",
+        lambda: None,
+    ]
+    pool = [rng.choice(shapes)() for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+
+    salaries = make_salaries(args.rows, args.distinct)
+
+    parse_salary_text.cache_clear()
+    start = time.perf_counter()
+    column = extract_numeric_salaries(salaries)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extract_numeric_salaries(salaries)
+    warm = time.perf_counter() - start
+
+    parse_salary_text.cache_clear()
+    start = time.perf_counter()
+    single = [extract_numeric_salary(value) for value in salaries]
+    per_value = time.perf_counter() - start
+
+    for a, b in zip(single, column):
+        assert (a is None and math.isnan(b)) or a == b, (a, b)
+    print(f"{args.rows} salaries ({args.distinct} distinct strings), outputs identical")
+    print(f"per-value extract_numeric_salary: {per_value:6.2f} s")
+    print(f"column parse (cold cache):        {cold:6.2f} s")
+    print(f"column parse (warm cache):        {warm:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare trend queries answered from the daily rollups with grouping raw rows.
+
+Fills a SQLite database through upsert_job_postings (which maintains the
+rollups), then times query_trends against loading every posting and running
+generate_time_trends, and the parallel rollup rebuild.
+
+Usage:
+    python -m benchmarks.bench_trends --postings 200000 --db /tmp/trends.db
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.analysis.trends import generate_time_trends
+from src.data.job_store import upsert_job_postings
+from src.data.models import Base, JobPosting
+from src.data.rollups import query_trends, rebuild_rollups
+
+KEYWORDS = ["python", "data", "devops", "frontend", "java"]
+LOCATIONS = ["Remote", "New York, NY", "Berlin", "London", "Austin, TX", "Toronto", "Paris", "Remote, US"]
+
+
+def fill(session_factory, count, batch_size=5000, seed=5):
+    rng = random.Random(seed)
+    end = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    session = session_factory()
+    for first in range(0, count, batch_size):
+        jobs = [{
+            "title": f"{rng.choice(KEYWORDS)} engineer {idx}",
+            "company": f"Company {rng.randint(1, 2000)}",
+            "location": rng.choice(LOCATIONS),
+            "salary": f"${rng.randint(50, 200)},000" if rng.random() < 0.6 else None,
+            "date_posted": f"{rng.randint(0, 364)} days ago",
+            "fingerprint": f"bench-{idx}",
+        } for idx in range(first, min(first + batch_size, count))]
+        upsert_job_postings(session, jobs, source_id=rng.randint(1, 4), seen_at=end, keyword=rng.choice(KEYWORDS))
+        session.commit()
+    session.close()
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=200_000)
+    parser.add_argument("--db", default="/tmp/talenttrek_bench_trends.db")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    engine = create_engine(f"sqlite:///{args.db}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    _, fill_time = timed(fill, session_factory, args.postings)
+    print(f"Inserted {args.postings} postings (rollups maintained) in {fill_time:.1f} s")
+
+    session = session_factory()
+    start, end = date(2025, 4, 1), date(2025, 6, 30)
+    trends, rollup_time = timed(query_trends, session, start, end, keyword="python")
+    print(f"query_trends over 91 days:             {rollup_time * 1000:8.1f} ms ({trends['total_jobs']} jobs)")
+
+    def from_raw():
+        rows = session.execute(select(JobPosting.posted_at).where(JobPosting.keyword == "python")).all()
+        return generate_time_trends([{"posted_at": posted_at} for posted_at, in rows])
+
+    _, raw_time = timed(from_raw)
+    print(f"load raw rows + generate_time_trends:  {raw_time * 1000:8.1f} ms")
+    session.close()
+
+    summary, rebuild_time = timed(rebuild_rollups, session_factory, workers=args.workers)
+    print(f"rebuild_rollups ({summary['chunks']} chunks, {args.workers} workers): {rebuild_time:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+The API as the load tests run it: the real app on a local database.
+
+Started by benchmarks.load.run in its own process. The environment points
+it at a fresh SQLite file (DATABASE_URL) and at stand-in job boards
+(SOURCES_CONFIG_PATH). It then seeds one user with saved reports and some
+stored postings, and serves the app with uvicorn. Supabase token checks are
+replaced with that user, so report endpoints run without a Supabase project.
+
+Usage (normally via benchmarks.load.run):
+    DATABASE_URL=sqlite:////tmp/load.db python -m benchmarks.load.app --port 8000 --reports 20
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timezone
+
+import uvicorn
+
+from src.analysis.streaming import stats_from_payload
+from src.api import app
+from src.data.database import get_session, init_db
+from src.data.job_store import upsert_job_postings
+from src.data.models import User, UserReport
+from src.supabase.supabase import supabase_config
+from src.supabase.supabase_auth import supabase_auth
+
+LOAD_USER = {"user_id": "loadtest", "email": "loadtest@example.com", "user_metadata": {}}
+TITLES = ["Python Developer", "Data Engineer", "Backend Engineer", "ML Engineer", "DevOps Engineer",
+          "Data Scientist", "Platform Engineer", "Full-Stack Developer"]
+COMPANIES = [f"Company {i}" for i in range(1, 200)]
+LOCATIONS = ["Remote", "New York, NY", "Berlin", "London", "Austin, TX", "Toronto"]
+
+
+def synthetic_jobs(rng, count, prefix):
+    return [{
+        "title": f"{rng.choice(TITLES)} {prefix}-{idx}",
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(LOCATIONS),
+        "salary": f"${rng.randint(60, 200)},000" if rng.random() < 0.6 else None,
+        "date_posted": f"{rng.randint(0, 60)} days ago",
+        "source": "Python.org",
+    } for idx in range(count)]
+
+
+def seed(reports, jobs_per_report, postings, seed_value=39):
+    """Create the tables, the load-test user, its reports and stored postings."""
+    init_db()
+    rng = random.Random(seed_value)
+    session = get_session()
+    try:
+        user = User(email=LOAD_USER["email"], username="loadtest", hashed_password="-")
+        session.add(user)
+        session.flush()
+        for number in range(reports):
+            jobs = synthetic_jobs(rng, jobs_per_report, f"r{number}")
+            session.add(UserReport(
+                user_id=user.id,
+                title=f"Load test report {number + 1}",
+                jobs_data=json.dumps(jobs),
+                keyword="python",
+                sources_used=json.dumps(["python_org"]),
+                job_count=len(jobs),
+                stats_data=stats_from_payload(jobs).to_json(),
+            ))
+        for first in range(0, postings, 1000):
+            jobs = synthetic_jobs(rng, min(1000, postings - first), f"p{first}")
+            upsert_job_postings(session, jobs, seen_at=datetime.now(timezone.utc), keyword="python")
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--jobs-per-report", type=int, default=200)
+    parser.add_argument("--postings", type=int, default=5000)
+    args = parser.parse_args()
+
+    seed(args.reports, args.jobs_per_report, args.postings)
+    supabase_config.use_supabase_auth_enabled = lambda: True
+    app.dependency_overrides[supabase_auth.get_current_user] = lambda: LOAD_USER
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the API against stand-in job boards and a local database.
+
+For a scenario file (see benchmarks/load/scenarios) this:
+  1. starts the replay server (benchmarks.scrapers.server) with the
+     scenario's latency, jitter and error rate, and writes a sources.yaml
+     pointing every source at it;
+  2. starts the real app (benchmarks.load.app) in its own process on a
+     fresh SQLite database, seeded with reports and postings;
+  3. runs each stage of the concurrency ramp: `users` clients send the
+     weighted request mix back to back for `duration` seconds;
+  4. reports throughput and p50/p95/p99 latency per endpoint and stage, and
+     writes them as JSON.
+
+Compare the JSON of two runs (e.g. two releases) with --compare.
+
+The load generator shares the machine with the app, so compare runs made
+on the same hardware.
+
+Usage:
+    python -m benchmarks.load.run benchmarks/load/scenarios/mixed.yaml [--output results.json]
+    python -m benchmarks.load.run benchmarks/load/scenarios/mixed.yaml --compare previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import yaml
+
+from benchmarks.scrapers.run import local_sources
+from benchmarks.scrapers.server import ReplayServer
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_OUTPUT_DIR = os.path.join("data_output", "loadtests")
+
+
+def load_scenario(path):
+    with open(path) as f:
+        scenario = yaml.safe_load(f)
+    if not scenario.get("stages") or not scenario.get("requests"):
+        raise ValueError(f"{path}: a scenario needs stages and requests")
+    scenario.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return scenario
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=SERVER_DIR, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def start_app(workdir, port, sources_path, seed):
+    # The app runs inside workdir with a copy of config/, so the database,
+    # near-duplicate index and report caches it writes stay out of the tree
+    shutil.copytree(os.path.join(SERVER_DIR, "config"), os.path.join(workdir, "config"))
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+               SOURCES_CONFIG_PATH=sources_path,
+               PYTHONPATH=os.pathsep.join(filter(None, [SERVER_DIR, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, "-m", "benchmarks.load.app", "--port", str(port),
+               "--reports", str(seed.get("reports", 20)),
+               "--jobs-per-report", str(seed.get("jobs_per_report", 200)),
+               "--postings", str(seed.get("postings", 5000))]
+    log = open(os.path.join(workdir, "app.log"), "w")
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT), log
+
+
+def wait_until_ready(base_url, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode} before it was ready")
+        try:
+            if httpx.get(f"{base_url}/api/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"App not ready after {timeout}s")
+
+
+async def run_stage(client, scenario, stage, rng):
+    """Run one stage; returns [(request name, seconds, ok)]."""
+    requests = scenario["requests"]
+    weights = [request.get("weight", 1) for request in requests]
+    report_count = max(1, (scenario.get("seed") or {}).get("reports", 1))
+    think = scenario.get("think_time_ms", 0) / 1000
+    deadline = time.perf_counter() + stage["duration"]
+    samples = []
+
+    async def user():
+        while time.perf_counter() < deadline:
+            request = rng.choices(requests, weights)[0]
+            path = request["path"].replace("{report_id}", str(rng.randint(1, report_count)))
+            started = time.perf_counter()
+            try:
+                response = await client.request(request.get("method", "GET"), path, json=request.get("json"))
+                ok = response.status_code in request.get("expect", range(200, 300))
+            except httpx.HTTPError:
+                ok = False
+            samples.append((request["name"], time.perf_counter() - started, ok))
+            if think:
+                await asyncio.sleep(think)
+
+    await asyncio.gather(*(user() for _ in range(stage["users"])))
+    return samples
+
+
+def summarize(samples, seconds):
+    """Per-endpoint count, errors, throughput and latency percentiles (ms)."""
+    by_name = {}
+    for name, latency, ok in samples:
+        entry = by_name.setdefault(name, ([], [0]))
+        entry[0].append(latency)
+        entry[1][0] += 0 if ok else 1
+    endpoints = {}
+    for name, (latencies, errors) in sorted(by_name.items()):
+        values = np.array(latencies) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[0],
+            "throughput": round(len(values) / seconds, 2),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+            "max_ms": round(float(values.max()), 1),
+        }
+    return endpoints
+
+
+async def drive(base_url, scenario, seed_value):
+    rng = random.Random(seed_value)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    stages = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        for number, stage in enumerate(scenario["stages"], start=1):
+            started = time.perf_counter()
+            samples = await run_stage(client, scenario, stage, rng)
+            seconds = time.perf_counter() - started
+            endpoints = summarize(samples, seconds)
+            stages.append({
+                "users": stage["users"],
+                "duration": round(seconds, 2),
+                "requests": len(samples),
+                "errors": sum(1 for _, _, ok in samples if not ok),
+                "throughput": round(len(samples) / seconds, 2),
+                "endpoints": endpoints,
+            })
+            print(f"stage {number}: {stage['users']:>3} users, {len(samples):>6} requests, "
+                  f"{len(samples) / seconds:8.1f} req/s, {stages[-1]['errors']} errors")
+            for name, stats in endpoints.items():
+                print(f"    {name:<16} {stats['throughput']:>8} req/s  p50 {stats['p50_ms']:>8} ms  "
+                      f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  errors {stats['errors']}")
+    return stages
+
+
+def compare(result, previous):
+    """Print throughput and p95 changes per stage and endpoint against an earlier result."""
+    print(f"\nAgainst {previous.get('revision') or 'previous run'} ({previous.get('started_at')}):")
+    for number, (stage, before) in enumerate(zip(result["stages"], previous.get("stages", [])), start=1):
+        for name, stats in stage["endpoints"].items():
+            old = before["endpoints"].get(name)
+            if not old:
+                continue
+            throughput = (stats["throughput"] - old["throughput"]) / old["throughput"] if old["throughput"] else 0
+            p95 = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0
+            print(f"  stage {number} ({stage['users']} users) {name:<16} throughput {throughput:+7.1%}  "
+                  f"p95 {p95:+7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", help="Scenario YAML file")
+    parser.add_argument("--output", help=f"Result JSON (default: {DEFAULT_OUTPUT_DIR}/<scenario>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier result JSON to compare with")
+    parser.add_argument("--seed", type=int, default=39)
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    boards = scenario.get("boards") or {}
+    started_at = datetime.now(timezone.utc)
+    with tempfile.TemporaryDirectory(prefix="talenttrek-load-") as workdir, \
+            ReplayServer(latency=boards.get("latency_ms", 0), jitter=boards.get("jitter_ms", 0),
+                         error_rate=boards.get("error_rate", 0), seed=args.seed) as boards_server:
+        sources_path = os.path.join(workdir, "sources.yaml")
+        with open(sources_path, "w") as f:
+            yaml.safe_dump({"sources": list(local_sources(boards_server.url, boards_server.fixtures).values())}, f)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process, log = start_app(workdir, port, sources_path, scenario.get("seed") or {})
+        try:
+            wait_until_ready(base_url, process)
+            print(f"Running scenario {scenario['name']} against {base_url}")
+            stages = asyncio.run(drive(base_url, scenario, args.seed))
+        except Exception:
+            log.flush()
+            with open(os.path.join(workdir, "app.log")) as f:
+                print(f.read()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+            log.close()
+        board_requests = boards_server.requests
+
+    result = {
+        "scenario": scenario["name"],
+        "description": scenario.get("description"),
+        "started_at": started_at.isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "board_requests": board_requests,
+        "config": scenario,
+        "stages": stages,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"{scenario['name']}-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Offline scraper benchmark: every source in sources.yaml against the replay server.
+
+Starts benchmarks.scrapers.server on a free port, points each source at it
+and scrapes --pages pages with StaticScraper, SeleniumScraper (local pages;
+skipped when Chrome is not available) or APIScraper. Reports pages/sec,
+cards/sec, mean fetch and parse time per page and the peak Python memory
+of scraping one page (tracemalloc, measured in a separate pass so it does
+not slow the timed run).
+
+Results can be saved as a baseline and later runs compared against it;
+a metric that is more than --tolerance worse than the baseline is reported
+as a regression and the exit code is 1.
+
+Note that BaseScraper backs off (2s, 4s, ...) after a failed request, so
+any --error-rate dominates the timings; that is what a flaky board costs.
+
+The replay server serves the same fixture for every page, so the parse
+cache (settings.yaml `parse_cache`) is cleared before each parse to time
+real parsing; --parse-cache keeps it, which times the unchanged-page path.
+
+Usage:
+    python -m benchmarks.scrapers.run [--pages 50] [--concurrency 4] [--latency 50 --jitter 20]
+    python -m benchmarks.scrapers.run --save-baseline benchmarks/scrapers/baseline.json
+    python -m benchmarks.scrapers.run --baseline benchmarks/scrapers/baseline.json [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from src.scrapers.parse_cache import clear_parse_caches
+from src.utils.helpers import load_sources_config
+from benchmarks.scrapers.server import ReplayServer
+
+# metric -> True when higher is better
+COMPARED_METRICS = {
+    "pages_per_sec": True,
+    "cards_per_sec": True,
+    "parse_ms_avg": False,
+    "peak_kb": False,
+}
+# Changes smaller than this are noise, whatever the relative change
+NOISE_FLOOR = {"parse_ms_avg": 1.0, "peak_kb": 64.0}
+
+
+def local_sources(server_url, fixtures):
+    """Sources from sources.yaml that have a fixture, with URLs pointing at the replay server."""
+    sources = {}
+    for src_id, src in load_sources_config().items():
+        if src_id not in fixtures:
+            print(f"  no fixture for {src_id}, skipped")
+            continue
+        src = dict(src)
+        if src["type"] == "api":
+            src["api_url"] = f"{server_url}/{src_id}/jobs?keywords={{keyword}}"
+        else:
+            src["search_url"] = f"{server_url}/{src_id}/search?q={{keyword}}"
+        sources[src_id] = src
+    return sources
+
+
+class PageScraper:
+    """One scraper instance; scrape(page) returns (cards, fetch_seconds, parse_seconds) or None."""
+
+    def __init__(self, src, keyword, parse_cache=False):
+        self.src = src
+        self.keyword = keyword
+        self.parse_cache = parse_cache
+        self.fields = {k: v for k, v in src.get("selectors", {}).items() if k != "job_selector"}
+        if src["type"] == "static":
+            from src.scrapers.static_scraper import StaticScraper, parse_static_jobs
+
+            self.scraper = StaticScraper(max_retries=1, delay_range=(0, 0))
+            self.fetch = lambda url: self.scraper.fetch_page(url)
+            self.parse = parse_static_jobs
+        elif src["type"] == "dynamic":
+            from src.scrapers.blocking import source_block
+            from src.scrapers.selenium_scraper import SeleniumScraper
+
+            self.scraper = SeleniumScraper(headless=True, max_retries=1, delay_range=(0, 0), block=source_block(src))
+            # Cards are extracted in the browser: "fetch" opens the page, "parse" runs the extraction script
+            self.fetch = lambda url: "" if self.scraper.open_page(url, scroll_count=self.src.get("scroll_count", 3)) \
+                else None
+            self.parse = lambda _, job_selector, fields: self.scraper.extract_jobs(job_selector, fields)
+        else:
+            from src.scrapers.api_scraper import APIScraper
+
+            self.scraper = APIScraper(max_retries=1, delay_range=(0, 0))
+
+    def scrape(self, page):
+        if self.src["type"] == "api":
+            return self._scrape_api(page)
+        url = self.src["search_url"].replace("{keyword}", self.keyword) + f"&page={page}"
+        started = time.perf_counter()
+        html = self.fetch(url)
+        fetched = time.perf_counter()
+        if html is None:
+            return None
+        if not self.parse_cache:
+            clear_parse_caches()
+        jobs = self.parse(html, self.src["selectors"]["job_selector"], self.fields)
+        return len(jobs), fetched - started, time.perf_counter() - fetched
+
+    def _scrape_api(self, page):
+        url = self.src["api_url"].replace("{keyword}", self.keyword) + f"&start={page}"
+        fetch_seconds = []
+        make_request = self.scraper.make_request
+
+        def timed_request(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return make_request(*args, **kwargs)
+            finally:
+                fetch_seconds.append(time.perf_counter() - started)
+
+        self.scraper.make_request = timed_request
+        try:
+            started = time.perf_counter()
+            jobs = self.scraper.scrape_jobs(api_url=url, data_mapping=self.src["data_mapping"],
+                                            source_id=self.src["id"])
+            total = time.perf_counter() - started
+        finally:
+            self.scraper.make_request = make_request
+        if not jobs:
+            return None
+        return len(jobs), sum(fetch_seconds), total - sum(fetch_seconds)
+
+    def close(self):
+        if self.src["type"] == "dynamic":
+            self.scraper.close()
+
+
+def bench_source(src, keyword, pages, concurrency, parse_cache=False):
+    workers = 1 if src["type"] == "dynamic" else max(1, concurrency)
+
+    def run_pages(worker):
+        scraper = PageScraper(src, keyword, parse_cache)
+        try:
+            return [scraper.scrape(page) for page in range(worker, pages, workers)]
+        finally:
+            scraper.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = [outcome for chunk in pool.map(run_pages, range(workers)) for outcome in chunk]
+    seconds = time.perf_counter() - started
+
+    done = [outcome for outcome in outcomes if outcome is not None]
+    cards = sum(count for count, _, _ in done)
+    tracemalloc.start()
+    try:
+        memory_scraper = PageScraper(src, keyword, parse_cache)
+        try:
+            memory_scraper.scrape(0)
+        finally:
+            memory_scraper.close()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "scraper": src["type"],
+        "pages": pages,
+        "failed_pages": pages - len(done),
+        "cards": cards,
+        "seconds": round(seconds, 3),
+        "pages_per_sec": round(len(done) / seconds, 2) if seconds else 0.0,
+        "cards_per_sec": round(cards / seconds, 1) if seconds else 0.0,
+        "fetch_ms_avg": round(1000 * sum(f for _, f, _ in done) / len(done), 2) if done else None,
+        "parse_ms_avg": round(1000 * sum(p for _, _, p in done) / len(done), 2) if done else None,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for metrics more than `tolerance` worse than the baseline."""
+    regressions = []
+    for src_id, result in results.items():
+        base = baseline.get(src_id)
+        if not base or "skipped" in result or "skipped" in base:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            if abs(new - old) < NOISE_FLOOR.get(metric, 0.0):
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{src_id}.{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel scrapers (not for Selenium)")
+    parser.add_argument("--keyword", default="python")
+    parser.add_argument("--sources", nargs="*", help="Source ids to run (default: all with a fixture)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server delay per response in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random server delay, up to this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses that are 503")
+    parser.add_argument("--seed", type=int, default=38)
+    parser.add_argument("--parse-cache", action="store_true", help="Keep parsed pages cached between pages")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", help="Write the results to this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (default 0.2)")
+    args = parser.parse_args()
+    # The scrapers log every page at INFO
+    logging.disable(logging.INFO)
+
+    results = {}
+    with ReplayServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      seed=args.seed) as server:
+        print(f"Replay server at {server.url} (latency {args.latency} ms, jitter {args.jitter} ms, "
+              f"error rate {args.error_rate:.0%})")
+        sources = local_sources(server.url, server.fixtures)
+        for src_id, src in sources.items():
+            if args.sources and src_id not in args.sources:
+                continue
+            try:
+                results[src_id] = bench_source(src, args.keyword, args.pages, args.concurrency, args.parse_cache)
+            except Exception as e:
+                # Typically SeleniumScraper without a local Chrome
+                results[src_id] = {"scraper": src["type"], "skipped": f"{type(e).__name__}: {e}"[:200]}
+        print(f"{server.requests} requests served, {server.errors} failed on purpose\n")
+
+    print(f"{'source':<16} {'scraper':<8} {'pages/s':>9} {'cards/s':>9} {'fetch ms':>9} {'parse ms':>9} "
+          f"{'peak KB':>9} {'failed':>7}")
+    for src_id, result in results.items():
+        if "skipped" in result:
+            print(f"{src_id:<16} {result['scraper']:<8} skipped ({result['skipped']})")
+            continue
+        print(f"{src_id:<16} {result['scraper']:<8} {result['pages_per_sec']:>9} {result['cards_per_sec']:>9} "
+              f"{result['fetch_ms_avg']!s:>9} {result['parse_ms_avg']!s:>9} {result['peak_kb']:>9} "
+              f"{result['failed_pages']:>7}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the job boards: replays the recorded fixtures over HTTP.
+
+Every request to /<source_id>/... is answered with fixtures/<source_id>.html
+or .json, after `latency` ms plus up to `jitter` ms, or with a 503 for a
+`error_rate` fraction of requests. Query strings are ignored.
+
+Usage:
+    python -m benchmarks.scrapers.server [--port 8765] [--latency 50] [--jitter 20] [--error-rate 0.05]
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json"}
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """{source_id: (content_type, body)} for every fixture file."""
+    fixtures = {}
+    for filename in sorted(os.listdir(fixtures_dir)):
+        source_id, extension = os.path.splitext(filename)
+        if extension in CONTENT_TYPES:
+            with open(os.path.join(fixtures_dir, filename), "rb") as f:
+                fixtures[source_id] = (CONTENT_TYPES[extension], f.read())
+    return fixtures
+
+
+class ReplayServer:
+    """Threaded HTTP server replaying fixtures; use as a context manager."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=None,
+                 fixtures_dir=FIXTURES_DIR):
+        self.fixtures = load_fixtures(fixtures_dir)
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                source_id = self.path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+                with server._lock:
+                    server.requests += 1
+                    delay = server.latency + server._rng.uniform(0, server.jitter)
+                    fail = server._rng.random() < server.error_rate
+                    if fail:
+                        server.errors += 1
+                if delay:
+                    time.sleep(delay)
+                fixture = server.fixtures.get(source_id)
+                if fail or fixture is None:
+                    self.send_response(503 if fail else 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                content_type, body = fixture
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, up to this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate)
+    print(f"Replaying {', '.join(server.fixtures)} on {server.url}/<source_id>/")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
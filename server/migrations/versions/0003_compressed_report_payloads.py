@@ -0,0 +1,52 @@
+"""Store report payloads as binary so they can be compressed
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-07-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.compression import decompress_payload
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    # Existing rows keep their plain JSON bytes; readers tell them apart from
+    # compressed payloads by the missing header byte.
+    if connection.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE user_reports
+            ALTER COLUMN jobs_data TYPE bytea
+            USING convert_to(jobs_data, 'UTF8')
+        """)
+    # SQLite is dynamically typed, so the TEXT column accepts binary values as is.
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+
+    # Decompress every payload before going back to a text column
+    rows = connection.execute(sa.text("SELECT id, jobs_data FROM user_reports")).fetchall()
+    for report_id, jobs_data in rows:
+        connection.execute(
+            sa.text("UPDATE user_reports SET jobs_data = :jobs_data WHERE id = :id"),
+            {"jobs_data": decompress_payload(jobs_data).encode("utf-8"), "id": report_id}
+        )
+
+    if connection.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE user_reports
+            ALTER COLUMN jobs_data TYPE text
+            USING convert_from(jobs_data, 'UTF8')
+        """)
+    else:
+        op.execute("UPDATE user_reports SET jobs_data = CAST(jobs_data AS TEXT)")
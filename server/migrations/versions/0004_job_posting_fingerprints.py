@@ -0,0 +1,129 @@
+"""Add content fingerprints and last_seen_at to job_postings
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-07-21 00:00:00.000000
+
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+# Frozen copy of src.data.job_store.fingerprint_job as of this revision;
+# 0010 re-keys the rows on the later fingerprint without the URL
+def _normalize_text(value) -> str:
+    if value is None:
+        return ""
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def _normalize_title(title) -> str:
+    title = str(title or '').strip().lower()
+    title = re.sub(r'[^\w\s]', '', title)
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def _normalize_url(url) -> str:
+    if not url:
+        return ""
+    parts = urlsplit(str(url).strip())
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+def _fingerprint(row) -> str:
+    key = "\x1f".join([
+        _normalize_text(_normalize_title(row.title)),
+        _normalize_text(row.company),
+        _normalize_text(row.location),
+        _normalize_url(row.url),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    with op.batch_alter_table('sources') as batch_op:
+        batch_op.add_column(sa.Column('slug', sa.String(length=255), nullable=True))
+        batch_op.create_index('ix_sources_slug', ['slug'], unique=True)
+
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('fingerprint', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill fingerprints for rows written before upserts existed, in
+    # keyset batches, keeping only the oldest row of each fingerprint
+    job_postings = sa.table(
+        'job_postings',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('company', sa.String),
+        sa.column('location', sa.String),
+        sa.column('url', sa.String),
+        sa.column('fingerprint', sa.String),
+    )
+    stmt = (
+        sa.update(job_postings)
+        .where(job_postings.c.id == sa.bindparam('row_id'))
+        .values(fingerprint=sa.bindparam('new_fingerprint'))
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(job_postings.c.id, job_postings.c.title, job_postings.c.company,
+                      job_postings.c.location, job_postings.c.url)
+            .where(job_postings.c.id > last_id)
+            .order_by(job_postings.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        fingerprints = [_fingerprint(row) for row in rows]
+        # Rows of earlier batches already carry their fingerprint
+        seen = set(connection.execute(
+            sa.select(job_postings.c.fingerprint)
+            .where(job_postings.c.id <= last_id)
+            .where(job_postings.c.fingerprint.in_(set(fingerprints)))
+        ).scalars())
+        last_id = rows[-1].id
+        updates, duplicates = [], []
+        for row, fingerprint in zip(rows, fingerprints):
+            if fingerprint in seen:
+                duplicates.append(row.id)
+                continue
+            seen.add(fingerprint)
+            updates.append({'row_id': row.id, 'new_fingerprint': fingerprint})
+        if duplicates:
+            connection.execute(sa.delete(job_postings).where(job_postings.c.id.in_(duplicates)))
+        if updates:
+            connection.execute(stmt, updates)
+    op.execute("UPDATE job_postings SET last_seen_at = created_at WHERE last_seen_at IS NULL")
+
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.alter_column('fingerprint', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('last_seen_at', existing_type=sa.DateTime(timezone=True), server_default=sa.func.now())
+        batch_op.create_index('ix_job_postings_fingerprint', ['fingerprint'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_index('ix_job_postings_fingerprint')
+        batch_op.drop_column('last_seen_at')
+        batch_op.drop_column('fingerprint')
+
+    with op.batch_alter_table('sources') as batch_op:
+        batch_op.drop_index('ix_sources_slug')
+        batch_op.drop_column('slug')
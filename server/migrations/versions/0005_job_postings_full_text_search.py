@@ -0,0 +1,43 @@
+"""Full-text search index over job_postings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-07-22 00:00:00.000000
+
+"""
+from alembic import op
+
+from src.data.models import JOB_POSTINGS_FTS_POSTGRES, JOB_POSTINGS_FTS_SQLITE
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    if connection.dialect.name == 'postgresql':
+        # The generated column is computed for existing rows when it is added
+        for statement in JOB_POSTINGS_FTS_POSTGRES:
+            op.execute(statement)
+    elif connection.dialect.name == 'sqlite':
+        for statement in JOB_POSTINGS_FTS_SQLITE:
+            op.execute(statement)
+        # Index rows that were written before the triggers existed
+        op.execute("INSERT INTO job_postings_fts(job_postings_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+
+    if connection.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_job_postings_search_vector")
+        op.execute("ALTER TABLE job_postings DROP COLUMN IF EXISTS search_vector")
+    elif connection.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS job_postings_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS job_postings_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS job_postings_fts_ai")
+        op.execute("DROP TABLE IF EXISTS job_postings_fts")
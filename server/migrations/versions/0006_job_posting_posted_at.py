@@ -0,0 +1,122 @@
+"""Store the parsed posting date on job_postings
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-07-23 00:00:00.000000
+
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Frozen copy of the date parsing in src.analysis.trends as of this revision
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%B %d, %Y", "%b %d, %Y",
+                "%d %B %Y", "%d %b %Y", "%m/%d/%Y", "%d.%m.%Y")
+_RELATIVE_RE = re.compile(
+    r"^(?:posted\s+)?(?P<amount>\d+|an?|one)\+?\s*(?P<unit>minute|min|hour|hr|day|week|month|year)s?\s+ago$"
+)
+_UNIT_DELTAS = {
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1),
+    "day": timedelta(days=1), "week": timedelta(weeks=1),
+    "month": timedelta(days=30), "year": timedelta(days=365),
+}
+_NOW_WORDS = ("today", "just now", "just posted", "now")
+
+
+def _parse_text(text):
+    """("ago", timedelta), ("at", naive UTC datetime) or None, independent of the reference time."""
+    if text.isdigit():
+        timestamp = float(text)
+        seconds = timestamp / 1000 if timestamp > 1e11 else timestamp
+        return "at", datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+    lowered = text.lower()
+    if lowered in _NOW_WORDS:
+        return "ago", timedelta(0)
+    if lowered == "yesterday":
+        return "ago", timedelta(days=1)
+    match = _RELATIVE_RE.match(lowered)
+    if match:
+        amount = match.group("amount")
+        amount = int(amount) if amount.isdigit() else 1
+        return "ago", amount * _UNIT_DELTAS[match.group("unit")]
+    for date_format in DATE_FORMATS:
+        try:
+            return "at", datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _utc_naive(value):
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('posted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_job_postings_posted_at', ['posted_at'])
+
+    # Backfill from date_posted; relative dates ("2 days ago") are resolved
+    # against the time the row was first scraped
+    job_postings = sa.table(
+        'job_postings',
+        sa.column('id', sa.Integer),
+        sa.column('date_posted', sa.String),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+        sa.column('posted_at', sa.DateTime(timezone=True)),
+    )
+    stmt = (
+        sa.update(job_postings)
+        .where(job_postings.c.id == sa.bindparam("row_id"))
+        .values(posted_at=sa.bindparam("posted_at"))
+    )
+    migrated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Each distinct text is parsed once; scraped dates repeat a lot
+    parsed = {}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(job_postings.c.id, job_postings.c.date_posted, job_postings.c.created_at)
+            .where(job_postings.c.id > last_id)
+            .where(job_postings.c.date_posted.isnot(None))
+            .order_by(job_postings.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        updates = []
+        for row in rows:
+            text = row.date_posted.strip()
+            if text not in parsed:
+                parsed[text] = _parse_text(text) if text else None
+            if parsed[text] is None:
+                continue
+            kind, value = parsed[text]
+            if kind == "ago":
+                reference = _utc_naive(row.created_at) if row.created_at else migrated_at
+                value = reference - value
+            updates.append({"row_id": row.id, "posted_at": value.replace(tzinfo=timezone.utc)})
+        if updates:
+            connection.execute(stmt, updates)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_index('ix_job_postings_posted_at')
+        batch_op.drop_column('posted_at')
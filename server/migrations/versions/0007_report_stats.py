@@ -0,0 +1,26 @@
+"""Store serialized streaming statistics on user_reports
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-07-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing reports get their stats computed on first request
+    with op.batch_alter_table('user_reports') as batch_op:
+        batch_op.add_column(sa.Column('stats_data', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user_reports') as batch_op:
+        batch_op.drop_column('stats_data')
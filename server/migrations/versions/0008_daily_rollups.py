@@ -0,0 +1,60 @@
+"""Add job_postings.keyword and the daily rollup tables
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-07-25 00:00:00.000000
+
+The rollups start empty; fill them from existing postings with
+    python -m src.data.rollups rebuild
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.add_column(sa.Column('keyword', sa.String(length=255), nullable=True))
+        batch_op.create_index('ix_job_postings_keyword', ['keyword'])
+
+    op.create_table(
+        'job_posting_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('keyword', sa.String(length=255), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('location', sa.String(length=512), nullable=False),
+        sa.Column('job_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'keyword', 'source_id', 'location', name='uq_job_posting_daily_rollups_key')
+    )
+    op.create_index('ix_job_posting_daily_rollups_day', 'job_posting_daily_rollups', ['day'])
+
+    op.create_table(
+        'salary_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('keyword', sa.String(length=255), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('salary_sum', sa.Float(), nullable=False),
+        sa.Column('sketch', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'keyword', 'source_id', name='uq_salary_daily_rollups_key')
+    )
+    op.create_index('ix_salary_daily_rollups_day', 'salary_daily_rollups', ['day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_salary_daily_rollups_day', table_name='salary_daily_rollups')
+    op.drop_table('salary_daily_rollups')
+    op.drop_index('ix_job_posting_daily_rollups_day', table_name='job_posting_daily_rollups')
+    op.drop_table('job_posting_daily_rollups')
+
+    with op.batch_alter_table('job_postings') as batch_op:
+        batch_op.drop_index('ix_job_postings_keyword')
+        batch_op.drop_column('keyword')
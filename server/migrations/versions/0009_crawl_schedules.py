@@ -0,0 +1,54 @@
+"""Add crawl schedules and per-(keyword, source) crawl watermarks
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-07-28 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crawl_schedules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('keyword', sa.String(length=255), nullable=False),
+        sa.Column('source_slug', sa.String(length=255), nullable=False),
+        sa.Column('interval_minutes', sa.Integer(), nullable=False),
+        sa.Column('max_pages', sa.Integer(), nullable=False),
+        sa.Column('enabled', sa.Boolean(), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_status', sa.String(length=32), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('keyword', 'source_slug', name='uq_crawl_schedules_key')
+    )
+    op.create_index('ix_crawl_schedules_next_run_at', 'crawl_schedules', ['next_run_at'])
+
+    op.create_table(
+        'crawl_watermarks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('keyword', sa.String(length=255), nullable=False),
+        sa.Column('source_slug', sa.String(length=255), nullable=False),
+        sa.Column('newest_posted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('newest_fingerprint', sa.String(length=64), nullable=True),
+        sa.Column('pages_fetched', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('keyword', 'source_slug', name='uq_crawl_watermarks_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('crawl_watermarks')
+    op.drop_index('ix_crawl_schedules_next_run_at', table_name='crawl_schedules')
+    op.drop_table('crawl_schedules')
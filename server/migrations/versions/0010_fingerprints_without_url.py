@@ -0,0 +1,127 @@
+"""Re-key job_postings on fingerprints without the URL
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-07-29 00:00:00.000000
+
+"""
+import hashlib
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+# Frozen copy of src.data.job_store.fingerprint_job as of this revision
+def _normalize_text(value) -> str:
+    if value is None:
+        return ""
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def _normalize_title(title) -> str:
+    title = str(title or '').strip().lower()
+    title = re.sub(r'[^\w\s]', '', title)
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def _fingerprint(row) -> str:
+    key = "\x1f".join([
+        _normalize_text(_normalize_title(row.title)),
+        _normalize_text(row.company),
+        _normalize_text(row.location),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    job_postings = sa.table(
+        'job_postings',
+        sa.column('id', sa.Integer),
+        sa.column('fingerprint', sa.String),
+        sa.column('title', sa.String),
+        sa.column('company', sa.String),
+        sa.column('location', sa.String),
+        sa.column('last_seen_at', sa.DateTime(timezone=True)),
+    )
+    crawl_watermarks = sa.table(
+        'crawl_watermarks',
+        sa.column('newest_fingerprint', sa.String),
+    )
+    rekey = (
+        sa.update(job_postings)
+        .where(job_postings.c.id == sa.bindparam('row_id'))
+        .values(fingerprint=sa.bindparam('new_fingerprint'))
+    )
+    touch = (
+        sa.update(job_postings)
+        .where(job_postings.c.id == sa.bindparam('row_id'))
+        .where(sa.or_(job_postings.c.last_seen_at.is_(None),
+                      job_postings.c.last_seen_at < sa.bindparam('seen_at')))
+        .values(last_seen_at=sa.bindparam('seen_at'))
+    )
+
+    watermarks = set(connection.execute(
+        sa.select(crawl_watermarks.c.newest_fingerprint)
+        .where(crawl_watermarks.c.newest_fingerprint.isnot(None))
+    ).scalars())
+
+    # Rows are walked oldest first in keyset batches; the oldest row of each
+    # new fingerprint is kept, and later copies of it (the same posting stored
+    # under another search URL) are deleted after passing on their last_seen_at
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(job_postings.c.id, job_postings.c.fingerprint, job_postings.c.title,
+                      job_postings.c.company, job_postings.c.location, job_postings.c.last_seen_at)
+            .where(job_postings.c.id > last_id)
+            .order_by(job_postings.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        fingerprints = [_fingerprint(row) for row in rows]
+        # Rows of earlier batches already carry their new fingerprint
+        kept = {fingerprint: row_id for row_id, fingerprint in connection.execute(
+            sa.select(job_postings.c.id, job_postings.c.fingerprint)
+            .where(job_postings.c.id <= last_id)
+            .where(job_postings.c.fingerprint.in_(set(fingerprints)))
+        )}
+        last_id = rows[-1].id
+        updates, duplicates, touches = [], [], []
+        for row, fingerprint in zip(rows, fingerprints):
+            if row.fingerprint in watermarks:
+                watermarks.discard(row.fingerprint)
+                connection.execute(
+                    sa.update(crawl_watermarks)
+                    .where(crawl_watermarks.c.newest_fingerprint == row.fingerprint)
+                    .values(newest_fingerprint=fingerprint)
+                )
+            if fingerprint in kept:
+                duplicates.append(row.id)
+                if row.last_seen_at is not None:
+                    touches.append({'row_id': kept[fingerprint], 'seen_at': row.last_seen_at})
+                continue
+            kept[fingerprint] = row.id
+            if fingerprint != row.fingerprint:
+                updates.append({'row_id': row.id, 'new_fingerprint': fingerprint})
+        if duplicates:
+            connection.execute(sa.delete(job_postings).where(job_postings.c.id.in_(duplicates)))
+        if updates:
+            connection.execute(rekey, updates)
+        if touches:
+            connection.execute(touch, touches)
+
+
+def downgrade() -> None:
+    # Fingerprints are derived keys; the deleted copies cannot be restored
+    pass
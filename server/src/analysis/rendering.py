@@ -0,0 +1,226 @@
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from src.analysis.reports import (
+    copy_cached_render,
+    get_render_settings,
+    render_report,
+    report_cache_key,
+    report_payload_cache_key,
+)
+from src.utils.logger import get_logger
+from src.utils.metrics import CACHE_REQUESTS
+
+logger = get_logger(__name__)
+
+# Finished jobs beyond this many are forgotten, oldest first
+MAX_TRACKED_JOBS = 200
+
+
+class RenderJob:
+    """Progress and timing of one report render."""
+
+    def __init__(self, report_name, owner=None):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.report_name = report_name
+        self.status = "queued"  # queued, running, done, failed
+        self.stage = None
+        self.progress = 0.0
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.path = None
+        self.cache_hit = None
+        self.timings = {}
+        self.error = None
+        self.future = None
+
+    def to_dict(self) -> dict:
+        now = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "report_name": self.report_name,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "cache_hit": self.cache_hit,
+            "queued_seconds": round((self.started_at or now) - self.submitted_at, 3),
+            "elapsed_seconds": round(now - self.submitted_at, 3),
+            "timings": {stage: round(seconds, 3) for stage, seconds in self.timings.items()},
+            "error": self.error,
+        }
+
+
+_executor = None
+_manager = None
+_progress_queue = None
+_jobs = OrderedDict()
+_lock = threading.Lock()
+
+
+def _render_in_worker(job_id, progress_queue, stats, trends_df, jobs_df, report_name, output_dir, cache_dir,
+                      cache_key):
+    """Runs in a pool process; progress goes back to the parent through the queue."""
+    progress_queue.put((job_id, "started", 0.0, time.time()))
+
+    def progress(stage, fraction):
+        progress_queue.put((job_id, stage, fraction, time.time()))
+
+    return render_report(stats, trends_df, jobs_df, report_name=report_name, output_dir=output_dir,
+                         cache_dir=cache_dir, progress=progress, cache_key=cache_key)
+
+
+def _render_payload_in_worker(job_id, progress_queue, stats, payload, reference, report_name, output_dir,
+                              cache_dir, cache_key):
+    """Decode a stored jobs payload and render it, all in the pool process."""
+    import pandas as pd
+    from src.analysis.trends import generate_time_trends
+    from src.utils.compression import decompress_payload
+
+    progress_queue.put((job_id, "started", 0.0, time.time()))
+    jobs = json.loads(decompress_payload(payload))
+    jobs = [job for job in jobs if isinstance(job, dict)] if isinstance(jobs, list) else []
+    # Relative dates are resolved against the save time so the render input
+    # does not change from day to day
+    trends_df = generate_time_trends(jobs, reference=reference)
+    progress_queue.put((job_id, "decode", 0.0, time.time()))
+    return _render_in_worker(job_id, progress_queue, stats, trends_df, pd.DataFrame(jobs), report_name,
+                             output_dir, cache_dir, cache_key)
+
+
+def get_render_executor():
+    """Process pool for report rendering, started on first use."""
+    global _executor, _manager, _progress_queue
+    with _lock:
+        if _executor is None:
+            # spawn, not fork: the API process has threads and open database pools
+            context = multiprocessing.get_context("spawn")
+            _manager = context.Manager()
+            _progress_queue = _manager.Queue()
+            workers = get_render_settings()["render_workers"]
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            logger.info(f"Started report render pool with {workers} workers")
+    return _executor
+
+
+def shutdown_render_pool(wait=True):
+    global _executor, _manager, _progress_queue
+    with _lock:
+        executor, manager = _executor, _manager
+        _executor = _manager = _progress_queue = None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+    if manager is not None:
+        manager.shutdown()
+
+
+def _track(job):
+    with _lock:
+        _jobs[job.id] = job
+        finished = [job_id for job_id, tracked in _jobs.items() if tracked.finished_at]
+        for job_id in finished[:max(0, len(_jobs) - MAX_TRACKED_JOBS)]:
+            del _jobs[job_id]
+
+
+def _finish(job, result=None, error=None):
+    with _lock:
+        job.finished_at = time.time()
+        job.started_at = job.started_at or job.finished_at
+        if error is not None:
+            job.status = "failed"
+            job.error = str(error)
+            return
+        job.status = "done"
+        job.stage = "cached" if result["cache_hit"] else "done"
+        job.progress = 1.0
+        job.path = result["path"]
+        job.cache_hit = result["cache_hit"]
+        job.timings = result["timings"]
+
+
+def _on_done(job, future):
+    try:
+        _finish(job, result=future.result())
+    except Exception as e:
+        logger.exception(f"Report render {job.id} failed")
+        _finish(job, error=e)
+
+
+def submit_render(stats, trends_df, jobs_df, report_name, output_dir, owner=None) -> RenderJob:
+    """
+    Queue a report render on the process pool and return its RenderJob.
+
+    Input whose render is already cached is copied into place right away,
+    without starting the pool.
+    """
+    key = report_cache_key(stats, trends_df, jobs_df, report_name)
+    return _submit(key, report_name, output_dir, owner, _render_in_worker, stats, trends_df, jobs_df)
+
+
+def submit_payload_render(stats, payload, reference, report_name, output_dir, owner=None) -> RenderJob:
+    """
+    Like submit_render, for a stored (possibly compressed) jobs payload.
+
+    The payload is only hashed in the calling thread; decoding it and building
+    the trend and job frames happen in the pool process.
+    """
+    payload = payload if isinstance(payload, str) else bytes(payload)
+    key = report_payload_cache_key(stats, payload, reference, report_name)
+    return _submit(key, report_name, output_dir, owner, _render_payload_in_worker, stats, payload, reference)
+
+
+def _submit(key, report_name, output_dir, owner, worker, *inputs) -> RenderJob:
+    job = RenderJob(report_name, owner=owner)
+    _track(job)
+    started = time.perf_counter()
+    cache_dir = get_render_settings()["cache_dir"]
+    path = os.path.join(output_dir, report_name)
+    if cache_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    cached = bool(cache_dir) and copy_cached_render(key, path, cache_dir)
+    CACHE_REQUESTS.labels(cache="report_render", result="hit" if cached else "miss").inc()
+    if cached:
+        _finish(job, result={"path": path, "cache_key": key, "cache_hit": True,
+                             "timings": {"total": time.perf_counter() - started}})
+        return job
+
+    executor = get_render_executor()
+    job.future = executor.submit(worker, job.id, _progress_queue, *inputs, report_name, output_dir, cache_dir, key)
+    job.future.add_done_callback(lambda future: _on_done(job, future))
+    return job
+
+
+def _drain_progress():
+    with _lock:
+        progress_queue = _progress_queue
+    if progress_queue is None:
+        return
+    while True:
+        try:
+            job_id, stage, fraction, timestamp = progress_queue.get_nowait()
+        except queue.Empty:
+            return
+        with _lock:
+            job = _jobs.get(job_id)
+            if job is None or job.finished_at:
+                continue
+            if stage == "started":
+                job.status = "running"
+                job.started_at = timestamp
+            else:
+                job.stage = stage
+                job.progress = max(job.progress, fraction)
+
+
+def get_render_job(job_id):
+    """The tracked RenderJob with up-to-date progress, or None."""
+    _drain_progress()
+    with _lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,306 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from functools import lru_cache
+from jinja2 import Environment
+from src.analysis.statistics import extract_numeric_salaries
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the template or charts change so cached reports are re-rendered
+RENDER_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join("data_output", "reports", "cache")
+DEFAULT_CACHE_MAX_ENTRIES = 500
+DEFAULT_CACHE_MAX_MB = 256
+
+
+def get_render_settings():
+    """Report rendering settings from the `reports` section of settings.yaml."""
+    reports_config = (get_config() or {}).get("reports") or {}
+    return {
+        "cache_dir": reports_config.get("cache_dir", DEFAULT_CACHE_DIR),
+        "render_workers": int(reports_config.get("render_workers", 2)),
+        "cache_max_entries": int(reports_config.get("cache_max_entries", DEFAULT_CACHE_MAX_ENTRIES)),
+        "cache_max_mb": float(reports_config.get("cache_max_mb", DEFAULT_CACHE_MAX_MB)),
+    }
+
+
+@lru_cache(maxsize=None)
+def _plotting():
+    # matplotlib and seaborn take a large share of startup time, so they are
+    # only imported by the process that actually draws a chart
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+
+# Titles, companies and locations come from scraped pages, so everything is escaped
+REPORT_TEMPLATE = Environment(autoescape=True).from_string("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+th, td { border: 1px solid #ccc; padding: 4px 10px; text-align: left; }
+img { max-width: 100%; }
+</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+<p>{{ stats.total_jobs }} jobs from {{ stats.unique_companies }} companies.</p>
+{% if stats.salary and stats.salary.count %}
+<p>Annualized salary ({{ stats.salary.count }} postings): median {{ "{:,.0f}".format(stats.salary.median) }},
+mean {{ "{:,.0f}".format(stats.salary.mean) }}, range {{ "{:,.0f}".format(stats.salary.min) }}
+&ndash; {{ "{:,.0f}".format(stats.salary.max) }}.</p>
+{% endif %}
+{% for heading, counts in tables %}
+{% if counts %}
+<h2>{{ heading }}</h2>
+<table>
+{% for name, count in counts.items() %}<tr><td>{{ name }}</td><td>{{ count }}</td></tr>
+{% endfor %}
+</table>
+{% endif %}
+{% endfor %}
+{% for heading, image in charts %}
+<h2>{{ heading }}</h2>
+<img src="data:image/png;base64,{{ image }}" alt="{{ heading }}">
+{% endfor %}
+</body>
+</html>
+""")
+
+
+def _figure_to_base64(fig) -> str:
+    plt, _ = _plotting()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _bar_chart(counts: dict, xlabel: str) -> str:
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(8, max(2, 0.4 * len(counts))))
+    sns.barplot(x=list(counts.values()), y=list(counts.keys()), ax=ax, color="steelblue")
+    ax.set_xlabel(xlabel)
+    return _figure_to_base64(fig)
+
+
+def _trend_chart(trends_df) -> str:
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(8, 3))
+    sns.lineplot(data=trends_df, x="date", y="job_count", marker="o", ax=ax)
+    ax.set_ylabel("Jobs posted")
+    fig.autofmt_xdate()
+    return _figure_to_base64(fig)
+
+
+def _salary_chart(salaries) -> str:
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(8, 3))
+    sns.histplot(salaries, ax=ax, color="seagreen")
+    ax.set_xlabel("Annualized salary")
+    return _figure_to_base64(fig)
+
+
+def report_cache_key(stats, trends_df, jobs_df, report_name) -> str:
+    """Content hash of everything a rendered report depends on."""
+    digest = hashlib.sha256()
+    digest.update(f"v{RENDER_VERSION}\x1f{report_name}\x1f".encode("utf-8"))
+    digest.update(json.dumps(stats, sort_keys=True, default=str).encode("utf-8"))
+    for frame in (trends_df, jobs_df):
+        digest.update(b"\x1f")
+        if frame is not None:
+            digest.update(frame.to_json(orient="split", date_format="iso", default_handler=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def report_payload_cache_key(stats, payload, reference, report_name) -> str:
+    """Content hash of a report rendered from a stored jobs payload, taken without decoding it."""
+    digest = hashlib.sha256()
+    digest.update(f"v{RENDER_VERSION}\x1f{report_name}\x1f{reference}\x1f".encode("utf-8"))
+    digest.update(json.dumps(stats, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\x1f")
+    digest.update(payload.encode("utf-8") if isinstance(payload, str) else bytes(payload))
+    return digest.hexdigest()
+
+
+def _temporary_path(path) -> str:
+    # Unique per process and thread; renders run in pool processes and the API's threads
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _replace_with_copy(source, path):
+    """Copy source to path through a temporary file, so readers of path never see a partial file."""
+    partial = _temporary_path(path)
+    try:
+        shutil.copyfile(source, partial)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+
+def _replace_with_text(path, text):
+    partial = _temporary_path(path)
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+
+def prune_render_cache(cache_dir, max_entries=None, max_mb=None) -> int:
+    """
+    Delete the least recently used renders until the cache is within its limits.
+
+    A render's modification time is its last use: it is set when the render
+    is written and refreshed on every cache hit.
+
+    Returns:
+        int: number of renders deleted
+    """
+    if max_entries is None or max_mb is None:
+        settings = get_render_settings()
+        max_entries = settings["cache_max_entries"] if max_entries is None else max_entries
+        max_mb = settings["cache_max_mb"] if max_mb is None else max_mb
+    entries = []
+    try:
+        with os.scandir(cache_dir) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".html"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        return 0
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    max_bytes = max_mb * 1024 * 1024
+    removed = 0
+    for _, size, path in entries:
+        if len(entries) - removed <= max_entries and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # pruned by another process
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Pruned {removed} cached report renders from {cache_dir}")
+    return removed
+
+
+def _render_html(stats, trends_df, jobs_df, report_name, progress):
+    tasks = []
+    if stats.get("top_titles"):
+        tasks.append(("Top job titles", lambda: _bar_chart(stats["top_titles"], "Jobs")))
+    if trends_df is not None and not trends_df.empty:
+        tasks.append(("Jobs posted per day", lambda: _trend_chart(trends_df)))
+    if jobs_df is not None and "salary" in jobs_df.columns:
+        salaries = extract_numeric_salaries(jobs_df["salary"].to_numpy(dtype=object))
+        salaries = salaries[salaries == salaries]  # drop NaN
+        if salaries.size:
+            tasks.append(("Salary distribution", lambda: _salary_chart(salaries)))
+
+    charts = []
+    for done, (heading, draw) in enumerate(tasks, start=1):
+        charts.append((heading, draw()))
+        progress("charts", done / (len(tasks) + 1))
+
+    tables = [("Top companies", stats.get("top_companies")),
+              ("Top locations", stats.get("top_locations")),
+              ("Sources", stats.get("top_sources"))]
+    title = os.path.splitext(report_name)[0].replace("_", " ").title()
+    html = REPORT_TEMPLATE.render(title=title, stats=stats, tables=tables, charts=charts)
+    progress("template", 1.0)
+    return html
+
+
+def copy_cached_render(key, path, cache_dir) -> bool:
+    """Copy the cached render of key to path; False when it is not (or no longer) cached."""
+    cached = os.path.join(cache_dir, f"{key}.html")
+    if not os.path.exists(cached):
+        return False
+    try:
+        _replace_with_copy(cached, path)
+        os.utime(cached)  # mark it recently used
+    except FileNotFoundError:
+        logger.info(f"Cached render {key[:12]} was pruned meanwhile; rendering again")
+        return False
+    logger.info(f"Report {path} served from cache ({key[:12]})")
+    return True
+
+
+def render_report(stats, trends_df, jobs_df, report_name="report.html", output_dir="reports",
+                  cache_dir=None, progress=None, cache_key=None) -> dict:
+    """
+    Render an HTML report, reusing the cached render of identical input.
+
+    Args:
+        cache_dir (str): Where renders are kept by content hash (default from
+            settings.yaml; False disables the cache). The least recently used
+            renders are deleted beyond cache_max_entries or cache_max_mb.
+        progress (callable): Called as progress(stage, fraction) while rendering
+        cache_key (str): Key of the render in the cache, when the caller has
+            already hashed the input (e.g. report_payload_cache_key)
+
+    Returns:
+        dict: path, cache_key, cache_hit and timings (seconds per stage)
+    """
+    started = time.perf_counter()
+    progress = progress or (lambda stage, fraction: None)
+    if cache_dir is None:
+        cache_dir = get_render_settings()["cache_dir"]
+    key = cache_key or report_cache_key(stats, trends_df, jobs_df, report_name)
+    timings = {"hash": time.perf_counter() - started}
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, report_name)
+    cached = os.path.join(cache_dir, f"{key}.html") if cache_dir else None
+    if cached and copy_cached_render(key, path, cache_dir):
+        progress("cached", 1.0)
+        timings["total"] = time.perf_counter() - started
+        return {"path": path, "cache_key": key, "cache_hit": True, "timings": timings}
+
+    render_started = time.perf_counter()
+    html = _render_html(stats, trends_df, jobs_df, report_name, progress)
+    timings["render"] = time.perf_counter() - render_started
+    _replace_with_text(path, html)
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        _replace_with_copy(path, cached)
+        prune_render_cache(cache_dir)
+    timings["total"] = time.perf_counter() - started
+    logger.info(f"Report written to {path} in {timings['total']:.2f}s")
+    return {"path": path, "cache_key": key, "cache_hit": False, "timings": timings}
+
+
+def generate_report(stats, trends_df, jobs_df, report_name="report.html", output_dir="reports"):
+    """
+    Render an HTML report with summary tables and embedded charts.
+
+    Returns:
+        str: path of the written report
+    """
+    return render_report(stats, trends_df, jobs_df, report_name=report_name, output_dir=output_dir)["path"]
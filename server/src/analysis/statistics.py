@@ -0,0 +1,201 @@
+import re
+from functools import lru_cache
+import numpy as np
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR"}
+CURRENCY_CODES = ("USD", "EUR", "GBP", "CAD", "AUD", "CHF", "JPY", "INR", "PLN", "SEK", "NOK", "DKK")
+
+# Multipliers that turn an amount per period into an annual amount
+PERIOD_MULTIPLIERS = {"hour": 2080.0, "day": 260.0, "week": 52.0, "month": 12.0, "year": 1.0}
+
+_CURRENCY_RE = re.compile(
+    r"(?P<symbol>[$€£¥₹])|\b(?P<code>" + "|".join(CURRENCY_CODES) + r")\b",
+    re.IGNORECASE,
+)
+# A currency right before or right after an amount ("$70k", "USD 120000", "5.000 €")
+_CURRENCY_BEFORE_RE = re.compile(r"(?:[$€£¥₹]|\b(?:" + "|".join(CURRENCY_CODES) + r"))\s*$", re.IGNORECASE)
+_CURRENCY_AFTER_RE = re.compile(r"\s*(?:[$€£¥₹]|(?:" + "|".join(CURRENCY_CODES) + r")\b)", re.IGNORECASE)
+_AMOUNT_RE = re.compile(
+    r"(?P<number>\d{1,3}(?:[,\s.]\d{3})+(?!\d)|\d+(?:\.\d+)?)\s*(?P<suffix>[kKmM](?![a-zA-Z]))?"
+)
+# Numbers that are not pay: "401k match", "2+ years experience", "30-40 hours per week"
+_NOT_PAY_RE = re.compile(
+    r"\s*(?:k\s*match\b|\+?\s*(?:years?|yrs?|hours?|hrs?)\b(?:\s*(?:per|a|/)\s*(?:week|wk|day|month))?)",
+    re.IGNORECASE,
+)
+_RANGE_SEPARATOR_RE = re.compile(r"^\s*(?:-|–|—|to)\s*[$€£¥₹]?\s*$", re.IGNORECASE)
+_PERIOD_RE = re.compile(
+    r"(?P<hour>\b(?:per\s+hour|hourly|an?\s+hour|hr|hour)\b|/\s*h(?:ou)?r?\b)"
+    r"|(?P<day>\b(?:per\s+day|daily|a\s+day|day)\b|/\s*day\b)"
+    r"|(?P<week>\b(?:per\s+week|weekly|a\s+week|wk|week)\b|/\s*w(?:ee)?k\b)"
+    r"|(?P<month>\b(?:per\s+month|monthly|a\s+month|mo|month)\b|/\s*mo(?:nth)?\b)"
+    r"|(?P<year>\b(?:per\s+(?:year|annum)|annually|annual|yearly|a\s+year|p\.?a\.?|yr|year)\b|/\s*y(?:ea)?r?\b)",
+    re.IGNORECASE,
+)
+
+
+def _to_number(number: str, suffix) -> float:
+    # "70,000" / "70.000" / "70 000" are thousands separators, "72.5" is a decimal
+    if re.fullmatch(r"\d{1,3}(?:[,\s.]\d{3})+", number):
+        value = float(re.sub(r"[,\s.]", "", number))
+    else:
+        value = float(number)
+    if suffix in ("k", "K"):
+        value *= 1_000
+    elif suffix in ("m", "M"):
+        value *= 1_000_000
+    return value
+
+
+def _currency_next_to(text: str, amount) -> bool:
+    return bool(_CURRENCY_BEFORE_RE.search(text, 0, amount.start())
+                or _CURRENCY_AFTER_RE.match(text, amount.end()))
+
+
+def _period_next_to(text: str, amount) -> bool:
+    rest = text[amount.end():]
+    return bool(_PERIOD_RE.match(text, amount.end() + len(rest) - len(rest.lstrip())))
+
+
+@lru_cache(maxsize=65536)
+def parse_salary_text(text: str):
+    """
+    Parse one salary string.
+
+    Only an amount with a currency or a pay period right next to it counts as
+    pay; numbers such as "401k match", "2 years" or "40 hours" are skipped.
+
+    Returns:
+        tuple: (low, high, period, currency) with amounts per period, or None
+        when the text contains no pay amount, names more than one currency, or
+        gives no period for an amount too small to be a yearly salary
+    """
+    currencies = {CURRENCY_SYMBOLS[m.group("symbol")] if m.group("symbol") else m.group("code").upper()
+                  for m in _CURRENCY_RE.finditer(text)}
+    if len(currencies) > 1:
+        return None  # amounts in different currencies cannot be compared unconverted
+
+    # Blank out the skipped numbers with what follows them, so "40 hours per
+    # week" supplies neither an amount nor a period; "$20 hour" is still pay
+    amounts = []
+    scrubbed = text
+    for match in _AMOUNT_RE.finditer(text):
+        not_pay = _NOT_PAY_RE.match(text, match.end("number"))
+        if not_pay and not _CURRENCY_BEFORE_RE.search(text, 0, match.start()):
+            scrubbed = scrubbed[:match.start()] + " " * (not_pay.end() - match.start()) + scrubbed[not_pay.end():]
+        else:
+            amounts.append(match)
+    for index, amount in enumerate(amounts):
+        if _currency_next_to(text, amount) or _period_next_to(text, amount):
+            break
+    else:
+        return None
+
+    low = _to_number(amount.group("number"), amount.group("suffix"))
+    high = low
+    end = amount.end()
+    if index + 1 < len(amounts):
+        upper = amounts[index + 1]
+        if _RANGE_SEPARATOR_RE.match(text[amount.end():upper.start()]):
+            high = _to_number(upper.group("number"), upper.group("suffix") or amount.group("suffix"))
+            end = upper.end()
+            # "$70-80k": the suffix on the upper bound applies to the lower one too
+            if amount.group("suffix") is None and upper.group("suffix") and low < 1000 <= high:
+                low = _to_number(amount.group("number"), upper.group("suffix"))
+    if high < low:
+        low, high = high, low
+
+    # The period after the amount wins over one elsewhere in the text
+    period_match = _PERIOD_RE.search(scrubbed, end) or _PERIOD_RE.search(scrubbed)
+    if period_match:
+        period = period_match.lastgroup
+    elif high >= 1000:
+        period = "year"
+    else:
+        return None  # "$25" alone could be per hour, day or week
+
+    return low, high, period, next(iter(currencies), None)
+
+
+def parse_salaries(values):
+    """
+    Parse a whole column of salary strings at once.
+
+    Each distinct string is parsed a single time (and memoized across calls);
+    annualization and range midpoints are computed with NumPy over the column.
+
+    Returns:
+        DataFrame: annual_min, annual_max, annual_mid (NaN when unparseable),
+        period and currency, aligned with the input
+    """
+    # pandas is imported on first use; it would be the largest share of API startup
+    import pandas as pd
+
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    count = len(uniques)
+    low = np.full(count, np.nan)
+    high = np.full(count, np.nan)
+    multiplier = np.full(count, np.nan)
+    period = np.full(count, None, dtype=object)
+    currency = np.full(count, None, dtype=object)
+    for idx, value in enumerate(uniques):
+        parsed = parse_salary_text(value if isinstance(value, str) else str(value))
+        if parsed is None:
+            continue
+        low[idx], high[idx], period[idx], currency[idx] = parsed
+        multiplier[idx] = PERIOD_MULTIPLIERS[parsed[2]]
+
+    annual_min = low * multiplier
+    annual_max = high * multiplier
+    missing = codes < 0
+    take = np.where(missing, 0, codes)
+
+    def expand(column, fill):
+        if count == 0:
+            return np.full(len(codes), fill, dtype=column.dtype)
+        expanded = column[take]
+        expanded[missing] = fill
+        return expanded
+
+    return pd.DataFrame({
+        "annual_min": expand(annual_min, np.nan),
+        "annual_max": expand(annual_max, np.nan),
+        "annual_mid": expand((annual_min + annual_max) / 2.0, np.nan),
+        "period": expand(period, None),
+        "currency": expand(currency, None),
+    })
+
+
+def extract_numeric_salaries(values) -> np.ndarray:
+    """Annualized salary midpoints for a column of salary strings (NaN if unparseable)."""
+    return parse_salaries(values)["annual_mid"].to_numpy()
+
+
+def extract_numeric_salary(salary):
+    """Annualized salary midpoint of a single salary string, or None."""
+    if not salary:
+        return None
+    parsed = parse_salary_text(str(salary))
+    if parsed is None:
+        return None
+    low, high, period, _ = parsed
+    return (low + high) / 2.0 * PERIOD_MULTIPLIERS[period]
+
+
+def generate_basic_stats(jobs, top_n=10) -> dict:
+    """
+    Summary statistics for a list of (cleaned) job postings.
+
+    Returns:
+        dict: total_jobs, unique_companies, top_titles, top_companies,
+        top_locations, top_sources and salary (count, mean, median, min, max
+        and percentiles)
+    """
+    from src.analysis.streaming import StreamingStats
+
+    stats = StreamingStats().update(jobs).summary(top_n)
+    logger.info(f"Generated stats for {stats['total_jobs']} jobs")
+    return stats
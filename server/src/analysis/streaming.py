@@ -0,0 +1,245 @@
+import json
+from collections import Counter
+import numpy as np
+from src.analysis.statistics import extract_numeric_salaries
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SKETCH_SIZE = 200
+SALARY_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+COUNTED_FIELDS = ("title", "company", "location", "source")
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over a stream of floats.
+
+    Values are kept in a stack of compactors; level h holds items that each
+    stand for 2**h inputs. When a level overflows it is sorted and every other
+    item (random offset) is promoted to the next level, so memory stays around
+    3k items while rank error stays around 1.7/k. Sketches built on different
+    workers merge by concatenating their levels, and until the first
+    compaction the sketch is exact.
+    """
+
+    def __init__(self, k=DEFAULT_SKETCH_SIZE, seed=None):
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        while True:
+            overflowing = [level for level in range(len(self.levels))
+                           if len(self.levels[level]) > self._capacity(level)]
+            if not overflowing:
+                return
+            level = overflowing[0]
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind so no weight is lost
+            keep = items[:len(items) % 2]
+            promoted = items[len(keep) + int(self._rng.integers(2))::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values):
+        """Add a batch of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += int(values.size)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, fractions):
+        """Approximate values at the given fractions (0..1) of the stream."""
+        fractions = np.asarray(fractions, dtype=float)
+        if self.count == 0:
+            return np.full(fractions.shape, np.nan)
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], fractions)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, fractions * cumulative[-1], side="left")
+        result = items[np.minimum(positions, len(items) - 1)]
+        result = np.where(fractions <= 0, self.min, result)
+        return np.where(fractions >= 1, self.max, result)
+
+    def quantile(self, fraction):
+        return float(self.quantiles([fraction])[0])
+
+    def to_dict(self) -> dict:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "levels": [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data["k"])
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.levels = [np.asarray(level, dtype=float) for level in data["levels"]] or [np.empty(0)]
+        return sketch
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+def salary_summary(salary_sum, sketch, percentiles=SALARY_PERCENTILES) -> dict:
+    """count, mean, median, min, max and percentiles of annualized salaries."""
+    summary = {"count": sketch.count}
+    if sketch.count:
+        values = sketch.quantiles(percentiles)
+        summary.update({
+            "mean": salary_sum / sketch.count,
+            "median": sketch.quantile(0.5),
+            "min": sketch.min,
+            "max": sketch.max,
+            "percentiles": {f"p{round(p * 100)}": float(v) for p, v in zip(percentiles, values)},
+        })
+    return summary
+
+
+class StreamingStats:
+    """
+    Job statistics that are updated batch by batch instead of recomputed.
+
+    Keeps exact counts by title, company, location and source, running salary
+    count/sum/min/max and a KLL sketch for salary percentiles. Instances built
+    on different workers or for different reports can be merged, and the
+    whole state round-trips through JSON.
+    """
+
+    def __init__(self, sketch_size=DEFAULT_SKETCH_SIZE):
+        self.total_jobs = 0
+        self.counts = {field: Counter() for field in COUNTED_FIELDS}
+        self.salary_sum = 0.0
+        self.salary = KLLSketch(k=sketch_size)
+
+    def update(self, jobs):
+        """Add a batch of job dicts."""
+        jobs = list(jobs)
+        self.total_jobs += len(jobs)
+        for field, counter in self.counts.items():
+            counter.update(value for value in (job.get(field) for job in jobs) if isinstance(value, str) and value)
+        salaries = extract_numeric_salaries([job.get("salary") for job in jobs])
+        salaries = salaries[~np.isnan(salaries)]
+        self.salary_sum += float(salaries.sum())
+        self.salary.update(salaries)
+        return self
+
+    def merge(self, other):
+        """Fold another StreamingStats into this one."""
+        self.total_jobs += other.total_jobs
+        for field, counter in self.counts.items():
+            counter.update(other.counts[field])
+        self.salary_sum += other.salary_sum
+        self.salary.merge(other.salary)
+        return self
+
+    def summary(self, top_n=10, percentiles=SALARY_PERCENTILES) -> dict:
+        """Stats dict as returned by generate_basic_stats."""
+        return {
+            "total_jobs": self.total_jobs,
+            "unique_companies": len(self.counts["company"]),
+            "top_titles": dict(self.counts["title"].most_common(top_n)),
+            "top_companies": dict(self.counts["company"].most_common(top_n)),
+            "top_locations": dict(self.counts["location"].most_common(top_n)),
+            "top_sources": dict(self.counts["source"].most_common(top_n)),
+            "salary": salary_summary(self.salary_sum, self.salary, percentiles),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "total_jobs": self.total_jobs,
+            "counts": {field: dict(counter) for field, counter in self.counts.items()},
+            "salary_sum": self.salary_sum,
+            "salary": self.salary.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.total_jobs = data["total_jobs"]
+        for field in COUNTED_FIELDS:
+            stats.counts[field] = Counter(data["counts"].get(field) or {})
+        stats.salary_sum = data["salary_sum"]
+        stats.salary = KLLSketch.from_dict(data["salary"])
+        return stats
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+
+def stats_from_payload(payload) -> StreamingStats:
+    """StreamingStats of a decoded report payload (a JSON list of job dicts)."""
+    stats = StreamingStats()
+    if isinstance(payload, list):
+        stats.update(job for job in payload if isinstance(job, dict))
+    return stats
+
+
+def report_stats(report) -> StreamingStats:
+    """
+    StreamingStats for a UserReport, from its stats_data when present.
+
+    Reports saved before stats were stored are computed from jobs_data once;
+    the result is set on the report for the caller to commit.
+    """
+    if report.stats_data:
+        return StreamingStats.from_json(report.stats_data)
+    try:
+        payload = json.loads(report.jobs_data)
+    except (TypeError, ValueError):
+        payload = None
+    stats = stats_from_payload(payload)
+    report.stats_data = stats.to_json()
+    return stats
@@ -0,0 +1,155 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import numpy as np
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%B %d, %Y", "%b %d, %Y",
+                "%d %B %Y", "%d %b %Y", "%m/%d/%Y", "%d.%m.%Y")
+
+_RELATIVE_RE = re.compile(
+    r"^(?:posted\s+)?(?P<amount>\d+|an?|one)\+?\s*(?P<unit>minute|min|hour|hr|day|week|month|year)s?\s+ago$"
+)
+_UNIT_DELTAS = {
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1),
+    "day": timedelta(days=1), "week": timedelta(weeks=1),
+    "month": timedelta(days=30), "year": timedelta(days=365),
+}
+_NOW_WORDS = ("today", "just now", "just posted", "now")
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Dates are compared and stored as naive UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _from_epoch(timestamp: float) -> datetime:
+    # LinkedIn's listedAt is in milliseconds
+    seconds = timestamp / 1000 if timestamp > 1e11 else timestamp
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=65536)
+def _parse_text(text: str):
+    """
+    Parse a date string independently of the reference time.
+
+    Returns:
+        tuple: ("ago", timedelta) for relative dates, ("at", datetime) for
+        absolute ones, or None when the text is not a date
+    """
+    if text.isdigit():
+        return "at", _from_epoch(float(text))
+    lowered = text.lower()
+    if lowered in _NOW_WORDS:
+        return "ago", timedelta(0)
+    if lowered == "yesterday":
+        return "ago", timedelta(days=1)
+    match = _RELATIVE_RE.match(lowered)
+    if match:
+        amount = match.group("amount")
+        amount = int(amount) if amount.isdigit() else 1
+        return "ago", amount * _UNIT_DELTAS[match.group("unit")]
+    for date_format in DATE_FORMATS:
+        try:
+            return "at", datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_value(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return "at", _utc_naive(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "at", _from_epoch(float(value))
+    return _parse_text(str(value).strip())
+
+
+def parse_date(value, reference=None):
+    """
+    Parse a posting date as scraped ("today", "2 days ago", "April 10, 2025",
+    ISO dates or LinkedIn epoch milliseconds).
+
+    Relative dates are resolved against `reference` (default: now). All
+    results are naive UTC.
+
+    Returns:
+        datetime or None if the value cannot be parsed
+    """
+    parsed = _parse_value(value)
+    if parsed is None:
+        return None
+    kind, parsed_value = parsed
+    if kind == "at":
+        return parsed_value
+    reference = _utc_naive(reference) if reference else datetime.now(timezone.utc).replace(tzinfo=None)
+    return reference - parsed_value
+
+
+def normalize_dates(values, reference=None) -> np.ndarray:
+    """
+    Parse a whole column of posting dates against one fixed reference time.
+
+    Each distinct value is parsed once (and memoized across calls, since the
+    parse itself does not depend on the reference); relative offsets are then
+    applied to the reference with NumPy.
+
+    Returns:
+        np.ndarray: datetime64[us] (naive UTC) aligned with the input, NaT where
+        a value cannot be parsed
+    """
+    # pandas is imported on first use; it would be the largest share of API startup
+    import pandas as pd
+
+    reference = _utc_naive(reference) if reference else datetime.now(timezone.utc).replace(tzinfo=None)
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    count = len(uniques)
+    absolute = np.full(count, np.datetime64("NaT"), dtype="datetime64[us]")
+    offset = np.full(count, np.timedelta64("NaT"), dtype="timedelta64[us]")
+    for idx, value in enumerate(uniques):
+        parsed = _parse_value(value)
+        if parsed is None:
+            continue
+        kind, parsed_value = parsed
+        if kind == "at":
+            absolute[idx] = parsed_value
+        else:
+            offset[idx] = parsed_value
+    resolved = np.where(np.isnat(offset), absolute, np.datetime64(reference, "us") - offset)
+
+    result = np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[us]")
+    present = codes >= 0
+    result[present] = resolved[codes[present]]
+    return result
+
+
+def generate_time_trends(jobs, reference=None):
+    """
+    Count postings per day.
+
+    A job's stored `posted_at` is used when present; otherwise its
+    `date_posted` text is parsed.
+
+    Returns:
+        DataFrame: `date` and `job_count` columns sorted by date; empty if no
+        posting has a parseable date
+    """
+    import pandas as pd
+
+    dates = normalize_dates([job.get("posted_at") or job.get("date_posted") for job in jobs], reference)
+    days = dates[~np.isnat(dates)].astype("datetime64[D]")
+    if days.size == 0:
+        logger.info("No parseable posting dates for time trends")
+        return pd.DataFrame(columns=["date", "job_count"])
+    unique_days, counts = np.unique(days, return_counts=True)
+    trends = pd.DataFrame({"date": unique_days.astype("datetime64[ns]"), "job_count": counts})
+    logger.info(f"Generated time trends over {len(trends)} days")
+    return trends
@@ -1,10 +1,69 @@
-from fastapi import FastAPI
+import importlib
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from opentelemetry import trace
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from .actions import router as actions_router
+from .analytics import router as analytics_router
+from .jobs import router as jobs_router
 from .supabase_auth import router as supabase_auth_router
+from src.analysis.rendering import shutdown_render_pool
+from src.scrapers.browser_pool import shutdown_tab_pool
+from src.scrapers.crawls import get_crawl_settings, start_crawl_scheduler, stop_crawl_scheduler
+from src.scrapers.scheduler import SCRAPER_MODULES, shutdown_scheduler
 from src.supabase.supabase import supabase_config
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+from src.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, metrics_payload, status_class
+from src.utils.profiling import PROFILE_ID_HEADER, profiling_requested, start_profile, stop_profile
+from src.utils.tracing import (
+    DEBUG_TIMING_HEADER,
+    get_tracing_settings,
+    server_timing,
+    setup_tracing,
+    shutdown_tracing,
+    timing_collector,
+    tracer,
+    tracing_enabled,
+)
+
+logger = get_logger(__name__)
+
+
+def warm_up():
+    """Import the scraper backends and create external clients ahead of the first request."""
+    started = time.perf_counter()
+    for module in SCRAPER_MODULES + ("src.utils.linkedin_auth",):
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Warm-up import of {module} failed: {e}")
+    supabase_config.get_client()
+    logger.info(f"API warm-up finished in {time.perf_counter() - started:.2f}s")
 
-app = FastAPI(title="TalentTrek API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app):
+    if get_tracing_settings()["enabled"]:
+        setup_tracing()
+    api_config = (get_config() or {}).get("api") or {}
+    if api_config.get("warmup", False):
+        # In the background, so a slow or misconfigured Supabase never holds up startup
+        threading.Thread(target=warm_up, name="api-warmup", daemon=True).start()
+    if get_crawl_settings()["enabled"]:
+        start_crawl_scheduler()
+    yield
+    stop_crawl_scheduler(wait=False)
+    shutdown_scheduler(wait=False)
+    shutdown_tab_pool(wait=False)
+    shutdown_render_pool(wait=False)
+    shutdown_tracing()
+
+
+app = FastAPI(title="TalentTrek API", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -15,8 +74,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = None
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # The route template, not the raw path, keeps label cardinality bounded
+        route = request.scope.get("route")
+        route = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_DURATION.labels(method=request.method, route=route).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(method=request.method, route=route,
+                             status_class=status_class(status_code or 500)).inc()
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    if not tracing_enabled():
+        return await call_next(request)
+    started = time.perf_counter()
+    with tracer.start_as_current_span(request.method, kind=trace.SpanKind.SERVER, attributes={
+        "http.request.method": request.method,
+        "url.path": request.url.path,
+    }) as span:
+        trace_id = span.get_span_context().trace_id
+        debug_timing = request.headers.get(DEBUG_TIMING_HEADER) == "1"
+        if debug_timing:
+            timing_collector.start(trace_id)
+        try:
+            response = await call_next(request)
+        finally:
+            route = getattr(request.scope.get("route"), "path", None)
+            if route:
+                span.update_name(f"{request.method} {route}")
+                span.set_attribute("http.route", route)
+            spans = timing_collector.finish(trace_id) if debug_timing else None
+        span.set_attribute("http.response.status_code", response.status_code)
+        if debug_timing:
+            response.headers["Server-Timing"] = server_timing(
+                spans, span.get_span_context().span_id, time.perf_counter() - started)
+        return response
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    if not profiling_requested(request.headers, request.query_params):
+        return await call_next(request)
+    # Endpoints decorated with @profiled pick the profile up from the context
+    profile, token = start_profile(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        stop_profile(token)
+    if not profile.empty:
+        await run_in_threadpool(profile.save)
+        response.headers[PROFILE_ID_HEADER] = profile.id
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics of the API and the scrape pipeline."""
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
+
 # Register core routers
 app.include_router(actions_router)
+app.include_router(jobs_router)
+app.include_router(analytics_router)
 
 # Register only Supabase authentication router
 app.include_router(supabase_auth_router)
\ No newline at end of file
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.responses import PlainTextResponse, JSONResponse
 import subprocess
 import json
 import os
 from src.utils.helpers import load_sources_config
-from src.scrapers.static_scraper import StaticScraper
-from src.scrapers.selenium_scraper import SeleniumScraper
-from src.scrapers.api_scraper import APIScraper
-import logging
+from sqlalchemy.orm import Session
+from src.data.crawl_store import delete_crawl_schedule, list_crawl_schedules, save_crawl_schedule
+from src.data.database import get_db, get_session
+from src.data.job_store import store_scrape_results
+from src.scrapers.scheduler import INTERACTIVE, scheduler_metrics, scrape_sources
+from src.utils.logger import get_logger
+from src.utils.profiling import profiled
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api")
 
@@ -24,77 +29,77 @@ def test():
         return PlainTextResponse(f"Test run failed: {str(e)}", status_code=500)
 
 @router.post("/scrape/jobs")
+@profiled
 def scrape_jobs(payload: dict = Body(...)):
     """
     Expects JSON: {"keyword": str, "sources": [source_id, ...]}
     """
     try:
-        logging.info(f"Received scrape_jobs payload: {payload}")
+        logger.info("Received scrape_jobs payload: %s", payload)
         keyword = payload.get("keyword")
         source_ids = payload.get("sources", [])
         if not keyword or not source_ids:
             return JSONResponse({"error": "Missing keyword or sources."}, status_code=400)
 
         sources = load_sources_config()
-        jobs = []
-        for src_id in source_ids:
-            src = sources.get(src_id)
-            if not src:
-                logging.warning(f"Source id not found: {src_id}")
-                continue
-            
-            logging.info(f"Scraping source: {src['name']} ({src_id})")
-            
-            if src["type"] == "static":
-                url = src["search_url"].replace("{keyword}", keyword)
-                selectors = src["selectors"]
-                logging.info(f"Static scraping URL: {url}")
-                scraper = StaticScraper()
-                scraped = scraper.scrape_jobs(
-                    url=url,
-                    job_selector=selectors["job_selector"],
-                    fields={k: v for k, v in selectors.items() if k != "job_selector"}
-                )
-                for job in scraped:
-                    job["source"] = src["name"]
-                    job["url"] = url
-                jobs += scraped
-            elif src["type"] == "dynamic":
-                url = src["search_url"].replace("{keyword}", keyword)
-                selectors = src["selectors"]
-                logging.info(f"Dynamic scraping URL: {url}")
-                scraper = SeleniumScraper(headless=True)
-                scroll_count = src.get("scroll_count", 3)
-                scraped = scraper.scrape_jobs(
-                    url=url,
-                    job_selector=selectors["job_selector"],
-                    fields={k: v for k, v in selectors.items() if k != "job_selector"},
-                    scroll_count=scroll_count,
-                    source_id=src_id
-                )
-                for job in scraped:
-                    job["source"] = src["name"]
-                    job["url"] = url
-                scraper.close()
-                jobs += scraped
-            elif src["type"] == "api":
-                api_url = src["api_url"].replace("{keyword}", keyword)
-                data_mapping = src["data_mapping"]
-                logging.info(f"API scraping URL: {api_url}")
-                scraper = APIScraper()
-                scraped = scraper.scrape_jobs(
-                    api_url=api_url,
-                    data_mapping=data_mapping,
-                    source_id=src_id
-                )
-                for job in scraped:
-                    job["source"] = src["name"]
-                jobs += scraped
+        results = scrape_sources(sources, source_ids, keyword, priority=INTERACTIVE)
+        jobs = [job for _, scraped in results for job in scraped]
+        save_scrape_results(results, keyword)
         return JSONResponse({"jobs": jobs})
     except Exception as e:
-        logging.exception("Error in scrape_jobs endpoint")
+        logger.exception("Error in scrape_jobs endpoint")
         return JSONResponse({"error": str(e)}, status_code=500)
 
+def save_scrape_results(results, keyword=None):
+    """Upsert scraped jobs into job_postings; failures are logged, never returned to the client."""
+    if not results:
+        return
+    session = get_session()
+    try:
+        summary = store_scrape_results(session, results, keyword=keyword)
+        logger.info("Stored scrape results: %s new, %s refreshed postings", summary['inserted'], summary['updated'],
+                    extra=summary)
+    except Exception:
+        logger.exception("Failed to store scrape results")
+    finally:
+        session.close()
+
+@router.get("/scheduler/metrics")
+def get_scheduler_metrics():
+    """Queue depth, wait and run times of the scrape executors, by resource class."""
+    return scheduler_metrics()
+
+@router.get("/crawls")
+def list_crawls(db: Session = Depends(get_db)):
+    """Saved crawls with their schedule, last outcome and watermark."""
+    return list_crawl_schedules(db)
+
+@router.post("/crawls", status_code=201)
+def save_crawl(payload: dict = Body(...), db: Session = Depends(get_db)):
+    """
+    Expects JSON: {"keyword": str, "source": source_id, "interval_minutes": int,
+    "max_pages": int, "enabled": bool}; saving an existing (keyword, source) pair updates it.
+    """
+    keyword = (payload.get("keyword") or "").strip()
+    source = payload.get("source")
+    if not keyword or source not in load_sources_config():
+        raise HTTPException(status_code=400, detail="A keyword and a known source id are required.")
+    try:
+        interval_minutes = int(payload.get("interval_minutes", 360))
+        max_pages = int(payload.get("max_pages", 5))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="interval_minutes and max_pages must be integers.")
+    if interval_minutes < 1 or max_pages < 1:
+        raise HTTPException(status_code=400, detail="interval_minutes and max_pages must be at least 1.")
+    schedule = save_crawl_schedule(db, keyword, source, interval_minutes, max_pages,
+                                   enabled=bool(payload.get("enabled", True)))
+    return next(crawl for crawl in list_crawl_schedules(db) if crawl["id"] == schedule.id)
+
+@router.delete("/crawls/{crawl_id}", status_code=204)
+def delete_crawl(crawl_id: int, db: Session = Depends(get_db)):
+    if not delete_crawl_schedule(db, crawl_id):
+        raise HTTPException(status_code=404, detail="Crawl not found")
+
 @router.get("/sources")
 def list_sources():
     sources = load_sources_config()
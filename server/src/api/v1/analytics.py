@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from src.data.database import get_db
+from src.data.rollups import query_trends
+from src.schemas.jobs import TrendsResponse
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+DEFAULT_TREND_DAYS = 30
+MAX_TREND_DAYS = 366 * 5
+
+@router.get("/trends", response_model=TrendsResponse)
+def get_trends(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    keyword: Optional[str] = Query(None, description="Search keyword postings were scraped for"),
+    source: Optional[str] = Query(None, description="Source id from sources.yaml"),
+    location: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Postings per day and salary percentiles, answered from the daily rollups."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_TREND_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    if (end - start).days >= MAX_TREND_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {MAX_TREND_DAYS} days"
+        )
+    return query_trends(db, start, end, keyword=keyword, source=source, location=location)
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+
+from src.data.database import get_db
+from src.data.export import (
+    POSTING_COLUMNS,
+    export_headers,
+    posting_batches,
+    posting_column_types,
+    select_columns,
+    stream_export,
+)
+from src.data.search import search_job_postings
+from src.schemas.jobs import JobSearchResponse
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+@router.get("/search", response_model=JobSearchResponse)
+def search_jobs(
+    q: str = Query(..., min_length=1, description="Search terms"),
+    source: Optional[str] = Query(None, description="Source id from sources.yaml"),
+    location: Optional[str] = None,
+    posted_after: Optional[datetime] = None,
+    posted_before: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Ranked full-text search over stored job postings with cursor pagination."""
+    try:
+        return search_job_postings(
+            db, q,
+            source=source,
+            location=location,
+            posted_after=posted_after,
+            posted_before=posted_before,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/export")
+def export_jobs(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|parquet|arrow)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export (default: all)"),
+    source: Optional[str] = Query(None, description="Source id from sources.yaml"),
+    keyword: Optional[str] = Query(None, description="Search keyword the postings were scraped for"),
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    posted_after: Optional[datetime] = None,
+    posted_before: Optional[datetime] = None
+):
+    """Stream stored job postings as CSV, Parquet or Arrow IPC, read from the database in batches."""
+    try:
+        selected = select_columns(columns, POSTING_COLUMNS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    batches = posting_batches(
+        selected,
+        source=source,
+        keyword=keyword,
+        location=location,
+        title=title,
+        posted_after=posted_after,
+        posted_before=posted_before
+    )
+    headers = export_headers("job_postings", export_format)
+    return StreamingResponse(stream_export(batches, posting_column_types(selected), export_format),
+                             media_type=headers.pop("Content-Type"), headers=headers)
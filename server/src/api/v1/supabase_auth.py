@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session, defer
 from datetime import timedelta
+from typing import Optional
 import json
+import os
 from pydantic import BaseModel
 
-from src.data.database import get_session
+from src.analysis.streaming import StreamingStats, report_stats, stats_from_payload
+from src.data.database import get_db
 from src.data.models import User, UserReport
 from src.schemas.auth import UserResponse, Token, UserReportCreate, UserReportResponse
 from src.supabase.supabase_auth import supabase_auth
 from src.supabase.supabase import supabase_config
+from src.utils.compression import accepts_encoding, iter_decompressed, payload_codec
+from src.utils.profiling import profiled
 
 # Simple request models for auth
 class RegisterRequest(BaseModel):
@@ -20,10 +26,16 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+RENDERED_REPORTS_DIR = os.path.join("data_output", "reports")
+RENDERED_REPORT_HEADERS = {
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; img-src data:",
+    "X-Content-Type-Options": "nosniff",
+}
+
 router = APIRouter(prefix="/api/supabase-auth", tags=["supabase-authentication"])
 
 @router.post("/register", response_model=UserResponse)
-def register(user_data: RegisterRequest, db: Session = Depends(get_session)):
+def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
     """Register a new user using Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
         raise HTTPException(
@@ -68,7 +80,7 @@ def register(user_data: RegisterRequest, db: Session = Depends(get_session)):
         )
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: LoginRequest, db: Session = Depends(get_session)):
+def login(user_credentials: LoginRequest, db: Session = Depends(get_db)):
     """Login user using Supabase Auth and return access token."""
     if not supabase_config.use_supabase_auth_enabled():
         raise HTTPException(
@@ -102,7 +114,7 @@ def login(user_credentials: LoginRequest, db: Session = Depends(get_session)):
         )
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: dict = Depends(supabase_auth.get_current_user), db: Session = Depends(get_session)):
+def get_current_user_info(current_user: dict = Depends(supabase_auth.get_current_user), db: Session = Depends(get_db)):
     """Get current user information from Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
         raise HTTPException(
@@ -119,10 +131,11 @@ def get_current_user_info(current_user: dict = Depends(supabase_auth.get_current
     return user
 
 @router.post("/reports", response_model=UserReportResponse)
+@profiled
 def save_user_report(
     report_data: UserReportCreate,
     current_user: dict = Depends(supabase_auth.get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Save a user report using Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
@@ -132,7 +145,7 @@ def save_user_report(
         )
     # Validate that jobs_data is valid JSON
     try:
-        json.loads(report_data.jobs_data)
+        jobs = json.loads(report_data.jobs_data)
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -152,7 +165,9 @@ def save_user_report(
         jobs_data=report_data.jobs_data,
         keyword=report_data.keyword,
         sources_used=report_data.sources_used,
-        job_count=report_data.job_count
+        job_count=report_data.job_count,
+        # Computed once here so stats never need a rescan of jobs_data
+        stats_data=stats_from_payload(jobs).to_json()
     )
     db.add(db_report)
     db.commit()
@@ -162,7 +177,7 @@ def save_user_report(
 @router.get("/reports", response_model=list[UserReportResponse])
 def get_user_reports(
     current_user: dict = Depends(supabase_auth.get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Get all reports for the current user using Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
@@ -180,11 +195,44 @@ def get_user_reports(
     reports = db.query(UserReport).filter(UserReport.user_id == user.id).all()
     return reports
 
+@router.get("/reports/stats")
+@profiled
+def get_user_reports_stats(
+    top_n: int = 10,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Statistics across all of the user's reports, merged from their stored stats."""
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    # Get user from local database
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found in local database"
+        )
+    # jobs_data is only loaded for reports saved before stats were stored
+    reports = db.query(UserReport).options(defer(UserReport.jobs_data_raw)).filter(
+        UserReport.user_id == user.id
+    ).all()
+    backfill = any(not report.stats_data for report in reports)
+    merged = StreamingStats()
+    for report in reports:
+        merged.merge(report_stats(report))
+    if backfill:
+        db.commit()
+    return {"report_count": len(reports), **merged.summary(top_n)}
+
 @router.get("/reports/{report_id}", response_model=UserReportResponse)
+@profiled
 def get_user_report(
     report_id: int,
     current_user: dict = Depends(supabase_auth.get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Get a specific user report using Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
@@ -210,11 +258,229 @@ def get_user_report(
         )
     return report
 
+@router.get("/reports/{report_id}/jobs")
+@profiled
+def get_user_report_jobs(
+    report_id: int,
+    request: Request,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the jobs JSON of a report, passing compressed payloads through when the client accepts them."""
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    # Get user from local database
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found in local database"
+        )
+    report = db.query(UserReport).filter(
+        UserReport.id == report_id,
+        UserReport.user_id == user.id
+    ).first()
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    payload = report.jobs_data_raw
+    codec = payload_codec(payload)
+    if codec and accepts_encoding(request.headers.get("accept-encoding"), codec):
+        # Send the stored bytes as is, the client decompresses them
+        return Response(
+            content=bytes(payload[1:]),
+            media_type="application/json",
+            headers={"Content-Encoding": codec, "Vary": "Accept-Encoding"}
+        )
+    return StreamingResponse(
+        iter_decompressed(payload),
+        media_type="application/json",
+        headers={"Vary": "Accept-Encoding"}
+    )
+
+@router.get("/reports/{report_id}/export")
+@profiled
+def export_user_report(
+    report_id: int,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|parquet|arrow)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export (default: all)"),
+    source: Optional[str] = Query(None, description="Source name, as stored in the report's jobs"),
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the jobs of a report as CSV, Parquet or Arrow IPC, decoding its payload incrementally."""
+    from src.data.export import (
+        REPORT_COLUMNS,
+        export_headers,
+        report_batches,
+        report_column_types,
+        select_columns,
+        stream_export,
+    )
+
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    try:
+        selected = select_columns(columns, REPORT_COLUMNS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # Get user from local database
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found in local database"
+        )
+    report = db.query(UserReport).filter(
+        UserReport.id == report_id,
+        UserReport.user_id == user.id
+    ).first()
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    # The stored payload stays compressed; rows are decoded as they are sent
+    batches = report_batches(report.jobs_data_raw, selected, source=source, location=location, title=title)
+    headers = export_headers(f"report_{report_id}", export_format)
+    return StreamingResponse(stream_export(batches, report_column_types(selected), export_format),
+                             media_type=headers.pop("Content-Type"), headers=headers)
+
+@router.get("/reports/{report_id}/stats")
+@profiled
+def get_user_report_stats(
+    report_id: int,
+    top_n: int = 10,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Statistics of a report, read from its stored stats without rescanning the jobs."""
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    # Get user from local database
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found in local database"
+        )
+    report = db.query(UserReport).options(defer(UserReport.jobs_data_raw)).filter(
+        UserReport.id == report_id,
+        UserReport.user_id == user.id
+    ).first()
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    backfill = not report.stats_data
+    stats = report_stats(report)
+    if backfill:
+        db.commit()
+    return stats.summary(top_n)
+
+@router.post("/reports/{report_id}/render", status_code=status.HTTP_202_ACCEPTED)
+@profiled
+def render_user_report(
+    report_id: int,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue an HTML rendering of a report; poll /render-jobs/{job_id} for progress."""
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    # Get user from local database
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found in local database"
+        )
+    report = db.query(UserReport).filter(
+        UserReport.id == report_id,
+        UserReport.user_id == user.id
+    ).first()
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    from src.analysis.rendering import submit_payload_render
+
+    backfill = not report.stats_data
+    stats = report_stats(report).summary()
+    if backfill:
+        db.commit()
+    # The payload is decoded in the render process; trends are resolved
+    # against the save time so the cache key does not change from day to day
+    job = submit_payload_render(stats, report.jobs_data_raw, report.created_at, f"report_{report.id}.html",
+                                RENDERED_REPORTS_DIR, owner=user.id)
+    return job.to_dict()
+
+def _get_owned_render_job(job_id, current_user, db):
+    from src.analysis.rendering import get_render_job
+
+    if not supabase_config.use_supabase_auth_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Supabase Auth is not enabled"
+        )
+    user = db.query(User).filter(User.email == current_user["email"]).first()
+    job = get_render_job(job_id)
+    if not user or not job or job.owner != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
+        )
+    return job
+
+@router.get("/render-jobs/{job_id}")
+def get_render_job_status(
+    job_id: str,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Status, progress and timings of a report render."""
+    return _get_owned_render_job(job_id, current_user, db).to_dict()
+
+@router.get("/render-jobs/{job_id}/html")
+@profiled
+def get_rendered_report(
+    job_id: str,
+    current_user: dict = Depends(supabase_auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """The rendered HTML of a finished render job."""
+    job = _get_owned_render_job(job_id, current_user, db)
+    if job.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Render job is {job.status}"
+        )
+    # Nothing in a report needs scripts or outside resources; charts are inline data: images
+    return FileResponse(job.path, media_type="text/html", headers=RENDERED_REPORT_HEADERS)
+
 @router.delete("/reports/{report_id}")
 def delete_user_report(
     report_id: int,
     current_user: dict = Depends(supabase_auth.get_current_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Delete a user report using Supabase Auth."""
     if not supabase_config.use_supabase_auth_enabled():
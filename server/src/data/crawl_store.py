@@ -0,0 +1,141 @@
+"""
+Crawl schedules and watermarks (crawl_schedules, crawl_watermarks tables).
+
+Used by src.scrapers.crawls, which runs the schedules; see there for how
+watermarks cut pagination short.
+"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from src.data.models import CrawlSchedule, CrawlWatermark, JobPosting
+
+
+def _utc(moment):
+    """SQLite hands timestamps back naive; they are stored as UTC."""
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def save_crawl_schedule(session, keyword, source_slug, interval_minutes, max_pages, enabled=True):
+    """Create or update the schedule of a (keyword, source) pair; it first runs right away."""
+    keyword = keyword.strip().lower()
+    schedule = session.execute(
+        select(CrawlSchedule).where(CrawlSchedule.keyword == keyword, CrawlSchedule.source_slug == source_slug)
+    ).scalar_one_or_none()
+    if schedule is None:
+        schedule = CrawlSchedule(keyword=keyword, source_slug=source_slug,
+                                 next_run_at=datetime.now(timezone.utc))
+        session.add(schedule)
+    schedule.interval_minutes = interval_minutes
+    schedule.max_pages = max_pages
+    schedule.enabled = enabled
+    session.commit()
+    return schedule
+
+
+def due_crawl_schedules(session, now) -> list:
+    """Enabled schedules whose next run is at or before `now`, oldest first."""
+    return list(session.execute(
+        select(CrawlSchedule)
+        .where(CrawlSchedule.enabled.is_(True), CrawlSchedule.next_run_at <= now)
+        .order_by(CrawlSchedule.next_run_at)
+    ).scalars())
+
+
+def claim_crawl_schedule(session, schedule, now) -> bool:
+    """
+    Move a due schedule's next run forward by its interval.
+
+    Only succeeds if nobody else moved it first, so several API processes
+    polling the same database run each crawl once.
+    """
+    result = session.execute(
+        update(CrawlSchedule)
+        .where(CrawlSchedule.id == schedule.id, CrawlSchedule.next_run_at == schedule.next_run_at)
+        .values(next_run_at=now + timedelta(minutes=schedule.interval_minutes), last_run_at=now,
+                last_status='running', last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def finish_crawl_schedule(session, schedule_id, status, error=None):
+    session.execute(
+        update(CrawlSchedule)
+        .where(CrawlSchedule.id == schedule_id)
+        .values(last_status=status, last_error=error)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+
+
+def get_crawl_watermark(session, keyword, source_slug):
+    return session.execute(
+        select(CrawlWatermark).where(CrawlWatermark.keyword == keyword, CrawlWatermark.source_slug == source_slug)
+    ).scalar_one_or_none()
+
+
+def advance_crawl_watermark(session, keyword, source_slug, newest_posted_at, newest_fingerprint, pages_fetched):
+    """Record the newest posting a crawl saw; the watermark never moves back in time."""
+    watermark = get_crawl_watermark(session, keyword, source_slug)
+    if watermark is None:
+        watermark = CrawlWatermark(keyword=keyword, source_slug=source_slug)
+        session.add(watermark)
+    current = _utc(watermark.newest_posted_at)
+    if newest_posted_at is not None and (current is None or newest_posted_at > current):
+        watermark.newest_posted_at = newest_posted_at
+    if newest_fingerprint:
+        watermark.newest_fingerprint = newest_fingerprint
+    watermark.pages_fetched = pages_fetched
+    session.commit()
+    return watermark
+
+
+def known_fingerprints(session, fingerprints) -> set:
+    """The subset of `fingerprints` already stored in job_postings."""
+    fingerprints = list(set(fingerprints))
+    known = set()
+    for start in range(0, len(fingerprints), 500):
+        known.update(session.execute(
+            select(JobPosting.fingerprint).where(JobPosting.fingerprint.in_(fingerprints[start:start + 500]))
+        ).scalars())
+    return known
+
+
+def delete_crawl_schedule(session, schedule_id) -> bool:
+    schedule = session.get(CrawlSchedule, schedule_id)
+    if schedule is None:
+        return False
+    session.delete(schedule)
+    session.commit()
+    return True
+
+
+def list_crawl_schedules(session) -> list:
+    """Every schedule with its watermark, as dicts."""
+    watermarks = {(watermark.keyword, watermark.source_slug): watermark
+                  for watermark in session.execute(select(CrawlWatermark)).scalars()}
+    crawls = []
+    for schedule in session.execute(select(CrawlSchedule).order_by(CrawlSchedule.id)).scalars():
+        watermark = watermarks.get((schedule.keyword, schedule.source_slug))
+        crawls.append({
+            "id": schedule.id,
+            "keyword": schedule.keyword,
+            "source": schedule.source_slug,
+            "interval_minutes": schedule.interval_minutes,
+            "max_pages": schedule.max_pages,
+            "enabled": schedule.enabled,
+            "next_run_at": _utc(schedule.next_run_at),
+            "last_run_at": _utc(schedule.last_run_at),
+            "last_status": schedule.last_status,
+            "last_error": schedule.last_error,
+            "watermark": {
+                "newest_posted_at": _utc(watermark.newest_posted_at),
+                "newest_fingerprint": watermark.newest_fingerprint,
+                "pages_fetched": watermark.pages_fetched,
+                "updated_at": _utc(watermark.updated_at),
+            } if watermark else None,
+        })
+    return crawls
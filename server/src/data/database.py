@@ -1,3 +1,4 @@
+import threading
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.data.models import Base
@@ -7,12 +8,29 @@ from src.supabase.supabase import supabase_config
 
 logger = get_logger(__name__)
 
+# One engine (and connection pool) per database URL for the whole process
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _engine_and_factory(db_url):
+    entry = _engines.get(db_url)
+    if entry is None:
+        with _engines_lock:
+            entry = _engines.get(db_url)
+            if entry is None:
+                engine = _create_engine(db_url)
+                entry = _engines[db_url] = (engine, sessionmaker(bind=engine))
+    return entry
+
 
 def get_engine():
     """Get database engine, preferring Supabase PostgreSQL if configured."""
     # Use Supabase database URL if configured
-    db_url = supabase_config.get_database_url()
-    
+    return _engine_and_factory(supabase_config.get_database_url())[0]
+
+
+def _create_engine(db_url):
     logger.info(f"Using database: {db_url}")
     
     # Configure engine based on database type
@@ -58,6 +76,25 @@ def init_db():
 
 def get_session():
     """Get database session."""
-    engine = get_engine()
-    session = sessionmaker(bind=engine)
-    return session()
+    return _engine_and_factory(supabase_config.get_database_url())[1]()
+
+
+def get_db():
+    """FastAPI dependency: a session that is closed, and its connection returned to the pool, after the request."""
+    session = get_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def engine_pool_status() -> dict:
+    """Connection counts of the engines' pools, summed: checked_out, idle and overflow."""
+    status = {"checked_out": 0, "idle": 0, "overflow": 0}
+    for engine, _ in list(_engines.values()):
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            status["checked_out"] += pool.checkedout()
+            status["idle"] += pool.checkedin()
+            status["overflow"] += max(0, pool.overflow())
+    return status
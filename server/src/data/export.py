@@ -0,0 +1,291 @@
+"""
+Streaming exports of stored job postings and saved reports as CSV, Parquet
+or Arrow IPC.
+
+Rows are read in batches of `batch_size` and each batch is encoded and
+sent before the next is read, so memory stays bounded by one batch however
+large the export:
+
+  - job_postings are read with yield_per, a server-side cursor on
+    PostgreSQL, so the query result is never loaded at once;
+  - a report's jobs are decoded from its (possibly compressed) payload
+    with an incremental JSON parser instead of json.loads of the whole list.
+
+Parquet gets one row group per batch; Arrow is the IPC stream format (one
+record batch per batch), readable with pyarrow.ipc.open_stream. pyarrow is
+imported on first use, so the API starts without it.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from sqlalchemy import func, select
+from src.data.database import get_session
+from src.data.models import JobPosting, Source
+from src.utils.compression import iter_decompressed
+
+DEFAULT_BATCH_SIZE = 5000
+
+# (media type, file extension) per format
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Exported posting columns, their expressions and Arrow types
+POSTING_COLUMNS = {
+    "id": (JobPosting.id, "int64"),
+    "title": (JobPosting.title, "string"),
+    "company": (JobPosting.company, "string"),
+    "location": (JobPosting.location, "string"),
+    "salary": (JobPosting.salary, "string"),
+    "date_posted": (JobPosting.date_posted, "string"),
+    "posted_at": (JobPosting.posted_at, "timestamp"),
+    "description": (JobPosting.description, "string"),
+    "url": (JobPosting.url, "string"),
+    "source": (Source.slug, "string"),
+    "keyword": (JobPosting.keyword, "string"),
+    "first_seen_at": (JobPosting.created_at, "timestamp"),
+    "last_seen_at": (JobPosting.last_seen_at, "timestamp"),
+}
+
+# Fields of the scraped job dicts saved in reports
+REPORT_COLUMNS = ["title", "company", "location", "salary", "date_posted", "url", "source", "description"]
+
+
+def select_columns(columns, available) -> list:
+    """
+    The columns to export: a comma-separated `columns` parameter, or all.
+
+    Raises:
+        ValueError: for a column that does not exist
+    """
+    if not columns:
+        return list(available)
+    selected = [name.strip() for name in columns.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown or not selected:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown) or columns}; "
+                         f"available: {', '.join(available)}")
+    return list(dict.fromkeys(selected))
+
+
+def posting_batches(columns, source=None, keyword=None, location=None, title=None, posted_after=None,
+                    posted_before=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield stored postings matching the filters, oldest first, as lists of row tuples in `columns` order.
+
+    Filters work as in src.data.search: source is a source slug, location and
+    title case-insensitive substrings, and the posting date is posted_at or,
+    when that is unknown, the time the posting was first seen.
+    """
+    stmt = select(*[POSTING_COLUMNS[name][0].label(name) for name in columns])
+    stmt = stmt.select_from(JobPosting).outerjoin(Source, Source.id == JobPosting.source_id)
+    if source:
+        stmt = stmt.where(Source.slug == source)
+    if keyword:
+        stmt = stmt.where(JobPosting.keyword == keyword.strip().lower())
+    if location:
+        stmt = stmt.where(JobPosting.location.ilike(f"%{location}%"))
+    if title:
+        stmt = stmt.where(JobPosting.title.ilike(f"%{title}%"))
+    posted = func.coalesce(JobPosting.posted_at, JobPosting.created_at)
+    if posted_after:
+        stmt = stmt.where(posted >= posted_after)
+    if posted_before:
+        stmt = stmt.where(posted < posted_before)
+    stmt = stmt.order_by(JobPosting.id)
+
+    # Own session: the response is streamed after the request's dependencies have exited
+    session = get_session()
+    try:
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+    finally:
+        session.close()
+
+
+def iter_report_jobs(payload, chunk_size=64 * 1024):
+    """Yield the job dicts of a stored report payload (a JSON list) one at a time."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    pending = b""
+    for chunk in iter_decompressed(payload, chunk_size=chunk_size):
+        # Keep incomplete UTF-8 sequences for the next chunk
+        data = pending + chunk
+        try:
+            text = data.decode("utf-8")
+            pending = b""
+        except UnicodeDecodeError as e:
+            text = data[:e.start].decode("utf-8")
+            pending = data[e.start:]
+        buffer += text
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if not started:
+                if position >= len(buffer):
+                    break
+                if buffer[position] != "[":
+                    raise ValueError("Report payload is not a JSON list")
+                started = True
+                position += 1
+                continue
+            if position >= len(buffer) or buffer[position] == "]":
+                break
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # the item continues in the next chunk
+            if isinstance(item, dict):
+                yield item
+        buffer = buffer[position:]
+    if not started or buffer.strip() not in ("", "]"):
+        raise ValueError("Report payload is not a JSON list")
+
+
+def report_batches(payload, columns, source=None, location=None, title=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield the jobs of a report matching the filters as lists of row tuples in `columns` order."""
+    source = source.lower() if source else None
+    location = location.lower() if location else None
+    title = title.lower() if title else None
+    batch = []
+    for job in iter_report_jobs(payload):
+        if source and str(job.get("source") or "").lower() != source:
+            continue
+        if location and location not in str(job.get("location") or "").lower():
+            continue
+        if title and title not in str(job.get("title") or "").lower():
+            continue
+        batch.append(tuple(_report_value(job.get(name)) for name in columns))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _report_value(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class _ChunkSink:
+    """File-like object that keeps what pyarrow writes until it is drained."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(column_types):
+    import pyarrow as pa
+
+    types = {"int64": pa.int64(), "string": pa.string(), "timestamp": pa.timestamp("us", tz="UTC")}
+    return pa.schema([(name, types[kind]) for name, kind in column_types])
+
+
+def _arrow_batch(schema, rows):
+    import pyarrow as pa
+
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_timestamp(field.type):
+            # SQLite hands timestamps back naive; they are stored as UTC
+            values = [value.replace(tzinfo=timezone.utc) if isinstance(value, datetime) and value.tzinfo is None
+                      else value for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.record_batch(arrays, schema=schema)
+
+
+def stream_export(batches, column_types, export_format):
+    """
+    Encode row batches as an export file, yielding bytes after every batch.
+
+    Args:
+        batches: iterable of lists of row tuples
+        column_types: [(column name, "int64" | "string" | "timestamp")] in row order
+        export_format: a key of EXPORT_FORMATS
+    """
+    if export_format == "csv":
+        yield from _stream_csv(batches, [name for name, _ in column_types])
+        return
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(column_types)
+    sink = _ChunkSink()
+    output = pa.PythonFile(sink, mode="w")
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(output, schema)
+    elif export_format == "arrow":
+        writer = pa.ipc.new_stream(output, schema)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    try:
+        for rows in batches:
+            writer.write_batch(_arrow_batch(schema, rows))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _stream_csv(batches, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(("" if value is None else value.isoformat() if isinstance(value, datetime) else value
+                          for value in row) for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def posting_column_types(columns):
+    return [(name, POSTING_COLUMNS[name][1]) for name in columns]
+
+
+def report_column_types(columns):
+    return [(name, "string") for name in columns]
+
+
+def export_headers(filename, export_format) -> dict:
+    """Content-Type and Content-Disposition of an export download."""
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return {"Content-Type": media_type, "Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
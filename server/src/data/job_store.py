@@ -0,0 +1,239 @@
+import hashlib
+import re
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from sqlalchemy import func
+from src.analysis.trends import normalize_dates
+from src.data.models import JobPosting, Source
+from src.data.rollups import update_daily_rollups
+from src.data.upsert import chunk_rows, insert_for
+from src.utils.logger import get_logger
+from src.utils.processors import normalize_title
+from src.utils.near_duplicates import get_dedup_settings, get_near_duplicate_index, index_lock, job_guard, job_text
+from src.utils.tracing import tracer
+
+logger = get_logger(__name__)
+
+JOB_COLUMNS = {
+    'title': 512,
+    'company': 512,
+    'location': 512,
+    'salary': 255,
+    'date_posted': 255,
+    'description': None,
+    'url': 1024,
+}
+
+
+def _normalize_text(value) -> str:
+    if value is None:
+        return ""
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def fingerprint_job(job: dict) -> str:
+    """
+    Stable content fingerprint of a posting, used as the upsert key.
+
+    Built from the title, company and location only: page sources stamp every
+    job with the search URL it was found on, so a URL in the key would store
+    the same posting once per search keyword.
+    """
+    key = "\x1f".join([
+        _normalize_text(normalize_title(str(job.get('title') or ''))),
+        _normalize_text(job.get('company')),
+        _normalize_text(job.get('location')),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _clip(value, length):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value)
+    value = str(value).strip()
+    if not value:
+        return None
+    return value[:length] if length else value
+
+
+def _same_instant(stored, expected):
+    if stored is None:
+        return False
+    if stored.tzinfo is None:
+        return stored == expected.replace(tzinfo=None)
+    return stored == expected
+
+
+def _base_url(src: dict) -> str:
+    parts = urlsplit(src.get('search_url') or src.get('api_url') or '')
+    return f"{parts.scheme}://{parts.netloc}" if parts.netloc else ''
+
+
+def upsert_sources(session, sources) -> dict:
+    """
+    Insert or update Source rows for the given sources.yaml entries.
+
+    Returns:
+        dict: Mapping of source slug to sources.id
+    """
+    rows = {}
+    for src in sources:
+        rows[src['id']] = {'slug': src['id'], 'name': src['name'], 'base_url': _base_url(src)}
+    if not rows:
+        return {}
+    insert = insert_for(session)
+    stmt = insert(Source).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Source.slug],
+        set_={'name': stmt.excluded.name, 'base_url': stmt.excluded.base_url},
+    ).returning(Source.slug, Source.id)
+    return {slug: source_id for slug, source_id in session.execute(stmt)}
+
+
+def upsert_job_postings(session, jobs, source_id=None, seen_at=None, keyword=None) -> dict:
+    """
+    Bulk upsert scraped jobs into job_postings keyed on their fingerprint.
+
+    New postings are inserted; postings seen before get last_seen_at refreshed
+    and their salary, date and description filled in when the new scrape has them.
+    date_posted is parsed into posted_at for the whole batch at once, relative
+    to seen_at; a posting keeps the posted_at and keyword it was first stored
+    with. The whole batch is sent as a single INSERT ... ON CONFLICT statement,
+    and the inserted postings are counted into the daily rollups.
+
+    Returns:
+        dict: {"inserted": int, "updated": int, "fingerprints": list}
+    """
+    seen_at = seen_at or datetime.now(timezone.utc)
+    rows = {}
+    for job in jobs:
+        title = _clip(job.get('title'), JOB_COLUMNS['title'])
+        if not title:
+            continue
+        row = {column: _clip(job.get(column), length) for column, length in JOB_COLUMNS.items()}
+        row['title'] = title
+        row['source_id'] = source_id
+        row['keyword'] = _clip(keyword.lower(), 255) if keyword else None
+        row['fingerprint'] = job.get('fingerprint') or fingerprint_job(job)
+        row['created_at'] = seen_at
+        row['last_seen_at'] = seen_at
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows[row['fingerprint']] = row
+    if not rows:
+        return {'inserted': 0, 'updated': 0, 'fingerprints': []}
+
+    posted_at = normalize_dates([row['date_posted'] for row in rows.values()], reference=seen_at)
+    for row, timestamp in zip(rows.values(), posted_at.tolist()):
+        row['posted_at'] = timestamp.replace(tzinfo=timezone.utc) if timestamp else None
+
+    insert = insert_for(session)
+    inserted_rows = []
+    updated = 0
+    for chunk in chunk_rows(session, list(rows.values())):
+        stmt = insert(JobPosting).values(chunk)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobPosting.fingerprint],
+            set_={
+                'last_seen_at': excluded.last_seen_at,
+                'salary': func.coalesce(excluded.salary, JobPosting.salary),
+                'date_posted': func.coalesce(excluded.date_posted, JobPosting.date_posted),
+                'description': func.coalesce(excluded.description, JobPosting.description),
+            },
+        ).returning(JobPosting.fingerprint, JobPosting.created_at)
+        # created_at is never overwritten on conflict, so it only equals this
+        # batch's timestamp for rows the statement actually inserted
+        for fingerprint, created_at in session.execute(stmt):
+            if _same_instant(created_at, seen_at):
+                inserted_rows.append(rows[fingerprint])
+            else:
+                updated += 1
+    update_daily_rollups(session, inserted_rows)
+    inserted = len(inserted_rows)
+
+    logger.info(f"Upserted {len(rows)} job postings (source_id={source_id}): {inserted} new, {updated} refreshed")
+    return {'inserted': inserted, 'updated': updated, 'fingerprints': list(rows)}
+
+
+def assign_canonical_fingerprints(index, jobs, inserted=None) -> list:
+    """
+    Return copies of the jobs carrying the fingerprint they should be stored under.
+
+    A job whose own fingerprint is unknown but which is a near-duplicate of an
+    indexed posting (e.g. the same role on another board with slightly
+    different wording) takes over that posting's fingerprint, so the upsert
+    refreshes the existing row instead of adding a second one. Jobs without a
+    match are added to the index under their own fingerprint, and those keys
+    are appended to `inserted` if it is given.
+    """
+    assigned = []
+    for job in jobs:
+        fingerprint = fingerprint_job(job)
+        if fingerprint not in index:
+            signature = index.signature(job_text(job))
+            guard = job_guard(job)
+            matches = index.query(signature=signature, guard=guard)
+            if matches:
+                fingerprint = matches[0][0]
+            else:
+                index.insert(fingerprint, signature=signature, guard=guard)
+                if inserted is not None:
+                    inserted.append(fingerprint)
+        assigned.append(dict(job, fingerprint=fingerprint))
+    return assigned
+
+
+def _db_attributes(session, table=None) -> dict:
+    attributes = {"db.system": session.get_bind().dialect.name}
+    if table:
+        attributes["db.sql.table"] = table
+    return attributes
+
+
+def store_scrape_results(session, results, keyword=None) -> dict:
+    """
+    Persist the output of a scrape run.
+
+    Args:
+        session: SQLAlchemy session, committed on success
+        results (list): (source config dict, list of scraped jobs) pairs
+        keyword (str): Search keyword of the run
+
+    Returns:
+        dict: Totals of inserted and updated postings
+    """
+    totals = {'inserted': 0, 'updated': 0}
+    dedup_settings = get_dedup_settings()
+    index = get_near_duplicate_index(session) if dedup_settings['enabled'] else None
+    # Keys added to the shared index by this run, taken out again if it is rolled back
+    indexed = []
+    if index is not None:
+        # The lock only covers the in-memory index, so the database writes of
+        # concurrent runs do not wait for each other
+        with index_lock, tracer.start_as_current_span("scrape.dedupe",
+                                                      attributes={"talenttrek.jobs": sum(len(jobs) for _, jobs
+                                                                                         in results)}):
+            index.refresh(dedup_settings['index_dir'])
+            results = [(src, assign_canonical_fingerprints(index, jobs, inserted=indexed)) for src, jobs in results]
+    try:
+        source_ids = upsert_sources(session, [src for src, _ in results])
+        for src, jobs in results:
+            with tracer.start_as_current_span("db.upsert", attributes=_db_attributes(session, "job_postings")):
+                summary = upsert_job_postings(session, jobs, source_id=source_ids.get(src['id']), keyword=keyword)
+            totals['inserted'] += summary['inserted']
+            totals['updated'] += summary['updated']
+        with tracer.start_as_current_span("db.commit", attributes=_db_attributes(session)):
+            session.commit()
+    except Exception:
+        session.rollback()
+        if index is not None:
+            with index_lock:
+                index.remove(indexed)
+        raise
+    if index is not None:
+        # Only this run's committed keys are persisted, not those of runs still in flight
+        with index_lock:
+            index.save(dedup_settings['index_dir'], keys=indexed)
+    return totals
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import (
+    Column, Integer, String, Text, Date, DateTime, Float, ForeignKey, Boolean, LargeBinary, UniqueConstraint, DDL, event
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from src.utils.compression import compress_payload, decompress_payload, get_report_compression
 
 Base = declarative_base()
 
@@ -28,20 +31,46 @@ class UserReport(Base):
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    jobs_data = Column(Text, nullable=False)  # JSON string of scraped jobs
+    # JSON string of scraped jobs, optionally compressed (see src.utils.compression)
+    jobs_data_raw = Column('jobs_data', LargeBinary, nullable=False)
     keyword = Column(String(255))  # Search keyword used
     sources_used = Column(Text)  # JSON string of source IDs used
     job_count = Column(Integer, default=0)  # Number of jobs in the report
+    # Serialized StreamingStats of jobs_data (see src.analysis.streaming)
+    stats_data = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationship to user
     user = relationship("User", back_populates="reports")
 
+    @property
+    def jobs_data(self):
+        """Decoded jobs JSON, decompressed on first access."""
+        cached = self.__dict__.get('_jobs_data_cache')
+        if cached is not None and cached[0] is self.jobs_data_raw:
+            return cached[1]
+        text = decompress_payload(self.jobs_data_raw)
+        self.__dict__['_jobs_data_cache'] = (self.jobs_data_raw, text)
+        return text
+
+    @jobs_data.setter
+    def jobs_data(self, text):
+        self.store_jobs_data(text)
+
+    def store_jobs_data(self, text, codec=None):
+        """Store the jobs JSON using the configured (or given) compression codec."""
+        min_bytes = 0
+        if codec is None:
+            codec, min_bytes = get_report_compression()
+        self.jobs_data_raw = compress_payload(text, codec=codec, min_bytes=min_bytes)
+        self.__dict__['_jobs_data_cache'] = (self.jobs_data_raw, text)
+
 
 class Source(Base):
     __tablename__ = 'sources'
 
     id = Column(Integer, primary_key=True)
+    slug = Column(String(255), unique=True, index=True)  # Source id from sources.yaml
     name = Column(String(255), nullable=False)
     base_url = Column(String(512), nullable=False)
 
@@ -55,7 +84,135 @@ class JobPosting(Base):
     location = Column(String(512))
     salary = Column(String(255))
     date_posted = Column(String(255))
+    # date_posted parsed once at upsert time (naive UTC; see src.analysis.trends)
+    posted_at = Column(DateTime(timezone=True), index=True)
     description = Column(Text)
     url = Column(String(1024))
     source_id = Column(Integer, ForeignKey('sources.id'))
+    keyword = Column(String(255), index=True)  # Search keyword the posting was first scraped for
+    # Hash of normalized title, company and location (see src.data.job_store.fingerprint_job)
+    fingerprint = Column(String(64), nullable=False, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+
+# Daily pre-aggregates of job_postings, maintained by src.data.rollups.
+# Dimension columns are NOT NULL ('' / 0 for unknown) so they can form the
+# ON CONFLICT key.
+class JobPostingDailyRollup(Base):
+    __tablename__ = 'job_posting_daily_rollups'
+    __table_args__ = (UniqueConstraint('day', 'keyword', 'source_id', 'location',
+                                       name='uq_job_posting_daily_rollups_key'),)
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)
+    keyword = Column(String(255), nullable=False, default='')
+    source_id = Column(Integer, nullable=False, default=0)
+    location = Column(String(512), nullable=False, default='')
+    job_count = Column(Integer, nullable=False, default=0)
+
+
+class SalaryDailyRollup(Base):
+    __tablename__ = 'salary_daily_rollups'
+    __table_args__ = (UniqueConstraint('day', 'keyword', 'source_id', name='uq_salary_daily_rollups_key'),)
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)
+    keyword = Column(String(255), nullable=False, default='')
+    source_id = Column(Integer, nullable=False, default=0)
+    salary_sum = Column(Float, nullable=False, default=0.0)
+    # Serialized KLLSketch of annualized salaries (see src.analysis.streaming)
+    sketch = Column(Text, nullable=False)
+
+
+# Saved (keyword, source) crawls run on an interval by src.scrapers.crawls.
+# source_slug is the source id from sources.yaml.
+class CrawlSchedule(Base):
+    __tablename__ = 'crawl_schedules'
+    __table_args__ = (UniqueConstraint('keyword', 'source_slug', name='uq_crawl_schedules_key'),)
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String(255), nullable=False)
+    source_slug = Column(String(255), nullable=False)
+    interval_minutes = Column(Integer, nullable=False, default=360)
+    max_pages = Column(Integer, nullable=False, default=5)
+    enabled = Column(Boolean, nullable=False, default=True)
+    next_run_at = Column(DateTime(timezone=True), index=True)
+    last_run_at = Column(DateTime(timezone=True))
+    last_status = Column(String(32))
+    last_error = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Where the last crawl of a (keyword, source) pair got to: the newest posting
+# it saw. Later crawls stop paginating once they are back among known postings.
+class CrawlWatermark(Base):
+    __tablename__ = 'crawl_watermarks'
+    __table_args__ = (UniqueConstraint('keyword', 'source_slug', name='uq_crawl_watermarks_key'),)
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String(255), nullable=False)
+    source_slug = Column(String(255), nullable=False)
+    newest_posted_at = Column(DateTime(timezone=True))
+    newest_fingerprint = Column(String(64))
+    pages_fetched = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Full-text search over job_postings, queried by src.data.search.
+# Postgres keeps a weighted tsvector in a generated column behind a GIN index;
+# SQLite mirrors the searchable columns into an external-content FTS5 table
+# kept in sync by triggers.
+JOB_POSTINGS_FTS_POSTGRES = [
+    """
+    ALTER TABLE job_postings ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX ix_job_postings_search_vector ON job_postings USING GIN (search_vector)",
+]
+
+JOB_POSTINGS_FTS_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE job_postings_fts USING fts5(
+        title, company, location, description,
+        content='job_postings', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER job_postings_fts_ai AFTER INSERT ON job_postings BEGIN
+        INSERT INTO job_postings_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER job_postings_fts_ad AFTER DELETE ON job_postings BEGIN
+        INSERT INTO job_postings_fts(job_postings_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER job_postings_fts_au AFTER UPDATE OF title, company, location, description ON job_postings
+    WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+        OR old.location IS NOT new.location OR old.description IS NOT new.description
+    BEGIN
+        INSERT INTO job_postings_fts(job_postings_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO job_postings_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+]
+
+for _statement in JOB_POSTINGS_FTS_POSTGRES:
+    event.listen(JobPosting.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in JOB_POSTINGS_FTS_SQLITE:
+    event.listen(JobPosting.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    JobPosting.__table__, 'before_drop',
+    DDL("DROP TABLE IF EXISTS job_postings_fts").execute_if(dialect='sqlite')
+)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Daily rollups of job_postings for trend queries.
+
+job_posting_daily_rollups counts new postings per day, keyword, source and
+location; salary_daily_rollups keeps a salary KLL sketch per day, keyword and
+source. Both are updated incrementally as postings are inserted (see
+src.data.job_store.upsert_job_postings), so trend queries never touch the raw
+table. A posting's day is its parsed posted_at, or the day it was first seen.
+
+Rebuild the rollups from job_postings (e.g. after a bulk import):
+    python -m src.data.rollups rebuild [--start 2025-01-01] [--end 2025-06-30] [--workers 4]
+"""
+
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from sqlalchemy import delete, func, select
+from src.analysis.statistics import extract_numeric_salaries
+from src.analysis.streaming import KLLSketch, salary_summary
+from src.data.models import JobPosting, JobPostingDailyRollup, SalaryDailyRollup, Source
+from src.data.upsert import chunk_rows, insert_for
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_WORKERS = 4
+POSTING_COLUMNS = (JobPosting.posted_at, JobPosting.created_at, JobPosting.keyword,
+                   JobPosting.source_id, JobPosting.location, JobPosting.salary)
+
+
+def posting_day(posted_at, created_at):
+    """UTC day a posting is counted on."""
+    moment = posted_at or created_at
+    if moment is None:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+class RollupDelta:
+    """Aggregates of a set of postings, to be added to the rollup tables."""
+
+    def __init__(self):
+        self.postings = 0
+        self.counts = Counter()
+        self.salaries = {}  # (day, keyword, source_id) -> [salary_sum, KLLSketch]
+
+    def add(self, postings, start=None, end=None):
+        """
+        Aggregate posting dicts (posted_at, created_at, keyword, source_id,
+        location, salary), optionally only those whose day is in [start, end].
+        """
+        postings = list(postings)
+        salaries = extract_numeric_salaries([posting.get('salary') for posting in postings])
+        per_key = {}
+        for posting, salary in zip(postings, salaries.tolist()):
+            day = posting_day(posting.get('posted_at'), posting.get('created_at'))
+            if day is None or (start and day < start) or (end and day > end):
+                continue
+            self.postings += 1
+            keyword = posting.get('keyword') or ''
+            source_id = posting.get('source_id') or 0
+            self.counts[(day, keyword, source_id, posting.get('location') or '')] += 1
+            if salary == salary:  # not NaN
+                per_key.setdefault((day, keyword, source_id), []).append(salary)
+        for key, values in per_key.items():
+            entry = self.salaries.setdefault(key, [0.0, KLLSketch()])
+            entry[0] += sum(values)
+            entry[1].update(values)
+        return self
+
+    def merge(self, other):
+        self.postings += other.postings
+        self.counts.update(other.counts)
+        for key, (salary_sum, sketch) in other.salaries.items():
+            entry = self.salaries.setdefault(key, [0.0, KLLSketch()])
+            entry[0] += salary_sum
+            entry[1].merge(sketch)
+        return self
+
+
+def apply_rollup_delta(session, delta):
+    """Add a RollupDelta to the rollup tables (does not commit)."""
+    insert = insert_for(session)
+    count_rows = [
+        {'day': day, 'keyword': keyword, 'source_id': source_id, 'location': location, 'job_count': count}
+        for (day, keyword, source_id, location), count in delta.counts.items()
+    ]
+    for chunk in chunk_rows(session, count_rows):
+        if not chunk:
+            continue
+        stmt = insert(JobPostingDailyRollup).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['day', 'keyword', 'source_id', 'location'],
+            set_={'job_count': JobPostingDailyRollup.job_count + stmt.excluded.job_count},
+        )
+        session.execute(stmt)
+
+    if not delta.salaries:
+        return
+    # Sketches are merged here rather than in SQL; lock the existing rows
+    days = {day for day, _, _ in delta.salaries}
+    existing = session.execute(
+        select(SalaryDailyRollup).where(SalaryDailyRollup.day.in_(days)).with_for_update()
+    ).scalars()
+    stored = {(row.day, row.keyword, row.source_id): row for row in existing}
+    salary_rows = []
+    for key, (salary_sum, sketch) in delta.salaries.items():
+        merged = KLLSketch().merge(sketch)
+        row = stored.get(key)
+        if row is not None:
+            merged.merge(KLLSketch.from_json(row.sketch))
+            salary_sum += row.salary_sum
+        salary_rows.append({'day': key[0], 'keyword': key[1], 'source_id': key[2],
+                            'salary_sum': salary_sum, 'sketch': merged.to_json()})
+    for chunk in chunk_rows(session, salary_rows):
+        stmt = insert(SalaryDailyRollup).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['day', 'keyword', 'source_id'],
+            set_={'salary_sum': stmt.excluded.salary_sum, 'sketch': stmt.excluded.sketch},
+        )
+        session.execute(stmt)
+
+
+def update_daily_rollups(session, postings):
+    """Count newly inserted postings (dicts of posting columns) into the rollups."""
+    delta = RollupDelta().add(postings)
+    if delta.postings:
+        apply_rollup_delta(session, delta)
+    return delta.postings
+
+
+def _utc_bound(day):
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def query_trends(session, start, end, keyword=None, source=None, location=None) -> dict:
+    """
+    Daily posting counts and salary percentiles for [start, end], from the rollups.
+
+    Salary sketches are kept per day, keyword and source, so salary stats are
+    left out when filtering by location.
+
+    Returns:
+        dict: start, end, series ([{"date", "job_count"}] with zero days filled
+        in), total_jobs and salary (or None)
+    """
+    counts = select(JobPostingDailyRollup.day, func.sum(JobPostingDailyRollup.job_count)) \
+        .where(JobPostingDailyRollup.day >= start, JobPostingDailyRollup.day <= end)
+    salaries = select(SalaryDailyRollup.salary_sum, SalaryDailyRollup.sketch) \
+        .where(SalaryDailyRollup.day >= start, SalaryDailyRollup.day <= end)
+    if keyword:
+        keyword = keyword.strip().lower()
+        counts = counts.where(JobPostingDailyRollup.keyword == keyword)
+        salaries = salaries.where(SalaryDailyRollup.keyword == keyword)
+    if source:
+        source_ids = select(Source.id).where(Source.slug == source).scalar_subquery()
+        counts = counts.where(JobPostingDailyRollup.source_id == source_ids)
+        salaries = salaries.where(SalaryDailyRollup.source_id == source_ids)
+    if location:
+        counts = counts.where(JobPostingDailyRollup.location.ilike(f"%{location}%"))
+    by_day = dict(session.execute(counts.group_by(JobPostingDailyRollup.day)).all())
+
+    series = []
+    day = start
+    while day <= end:
+        series.append({"date": day, "job_count": int(by_day.get(day) or 0)})
+        day += timedelta(days=1)
+
+    salary = None
+    if not location:
+        salary_sum, sketch = 0.0, KLLSketch()
+        for row_sum, row_sketch in session.execute(salaries):
+            salary_sum += row_sum
+            sketch.merge(KLLSketch.from_json(row_sketch))
+        salary = salary_summary(salary_sum, sketch)
+    return {
+        "start": start,
+        "end": end,
+        "series": series,
+        "total_jobs": sum(point["job_count"] for point in series),
+        "salary": salary,
+    }
+
+
+def _aggregate_chunk(session_factory, low_id, high_id, start, end):
+    session = session_factory()
+    try:
+        stmt = select(*POSTING_COLUMNS).where(JobPosting.id >= low_id, JobPosting.id <= high_id)
+        # Coarse SQL filter with a day of margin; RollupDelta.add filters exactly
+        posted = func.coalesce(JobPosting.posted_at, JobPosting.created_at)
+        if start:
+            stmt = stmt.where(posted >= _utc_bound(start - timedelta(days=1)))
+        if end:
+            stmt = stmt.where(posted < _utc_bound(end + timedelta(days=2)))
+        return RollupDelta().add(session.execute(stmt).mappings(), start=start, end=end)
+    finally:
+        session.close()
+
+
+def rebuild_rollups(session_factory, start=None, end=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    workers=DEFAULT_WORKERS) -> dict:
+    """
+    Recompute the rollups from job_postings, for all days or for [start, end].
+
+    job_postings is split into id ranges that are read and aggregated on a
+    thread pool, each with its own session; the partial aggregates are merged
+    and replace the existing rollup rows for the range in one transaction.
+
+    Returns:
+        dict: {"chunks": int, "postings": int, "rollup_rows": int}
+    """
+    session = session_factory()
+    try:
+        low, high = session.execute(select(func.min(JobPosting.id), func.max(JobPosting.id))).one()
+        ranges = [] if low is None else \
+            [(first, min(first + chunk_size - 1, high)) for first in range(low, high + 1, chunk_size)]
+
+        delta = RollupDelta()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(_aggregate_chunk, session_factory, first, last, start, end)
+                       for first, last in ranges]
+            for future in futures:
+                delta.merge(future.result())
+
+        for model in (JobPostingDailyRollup, SalaryDailyRollup):
+            stmt = delete(model)
+            if start:
+                stmt = stmt.where(model.day >= start)
+            if end:
+                stmt = stmt.where(model.day <= end)
+            session.execute(stmt)
+        apply_rollup_delta(session, delta)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    summary = {"chunks": len(ranges), "postings": delta.postings,
+               "rollup_rows": len(delta.counts) + len(delta.salaries)}
+    logger.info(f"Rebuilt daily rollups from {summary['postings']} postings in {summary['chunks']} chunks")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    rebuild = subcommands.add_parser("rebuild", help="Rebuild daily rollups from job_postings")
+    rebuild.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (default: all)")
+    rebuild.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (default: all)")
+    rebuild.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    rebuild.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    from src.data.database import get_session
+
+    summary = rebuild_rollups(get_session, start=args.start, end=args.end,
+                              chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Rebuilt rollups: {summary['postings']} postings, {summary['chunks']} chunks, "
+          f"{summary['rollup_rows']} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import base64
+import json
+import re
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.sql import column, table
+from src.data.models import JobPosting, Source
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# bm25 column weights for the SQLite FTS5 table: title, company, location, description
+SQLITE_BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+job_postings_fts = table('job_postings_fts', column('rowid'))
+
+
+def encode_cursor(score, posting_id) -> str:
+    payload = json.dumps([score, posting_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a pagination cursor into (score, id); raises ValueError if malformed."""
+    try:
+        score, posting_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(score), int(posting_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _fts5_query(query: str) -> str:
+    # Quote each term so user input can never be parsed as FTS5 syntax;
+    # quoted terms separated by spaces are ANDed together.
+    terms = re.findall(r'\w+', query)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _score_and_match(session, query):
+    """Return (rank expression, extra FROM target, match clause) for the active dialect."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        ts_query = func.websearch_to_tsquery('english', query)
+        search_vector = literal_column('job_postings.search_vector')
+        return func.ts_rank_cd(search_vector, ts_query), None, search_vector.op('@@')(ts_query)
+    if dialect == 'sqlite':
+        fts_query = _fts5_query(query)
+        if not fts_query:
+            return None, None, None
+        # bm25() is lower-is-better, negate it so both dialects sort by score DESC
+        score = -func.bm25(literal_column('job_postings_fts'), *SQLITE_BM25_WEIGHTS)
+        return score, job_postings_fts, literal_column('job_postings_fts').op('MATCH')(fts_query)
+    raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+
+def search_job_postings(session, query, source=None, location=None, posted_after=None,
+                        posted_before=None, limit=20, cursor=None) -> dict:
+    """
+    Ranked full-text search over stored job postings.
+
+    Args:
+        session: SQLAlchemy session
+        query (str): Free-text search terms
+        source (str): Optional source slug (sources.yaml id) to filter on
+        location (str): Optional case-insensitive location substring
+        posted_after (datetime): Only postings posted at or after this time
+        posted_before (datetime): Only postings posted before this time
+
+        The posting date is posted_at, or when the posted date could not be
+        parsed, the time the posting was first seen.
+        limit (int): Page size
+        cursor (str): next_cursor from a previous page
+
+    Returns:
+        dict: {"results": [posting dicts with "score"], "next_cursor": str or None}
+    """
+    score, fts_from, match = _score_and_match(session, query)
+    if match is None:
+        return {"results": [], "next_cursor": None}
+    score = score.label('score')
+
+    stmt = select(JobPosting, Source.slug, score).outerjoin(Source, Source.id == JobPosting.source_id)
+    if fts_from is not None:
+        stmt = stmt.join(fts_from, fts_from.c.rowid == JobPosting.id)
+    stmt = stmt.where(match)
+
+    if source:
+        stmt = stmt.where(Source.slug == source)
+    if location:
+        stmt = stmt.where(JobPosting.location.ilike(f"%{location}%"))
+    posted = func.coalesce(JobPosting.posted_at, JobPosting.created_at)
+    if posted_after:
+        stmt = stmt.where(posted >= posted_after)
+    if posted_before:
+        stmt = stmt.where(posted < posted_before)
+    if cursor:
+        last_score, last_id = decode_cursor(cursor)
+        # Keyset pagination on (score, id) so deep pages cost the same as the first
+        stmt = stmt.where(or_(
+            score.element < last_score,
+            and_(score.element == last_score, JobPosting.id < last_id),
+        ))
+
+    stmt = stmt.order_by(score.element.desc(), JobPosting.id.desc()).limit(limit + 1)
+    rows = session.execute(stmt).all()
+
+    results = []
+    for posting, source_slug, rank in rows[:limit]:
+        results.append({
+            "id": posting.id,
+            "title": posting.title,
+            "company": posting.company,
+            "location": posting.location,
+            "salary": posting.salary,
+            "date_posted": posting.date_posted,
+            "posted_at": posting.posted_at,
+            "description": posting.description,
+            "url": posting.url,
+            "source": source_slug,
+            "first_seen_at": posting.created_at,
+            "last_seen_at": posting.last_seen_at,
+            "score": float(rank),
+        })
+    next_cursor = None
+    if len(rows) > limit and results:
+        next_cursor = encode_cursor(results[-1]["score"], results[-1]["id"])
+    return {"results": results, "next_cursor": next_cursor}
@@ -0,0 +1,29 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# SQLite caps the number of bound parameters per statement (32766 since 3.32)
+SQLITE_MAX_VARIABLES = 32766
+
+
+def insert_for(session):
+    """Return the dialect-specific insert() that supports ON CONFLICT."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert
+    if dialect == 'sqlite':
+        return sqlite.insert
+    raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+
+
+def chunk_rows(session, rows):
+    """
+    Split rows for multi-row INSERT statements.
+
+    One statement per batch; SQLite additionally needs to stay under its
+    bound-parameter limit, which only matters for very large batches.
+    """
+    if session.get_bind().dialect.name != 'sqlite' or not rows:
+        yield rows
+        return
+    per_statement = max(1, SQLITE_MAX_VARIABLES // len(rows[0]))
+    for start in range(0, len(rows), per_statement):
+        yield rows[start:start + per_statement]
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from typing import Dict, Optional, List
+from datetime import date, datetime
+
+# Stored job posting schemas (job_postings table)
+class JobPostingResponse(BaseModel):
+    id: int
+    title: str
+    company: Optional[str] = None
+    location: Optional[str] = None
+    salary: Optional[str] = None
+    date_posted: Optional[str] = None
+    posted_at: Optional[datetime] = None
+    description: Optional[str] = None
+    url: Optional[str] = None
+    source: Optional[str] = None
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+class JobSearchResult(JobPostingResponse):
+    score: float
+
+class JobSearchResponse(BaseModel):
+    results: List[JobSearchResult]
+    next_cursor: Optional[str] = None
+
+# Analytics schemas (daily rollups)
+class TrendPoint(BaseModel):
+    date: date
+    job_count: int
+
+class SalarySummary(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Optional[Dict[str, float]] = None
+
+class TrendsResponse(BaseModel):
+    start: date
+    end: date
+    series: List[TrendPoint]
+    total_jobs: int
+    salary: Optional[SalarySummary] = None
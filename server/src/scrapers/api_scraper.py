@@ -1,13 +1,17 @@
 import requests
 import json
+import time
 from src.scrapers.base_scraper import BaseScraper
 from src.utils.logger import get_logger
-from src.utils.linkedin_auth import linkedin_auth
+from src.utils.metrics import SCRAPE_JOBS, SCRAPE_PARSE_DURATION
+from src.utils.tracing import record_span
 
 logger = get_logger(__name__)
 
 
 class APIScraper(BaseScraper):
+    source_type = "api"
+
     def __init__(self, proxies=None, max_retries=3, delay_range=(1, 3)):
         super().__init__(proxies, max_retries, delay_range)
 
@@ -24,17 +28,21 @@ class APIScraper(BaseScraper):
         Returns:
             list: List of job dictionaries
         """
-        logger.info(f"Scraping API: {api_url}")
+        logger.info("Scraping API: %s", api_url)
+        if source_id:
+            self.source_id = source_id
         
         # Handle LinkedIn authentication
         if source_id == "linkedin_api" and "linkedin.com" in api_url:
+            from src.utils.linkedin_auth import linkedin_auth
+
             auth_headers = linkedin_auth.get_auth_headers()
             if auth_headers:
                 if headers is None:
                     headers = {}
                 headers.update(auth_headers)
                 logger.info("LinkedIn authentication headers added")
-                logger.debug(f"Headers being sent: {headers}")
+                logger.debug("Headers being sent: %s", headers)
             else:
                 logger.error("Failed to get LinkedIn authentication headers")
                 return []
@@ -42,10 +50,12 @@ class APIScraper(BaseScraper):
         try:
             response = self.make_request(api_url, headers=headers)
             if not response or response.status_code != 200:
-                logger.warning(f"Failed to fetch {api_url} with status code: {getattr(response, 'status_code', None)}")
+                logger.warning("Failed to fetch %s with status code: %s", api_url,
+                               getattr(response, 'status_code', None))
                 return []
 
             # Parse JSON response
+            parse_started = time.perf_counter()
             data = response.json()
             
             # Handle different API response structures
@@ -56,11 +66,11 @@ class APIScraper(BaseScraper):
             elif isinstance(data, dict) and 'results' in data:
                 jobs_data = data['results']
             else:
-                logger.warning(f"Unexpected API response structure: {type(data)}")
+                logger.warning("Unexpected API response structure: %s", type(data))
                 return []
 
             jobs = []
-            logger.info(f"Found {len(jobs_data)} jobs from API.")
+            logger.info("Found %s jobs from API.", len(jobs_data))
 
             for idx, job_item in enumerate(jobs_data):
                 job_data = {}
@@ -78,14 +88,19 @@ class APIScraper(BaseScraper):
                 # Only add jobs that have at least a title
                 if job_data.get('title'):
                     jobs.append(job_data)
-                    logger.debug(f"[{idx + 1}] Job scraped: {job_data.get('title', 'No title')}")
+                    logger.debug("[%s] Job scraped: %s", idx + 1, job_data.get('title', 'No title'))
 
-            logger.info(f"Scraped {len(jobs)} job postings from API: {api_url}")
+            parse_seconds = time.perf_counter() - parse_started
+            SCRAPE_PARSE_DURATION.labels(**self.metric_labels()).observe(parse_seconds)
+            record_span("scrape.parse", parse_seconds, attributes={"talenttrek.jobs": len(jobs)})
+            SCRAPE_JOBS.labels(**self.metric_labels()).inc(len(jobs))
+            logger.info("Scraped %s job postings from API: %s", len(jobs), api_url,
+                        extra={"source": self.source_id, "jobs": len(jobs)})
             return jobs
 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response from {api_url}: {e}")
+            logger.error("Failed to parse JSON response from %s: %s", api_url, e)
             return []
         except Exception as e:
-            logger.error(f"Error scraping API {api_url}: {e}")
+            logger.error("Error scraping API %s: %s", api_url, e)
             return [] 
\ No newline at end of file
@@ -1,14 +1,28 @@
 import random
 import time
 import requests
+from opentelemetry import trace
 from requests.exceptions import RequestException
 from src.utils.logger import get_logger
 from src.utils.helpers import random_delay
+from src.utils.metrics import (
+    SCRAPE_BYTES,
+    SCRAPE_FETCH_DURATION,
+    SCRAPE_FETCHES,
+    SCRAPE_RETRIES,
+    source_labels,
+    status_class,
+)
+from src.utils.tracing import tracer
 
 logger = get_logger(__name__)
 
 
 class BaseScraper:
+    # Metric labels; source_id is set by whoever knows which configured source is scraped
+    source_type = "unknown"
+    source_id = None
+
     USER_AGENTS = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
@@ -30,9 +44,15 @@ class BaseScraper:
             return None
         return random.choice(self.proxies)
 
+    def metric_labels(self):
+        return source_labels(self.source_id, self.source_type)
+
     def make_request(self, url, headers=None, params=None, method='GET'):
+        labels = self.metric_labels()
         retries = 0
         while retries < self.max_retries:
+            if retries:
+                SCRAPE_RETRIES.labels(**labels).inc()
             try:
                 ua = self.get_random_user_agent()
                 proxy = self.get_random_proxy()
@@ -40,27 +60,50 @@ class BaseScraper:
                 request_headers = headers or {}
                 request_headers['User-Agent'] = ua
 
-                logger.info(f"[Request] {url} | Attempt: {retries + 1}")
-                logger.debug(f"Request headers: {request_headers}")
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=request_headers,
-                    params=params,
-                    proxies={"http": proxy, "https": proxy} if proxy else None,
-                    timeout=15
-                )
+                logger.info("[Request] %s | Attempt: %s", url, retries + 1)
+                logger.debug("Request headers: %s", request_headers)
+                started = time.perf_counter()
+                with tracer.start_as_current_span(method, kind=trace.SpanKind.CLIENT, attributes={
+                    "http.request.method": method,
+                    "url.full": url,
+                    "http.request.resend_count": retries,
+                }) as span:
+                    try:
+                        response = self.session.request(
+                            method=method,
+                            url=url,
+                            headers=request_headers,
+                            params=params,
+                            proxies={"http": proxy, "https": proxy} if proxy else None,
+                            timeout=15
+                        )
+                    finally:
+                        # Network time only; the politeness delay below is not fetch latency
+                        SCRAPE_FETCH_DURATION.labels(**labels).observe(time.perf_counter() - started)
+                    span.set_attribute("http.response.status_code", response.status_code)
+                    if response.status_code >= 400:
+                        span.set_attribute("error.type", str(response.status_code))
+                        span.set_status(trace.StatusCode.ERROR)
+                SCRAPE_FETCHES.labels(**labels, status_class=status_class(response.status_code)).inc()
+                SCRAPE_BYTES.labels(**labels).inc(len(response.content))
 
                 if response.status_code == 200:
-                    random_delay(self.delay_range)
+                    with tracer.start_as_current_span("scrape.delay"):
+                        random_delay(self.delay_range)
                     return response
                 else:
-                    logger.warning(f"Non-200 status: {response.status_code} | URL: {url}")
+                    logger.warning("Non-200 status: %s | URL: %s", response.status_code, url)
                     retries += 1
-                    time.sleep(2 ** retries)  # exponential backoff
+                    self.backoff(retries)
             except RequestException as e:
-                logger.error(f"Request failed: {e}")
+                SCRAPE_FETCHES.labels(**labels, status_class=status_class(None)).inc()
+                logger.error("Request failed: %s", e)
                 retries += 1
-                time.sleep(2 ** retries)
-        logger.error(f"Failed to fetch URL after {self.max_retries} retries: {url}")
+                self.backoff(retries)
+        logger.error("Failed to fetch URL after %s retries: %s", self.max_retries, url)
         return None
+
+    def backoff(self, retries):
+        """Exponential backoff before retry number `retries`."""
+        with tracer.start_as_current_span("scrape.backoff", attributes={"http.request.resend_count": retries}):
+            time.sleep(2 ** retries)
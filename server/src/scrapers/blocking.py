@@ -0,0 +1,109 @@
+"""
+Request blocking and network accounting for Selenium browsers.
+
+Dynamic listing pages only need their HTML and scripts; images, fonts,
+media, ads and trackers are downloaded for nothing. Blocking goes through
+the Chrome DevTools Protocol: Network.setBlockedURLs with wildcard URL
+patterns, built from
+
+  - `resource_types`: image, font, media and stylesheet, each expanded to
+    patterns for its file extensions (CDP's URL blocking cannot match on
+    type). A pattern must match the whole URL, so `*.css` and `*.css?*`
+    only match a path ending in the extension, never a host or query
+    parameter that merely contains it (https://x.icons.example/app.js), and
+  - `url_patterns`: extra patterns such as ad and tracker hosts.
+
+Defaults are in the `selenium.block` section of settings.yaml; a source's
+`block` in sources.yaml overrides them key by key, and `block: false`
+turns blocking off for it.
+
+With `track_network` on, Chrome's performance log (the CDP Network events)
+is read after each page to count the bytes Chrome actually downloaded and
+the requests it blocked, by resource type.
+"""
+
+import json
+from src.utils.config import get_config
+
+# File extensions of each blockable resource type
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8"],
+    "stylesheet": ["css"],
+}
+# CDP URL patterns matching each blockable resource type: the path ends in
+# the extension, with or without a query string
+RESOURCE_TYPE_PATTERNS = {
+    resource_type: [pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*")]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+DEFAULT_SELENIUM_SETTINGS = {
+    "page_load_strategy": "eager",
+    "track_network": True,
+    "block": {
+        "resource_types": ["image", "font", "media"],
+        "url_patterns": [],
+    },
+}
+
+
+def get_selenium_settings() -> dict:
+    """Browser options from the `selenium` section of settings.yaml."""
+    selenium_config = (get_config() or {}).get("selenium") or {}
+    settings = {**DEFAULT_SELENIUM_SETTINGS, **selenium_config}
+    settings["block"] = {**DEFAULT_SELENIUM_SETTINGS["block"], **(selenium_config.get("block") or {})}
+    return settings
+
+
+def source_block(src=None, settings=None) -> dict:
+    """The block config for a source: the defaults with the source's `block` keys applied."""
+    settings = settings or get_selenium_settings()
+    block = (src or {}).get("block")
+    if block is False:
+        return {"resource_types": [], "url_patterns": []}
+    return {**settings["block"], **(block or {})}
+
+
+def blocked_url_patterns(block) -> list:
+    """Network.setBlockedURLs patterns for a block config, without duplicates."""
+    patterns = []
+    for resource_type in block.get("resource_types") or []:
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            raise ValueError(f"Unknown resource type {resource_type!r}; "
+                             f"expected one of {', '.join(RESOURCE_TYPE_PATTERNS)}")
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(block.get("url_patterns") or [])
+    return list(dict.fromkeys(patterns))
+
+
+def apply_blocking(driver, patterns):
+    """Enable the CDP Network domain in `driver` and block requests matching `patterns`."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def network_usage(log_entries) -> dict:
+    """
+    Totals of Chrome performance log entries (driver.get_log("performance")).
+
+    Returns:
+        dict: requests (finished), bytes (encoded, as transferred) and blocked,
+        a count of blocked requests by lower-case CDP resource type
+    """
+    usage = {"requests": 0, "bytes": 0, "blocked": {}}
+    for entry in log_entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "Network.loadingFinished":
+            usage["requests"] += 1
+            usage["bytes"] += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = (params.get("type") or "other").lower()
+            usage["blocked"][resource_type] = usage["blocked"].get(resource_type, 0) + 1
+    return usage
@@ -0,0 +1,412 @@
+"""
+Multi-tab Selenium rendering: a few Chrome instances, each loading several
+listing pages at once in separate tabs.
+
+Starting a Chrome per page costs seconds and hundreds of MB. With the
+`selenium.tabs` settings enabled, dynamic scrapes go to a TabPool of
+`browsers` Chromes instead. Each is driven by its own thread (a WebDriver
+session cannot be shared between threads) that keeps up to `max_tabs` tabs
+in flight: it starts a page's navigation in a new tab without waiting for
+it, then goes round the open tabs, scrolling the ones that are ready and
+extracting the jobs of the ones that are done, so page loads and scroll
+waits of different pages overlap.
+
+A watchdog samples each Chrome's resident memory (its whole process tree,
+read from /proc; skipped where there is none) and opens no further tabs
+while it is above `max_memory_mb`. A browser over the limit, or that has
+served `recycle_after` pages, is restarted once its open tabs are done.
+
+Resource blocking (src.scrapers.blocking) is set per tab, so tabs of
+different sources each get their source's block list.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from src.scrapers.blocking import apply_blocking, blocked_url_patterns, get_selenium_settings
+from src.utils.logger import get_logger
+from src.utils.metrics import BROWSER_MEMORY, BROWSER_TABS_OPEN, SCRAPE_FETCH_DURATION, SCRAPE_FETCHES, status_class
+
+logger = get_logger(__name__)
+
+DEFAULT_TAB_SETTINGS = {
+    "enabled": False,
+    "browsers": 2,
+    "max_tabs": 4,
+    "max_memory_mb": 2048,
+    "recycle_after": 200,
+    "page_timeout_seconds": 30,
+}
+
+# How often a loading tab is checked, and the longest the driver thread idles
+LOAD_POLL_SECONDS = 0.25
+MEMORY_CHECK_SECONDS = 5
+
+
+def get_tab_settings() -> dict:
+    """Multi-tab options from the `selenium.tabs` section of settings.yaml."""
+    return {**DEFAULT_TAB_SETTINGS, **(get_selenium_settings().get("tabs") or {})}
+
+
+def process_tree_rss(pid):
+    """Resident bytes of a process and all of its descendants, or None without /proc."""
+    parents = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name in parentheses may contain spaces; ppid is the second field after it
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    children = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+    tree, frontier = set(), [pid]
+    while frontier:
+        current = frontier.pop()
+        if current not in tree:
+            tree.add(current)
+            frontier.extend(children.get(current, ()))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for member in tree:
+        try:
+            with open(f"/proc/{member}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class _TabRequest:
+    __slots__ = ("url", "scroll_count", "source_id", "block", "job_selector", "fields", "future")
+
+    def __init__(self, url, scroll_count, source_id, block, job_selector, fields):
+        self.url = url
+        self.scroll_count = scroll_count
+        self.source_id = source_id
+        self.block = block
+        self.job_selector = job_selector
+        self.fields = fields
+        self.future = Future()
+
+
+class _Tab:
+    __slots__ = ("request", "handle", "loaded", "scrolls_left", "due", "opened_at", "started", "network")
+
+    def __init__(self, request, handle, now):
+        self.request = request
+        self.handle = handle
+        self.loaded = False
+        self.scrolls_left = request.scroll_count
+        self.due = now + LOAD_POLL_SECONDS
+        self.opened_at = now
+        self.started = time.perf_counter()
+        # This tab's Chrome performance log entries, for its network accounting
+        self.network = []
+
+
+class TabbedBrowser:
+    """
+    One Chrome rendering up to max_tabs pages at once, driven by its own thread.
+
+    submit() returns a Future of (jobs, extraction seconds, parse cache
+    stats or None), like SeleniumScraper.scrape_page.
+    """
+
+    def __init__(self, name, max_tabs, max_memory_mb=None, recycle_after=None, page_timeout_seconds=30,
+                 settle_seconds=3, delay_range=(1, 3)):
+        self.name = name
+        self.max_tabs = max_tabs
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+        self.recycle_after = recycle_after
+        self.page_timeout_seconds = page_timeout_seconds
+        # Wait after a page is ready before the first scroll, for its initial listings
+        self.settle_seconds = settle_seconds
+        self.delay_range = delay_range
+        self.scraper = None
+        self._home = None
+        self._tabs = {}
+        self._pending = deque()
+        self._in_flight = 0
+        self._pages_served = 0
+        self._memory = None
+        self._memory_checked = 0.0
+        self._over_memory = False
+        self._stopping = False
+        self._lock = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def load(self) -> int:
+        """Pages submitted and not finished yet."""
+        return self._in_flight
+
+    def submit(self, url, scroll_count, source_id, block, job_selector, fields) -> Future:
+        request = _TabRequest(url, scroll_count, source_id, block, job_selector, fields)
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError(f"{self.name} is shut down")
+            self._pending.append(request)
+            self._in_flight += 1
+            self._lock.notify()
+        return request.future
+
+    def shutdown(self, wait=True):
+        """Fail the pages still queued, finish the open tabs and close Chrome."""
+        with self._lock:
+            self._stopping = True
+            pending, self._pending = list(self._pending), deque()
+            self._lock.notify()
+        for request in pending:
+            self._resolve(request, error=RuntimeError(f"{self.name} is shut down"))
+        if wait and self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._tabs and not self._stopping:
+                    self._lock.wait()
+                if self._stopping and not self._tabs:
+                    break
+            try:
+                self._recycle_if_needed()
+                self._admit()
+                self._step_due_tabs()
+            except Exception as e:
+                # Chrome itself failed (did not start, crashed, lost its session)
+                logger.exception("%s failed; restarting it", self.name)
+                for tab in list(self._tabs.values()):
+                    self._tabs.pop(tab.handle)
+                    BROWSER_TABS_OPEN.dec()
+                    self._resolve(tab.request, error=e)
+                self._close_browser()
+            self._idle()
+        self._close_browser()
+
+    def _ensure_browser(self):
+        if self.scraper is None:
+            from src.scrapers.selenium_scraper import SeleniumScraper
+
+            # Blocking is set per tab, for the tab's source
+            self.scraper = SeleniumScraper(headless=True, delay_range=self.delay_range,
+                                           block={"resource_types": [], "url_patterns": []})
+            # Never closed, so closing the last page tab does not end the session
+            self._home = self.scraper.driver.current_window_handle
+            self._pages_served = 0
+            self._memory = None
+            self._memory_checked = 0.0
+            self._over_memory = False
+            logger.info("%s started", self.name)
+        return self.scraper
+
+    def _close_browser(self):
+        scraper, self.scraper = self.scraper, None
+        if scraper is not None:
+            try:
+                scraper.close()
+            except Exception as e:
+                logger.warning("Could not close %s: %s", self.name, e)
+
+    def _recycle_if_needed(self):
+        if self.scraper is None or self._tabs or not self._pages_served:
+            return
+        if self._over_memory or (self.recycle_after and self._pages_served >= self.recycle_after):
+            logger.info("Restarting %s after %s pages (memory %s MB)", self.name, self._pages_served,
+                        round((self._memory or 0) / 1024 / 1024))
+            self._close_browser()
+
+    def _admit(self):
+        while len(self._tabs) < self.max_tabs:
+            # An empty browser always takes one page, so a low limit cannot stall the queue
+            if self._tabs and self._check_memory():
+                return
+            with self._lock:
+                if not self._pending or self._stopping:
+                    return
+                request = self._pending.popleft()
+            try:
+                self._open_tab(request)
+            except Exception as e:
+                self._resolve(request, error=e)
+                raise
+
+    def _open_tab(self, request):
+        driver = self._ensure_browser().driver
+        driver.switch_to.new_window("tab")
+        handle = driver.current_window_handle
+        # CDP commands go to the current tab, so each tab gets its own block list
+        apply_blocking(driver, blocked_url_patterns(request.block))
+        # Unlike driver.get(), returns before the page loads
+        driver.execute_script("window.location.href = arguments[0];", request.url)
+        self._tabs[handle] = _Tab(request, handle, time.monotonic())
+        BROWSER_TABS_OPEN.inc()
+        logger.info("Opening dynamic page in %s tab %s/%s: %s", self.name, len(self._tabs), self.max_tabs,
+                    request.url)
+
+    def _step_due_tabs(self):
+        now = time.monotonic()
+        for tab in [tab for tab in self._tabs.values() if tab.due <= now]:
+            try:
+                self._step(tab, now)
+            except Exception as e:
+                self._finish(tab, error=e)
+                # Raises if the session itself is gone, which restarts the browser
+                self.scraper.driver.switch_to.window(self._home)
+
+    def _step(self, tab, now):
+        driver = self.scraper.driver
+        driver.switch_to.window(tab.handle)
+        if not tab.loaded:
+            state, href = driver.execute_script("return [document.readyState, location.href];")
+            if href == "about:blank" or state == "loading":
+                if now - tab.opened_at > self.page_timeout_seconds:
+                    raise TimeoutError(f"Page did not load within {self.page_timeout_seconds}s")
+                tab.due = now + LOAD_POLL_SECONDS
+                return
+            tab.loaded = True
+            tab.due = now + self.settle_seconds
+        elif tab.scrolls_left > 0:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            tab.scrolls_left -= 1
+            tab.due = now + random.uniform(*self.delay_range)
+        else:
+            self._finish(tab)
+
+    def _finish(self, tab, error=None):
+        request = tab.request
+        scraper = self.scraper
+        scraper.source_id = request.source_id
+        labels = scraper.metric_labels()
+        SCRAPE_FETCH_DURATION.labels(**labels).observe(time.perf_counter() - tab.started)
+        result = ([], 0.0, None)
+        if error is None:
+            SCRAPE_FETCHES.labels(**labels, status_class=status_class(200)).inc()
+            if scraper.track_network:
+                self._collect_network_log()
+                scraper._record_network_usage(request.url, tab.network)
+            result = scraper.extract_or_parse(request.job_selector, request.fields)
+        else:
+            SCRAPE_FETCHES.labels(**labels, status_class=status_class(None)).inc()
+            logger.error("Selenium error in %s for %s: %s", self.name, request.url, error)
+        self._close_tab(tab)
+        self._pages_served += 1
+        self._resolve(request, result=result)
+
+    def _close_tab(self, tab):
+        self._tabs.pop(tab.handle, None)
+        BROWSER_TABS_OPEN.dec()
+        driver = self.scraper.driver
+        try:
+            driver.switch_to.window(tab.handle)
+            driver.close()
+            driver.switch_to.window(self._home)
+        except Exception as e:
+            logger.debug("Could not close tab of %s: %s", tab.request.url, e)
+
+    def _collect_network_log(self):
+        """Hand the performance log entries read so far to the tabs they belong to."""
+        for entry in self.scraper._drain_network_log():
+            try:
+                webview = json.loads(entry["message"]).get("webview")
+            except (KeyError, TypeError, ValueError):
+                continue
+            # ChromeDriver window handles are the tabs' DevTools target ids
+            tab = self._tabs.get(webview)
+            if tab is not None:
+                tab.network.append(entry)
+
+    def _check_memory(self) -> bool:
+        """Whether Chrome is above max_memory_mb, sampled every MEMORY_CHECK_SECONDS."""
+        if self.max_memory_bytes is None or self.scraper is None:
+            return False
+        now = time.monotonic()
+        if now - self._memory_checked >= MEMORY_CHECK_SECONDS:
+            self._memory_checked = now
+            process = getattr(getattr(self.scraper.driver, "service", None), "process", None)
+            self._memory = process_tree_rss(process.pid) if process is not None else None
+            if self._memory is not None:
+                BROWSER_MEMORY.labels(browser=self.name).set(self._memory)
+                over = self._memory > self.max_memory_bytes
+                if over and not self._over_memory:
+                    logger.warning("%s uses %s MB, above its %s MB limit; opening no more tabs", self.name,
+                                   round(self._memory / 1024 / 1024), self.max_memory_bytes // 1024 // 1024)
+                self._over_memory = over
+        return self._over_memory
+
+    def _idle(self):
+        if self.scraper is not None and self.scraper.track_network and self._tabs:
+            self._collect_network_log()
+        if not self._tabs:
+            return
+        wait = min(tab.due for tab in self._tabs.values()) - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, LOAD_POLL_SECONDS))
+
+    def _resolve(self, request, result=None, error=None):
+        with self._lock:
+            self._in_flight -= 1
+        if error is not None:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(result)
+
+
+class TabPool:
+    """A few TabbedBrowsers; each page goes to the least loaded one."""
+
+    def __init__(self, browsers, max_tabs, **options):
+        self.browsers = [TabbedBrowser(f"chrome-tabs-{number}", max_tabs, **options).start()
+                         for number in range(browsers)]
+
+    def submit(self, url, scroll_count, source_id, block, job_selector, fields) -> Future:
+        browser = min(self.browsers, key=lambda candidate: candidate.load)
+        return browser.submit(url, scroll_count, source_id, block, job_selector, fields)
+
+    def shutdown(self, wait=True):
+        for browser in self.browsers:
+            browser.shutdown(wait=False)
+        if wait:
+            for browser in self.browsers:
+                browser.shutdown(wait=True)
+
+
+_tab_pool = None
+_tab_pool_lock = threading.Lock()
+
+
+def get_tab_pool() -> TabPool:
+    global _tab_pool
+    with _tab_pool_lock:
+        if _tab_pool is None:
+            settings = get_tab_settings()
+            _tab_pool = TabPool(settings["browsers"], settings["max_tabs"],
+                                max_memory_mb=settings["max_memory_mb"], recycle_after=settings["recycle_after"],
+                                page_timeout_seconds=settings["page_timeout_seconds"])
+            logger.info("Multi-tab rendering with %s browsers of up to %s tabs", settings["browsers"],
+                        settings["max_tabs"])
+        return _tab_pool
+
+
+def shutdown_tab_pool(wait=True):
+    global _tab_pool
+    with _tab_pool_lock:
+        tab_pool, _tab_pool = _tab_pool, None
+    if tab_pool is not None:
+        tab_pool.shutdown(wait=wait)
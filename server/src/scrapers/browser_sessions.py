@@ -0,0 +1,142 @@
+"""
+Saved login sessions for Selenium sources that need an account.
+
+Logging in for every scrape means filling the login form and waiting for
+it on each page, and a login every few seconds is what gets accounts
+CAPTCHA'd or locked. After a successful login the browser's cookies are
+saved to a cookie jar (<sessions dir>/<site>.json, readable only by the
+owner). Later browsers, in any worker thread or process, load the jar
+instead of logging in. Sessions are restored by SeleniumScraper.open_page,
+i.e. on the one-page-per-browser path; the multi-tab pool
+(src.scrapers.browser_pool) does not sign in, and the scheduler keeps
+LinkedIn off it.
+
+A jar is checked cheaply before use: the site's auth cookie must be in it
+and not expire within `min_remaining_minutes`. A session the site has
+revoked anyway shows up as a redirect to its login page; the scraper then
+drops the jar, logs in once and saves the new cookies.
+
+Cookie jars rather than Chrome user-data directories, because a profile
+directory can only be used by one Chrome at a time, while a jar is shared
+by any number of browsers. Settings are in the `selenium.sessions` section
+of settings.yaml.
+"""
+
+import json
+import os
+import threading
+import time
+from src.scrapers.blocking import get_selenium_settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per site: a cheap page on the cookies' domain (cookies can only be added
+# for the open page's domain), the cookie that carries the login, and URL
+# parts of the pages a signed-out visitor is sent to
+SITES = {
+    "linkedin": {
+        "domain_url": "https://www.linkedin.com/robots.txt",
+        "auth_cookie": "li_at",
+        "login_markers": ("/login", "/authwall", "/checkpoint", "/uas/login"),
+    },
+}
+
+DEFAULT_SESSION_SETTINGS = {
+    "enabled": True,
+    "dir": "data_output/browser_sessions",
+    "min_remaining_minutes": 60,
+}
+
+# Held while a site's jar is checked and, if needed, a login is done, so
+# browsers in one process never log in to the same site at once
+_login_locks = {site: threading.Lock() for site in SITES}
+
+
+def get_session_settings() -> dict:
+    """Login session options from the `selenium.sessions` section of settings.yaml."""
+    return {**DEFAULT_SESSION_SETTINGS, **(get_selenium_settings().get("sessions") or {})}
+
+
+def login_lock(site):
+    return _login_locks[site]
+
+
+class CookieJar:
+    """The saved cookies of one site."""
+
+    def __init__(self, site, directory=None):
+        self.site = site
+        self.path = os.path.join(directory or get_session_settings()["dir"], f"{site}.json")
+
+    def load(self):
+        """The saved cookies, or None if there are none (or the file is unreadable)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)["cookies"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable cookie jar %s: %s", self.path, e)
+            return None
+
+    def save(self, cookies):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        # Session cookies are credentials: owner-only, and replaced atomically
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "cookies": cookies}, f)
+        os.replace(temporary, self.path)
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def session_is_valid(site, cookies, now=None, min_remaining_minutes=None) -> bool:
+    """Whether `cookies` hold the site's auth cookie, not expiring within min_remaining_minutes."""
+    if not cookies:
+        return False
+    now = time.time() if now is None else now
+    if min_remaining_minutes is None:
+        min_remaining_minutes = get_session_settings()["min_remaining_minutes"]
+    auth_cookie = SITES[site]["auth_cookie"]
+    for cookie in cookies:
+        if cookie.get("name") == auth_cookie and cookie.get("value"):
+            expiry = cookie.get("expiry")
+            return expiry is None or expiry > now + min_remaining_minutes * 60
+    return False
+
+
+def is_login_page(site, url) -> bool:
+    """Whether `url` is a page the site sends signed-out visitors to."""
+    return any(marker in (url or "") for marker in SITES[site]["login_markers"])
+
+
+def restore_session(driver, site, jar=None) -> bool:
+    """Load the site's saved cookies into `driver`; False if there is no usable session."""
+    jar = jar or CookieJar(site)
+    cookies = jar.load()
+    if not session_is_valid(site, cookies):
+        return False
+    driver.get(SITES[site]["domain_url"])
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logger.debug("Skipped saved %s cookie %s: %s", site, cookie.get("name"), e)
+    logger.info("Restored saved %s session", site)
+    return True
+
+
+def save_session(driver, site, jar=None) -> bool:
+    """Save the site's cookies from `driver` if they hold a login; returns whether they did."""
+    cookies = driver.get_cookies()
+    if not session_is_valid(site, cookies, min_remaining_minutes=0):
+        return False
+    (jar or CookieJar(site)).save(cookies)
+    logger.info("Saved %s session", site)
+    return True
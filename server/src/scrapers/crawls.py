@@ -0,0 +1,181 @@
+"""
+Scheduled incremental crawls of saved (keyword, source) pairs.
+
+A crawl schedule (crawl_schedules) names a keyword, a source from
+sources.yaml, an interval and a page limit. A background thread polls for
+due schedules and crawls them as batch work on the scrape scheduler, so
+interactive scrapes keep priority.
+
+Crawls are incremental. Each page is stored as soon as it is scraped, and
+its postings are checked against job_postings and the pair's watermark
+(crawl_watermarks: the newest posting date seen so far). Listings come
+newest first, so once at least `stop_known_ratio` of a page is known or
+older than the watermark, the rest is already stored and the crawl stops
+paginating. Sources without a `pagination` config have a single page.
+
+Settings are in the `crawls` section of settings.yaml.
+"""
+
+import threading
+from datetime import datetime, timezone
+from src.analysis.trends import normalize_dates
+from src.data.crawl_store import (
+    advance_crawl_watermark,
+    claim_crawl_schedule,
+    due_crawl_schedules,
+    finish_crawl_schedule,
+    get_crawl_watermark,
+    known_fingerprints,
+)
+from src.data.database import get_session
+from src.data.job_store import fingerprint_job, store_scrape_results
+from src.scrapers.scheduler import BATCH, submit_source
+from src.utils.config import get_config
+from src.utils.helpers import load_sources_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CRAWL_SETTINGS = {
+    "enabled": False,
+    "poll_seconds": 60,
+    "stop_known_ratio": 0.5,
+}
+
+
+def get_crawl_settings() -> dict:
+    """Crawl options from the `crawls` section of settings.yaml."""
+    return {**DEFAULT_CRAWL_SETTINGS, **((get_config() or {}).get("crawls") or {})}
+
+
+def _newest(posted_at, fingerprints):
+    """(posted_at, fingerprint) of the most recently posted job on a page, or (None, None)."""
+    dated = [(timestamp, fingerprint) for timestamp, fingerprint in zip(posted_at, fingerprints) if timestamp]
+    return max(dated) if dated else (None, None)
+
+
+def crawl_source(session, src, keyword, max_pages, stop_known_ratio=None, priority=BATCH) -> dict:
+    """
+    Crawl one source for a keyword, page by page, until it reaches known postings.
+
+    Returns:
+        dict: pages fetched, postings scraped, inserted and updated, and why it stopped
+    """
+    stop_known_ratio = get_crawl_settings()["stop_known_ratio"] if stop_known_ratio is None else stop_known_ratio
+    keyword = keyword.strip().lower()
+    watermark = get_crawl_watermark(session, keyword, src["id"])
+    high_water = watermark.newest_posted_at if watermark else None
+    if high_water is not None and high_water.tzinfo is None:
+        high_water = high_water.replace(tzinfo=timezone.utc)
+    pages = max_pages if src.get("pagination") else 1
+
+    summary = {"pages": 0, "scraped": 0, "inserted": 0, "updated": 0, "stopped": "max_pages"}
+    newest = (None, None)
+    for page in range(pages):
+        jobs = submit_source(src["id"], src, keyword, priority=priority, page=page).result()
+        summary["pages"] += 1
+        if not jobs:
+            summary["stopped"] = "empty_page"
+            break
+        seen_at = datetime.now(timezone.utc)
+        fingerprints = [fingerprint_job(job) for job in jobs]
+        posted_at = [timestamp.replace(tzinfo=timezone.utc) if timestamp else None
+                     for timestamp in normalize_dates([job.get("date_posted") for job in jobs],
+                                                      reference=seen_at).tolist()]
+        known = known_fingerprints(session, fingerprints)
+        old = sum(1 for fingerprint, timestamp in zip(fingerprints, posted_at)
+                  if fingerprint in known or (high_water and timestamp and timestamp <= high_water))
+        page_newest = _newest(posted_at, fingerprints)
+        if page_newest[0] and (newest[0] is None or page_newest[0] > newest[0]):
+            newest = page_newest
+        elif newest[1] is None:
+            # Undated listings: the top posting of the first page is the newest
+            newest = (None, fingerprints[0])
+
+        stored = store_scrape_results(session, [(src, jobs)], keyword=keyword)
+        summary["scraped"] += len(jobs)
+        summary["inserted"] += stored["inserted"]
+        summary["updated"] += stored["updated"]
+        if old >= stop_known_ratio * len(jobs):
+            summary["stopped"] = "reached_known"
+            break
+
+    advance_crawl_watermark(session, keyword, src["id"], newest[0], newest[1], summary["pages"])
+    logger.info("Crawled %s for '%s': %s pages, %s new, %s refreshed postings (stopped: %s)",
+                src["id"], keyword, summary["pages"], summary["inserted"], summary["updated"], summary["stopped"])
+    return summary
+
+
+def run_due_crawls(now=None, sources=None) -> int:
+    """Claim and run every due crawl schedule; returns how many ran."""
+    now = now or datetime.now(timezone.utc)
+    sources = sources if sources is not None else load_sources_config()
+    session = get_session()
+    ran = 0
+    try:
+        for schedule in due_crawl_schedules(session, now):
+            if not claim_crawl_schedule(session, schedule, now):
+                continue  # another process got it first
+            src = sources.get(schedule.source_slug)
+            if src is None:
+                finish_crawl_schedule(session, schedule.id, "failed", f"Unknown source {schedule.source_slug}")
+                continue
+            try:
+                crawl_source(session, src, schedule.keyword, schedule.max_pages)
+                finish_crawl_schedule(session, schedule.id, "ok")
+            except Exception as e:
+                session.rollback()
+                logger.exception("Crawl of %s for '%s' failed", schedule.source_slug, schedule.keyword)
+                finish_crawl_schedule(session, schedule.id, "failed", str(e)[:2000])
+            ran += 1
+    finally:
+        session.close()
+    return ran
+
+
+class CrawlScheduler:
+    """Background thread running due crawls every poll_seconds."""
+
+    def __init__(self, poll_seconds):
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="crawl-scheduler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                run_due_crawls()
+            except Exception:
+                logger.exception("Crawl scheduler pass failed")
+            self._stop.wait(self.poll_seconds)
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if wait:
+            self._thread.join()
+
+
+_crawl_scheduler = None
+_crawl_scheduler_lock = threading.Lock()
+
+
+def start_crawl_scheduler():
+    global _crawl_scheduler
+    with _crawl_scheduler_lock:
+        if _crawl_scheduler is None:
+            settings = get_crawl_settings()
+            _crawl_scheduler = CrawlScheduler(settings["poll_seconds"]).start()
+            logger.info("Crawl scheduler started, polling every %ss", settings["poll_seconds"])
+        return _crawl_scheduler
+
+
+def stop_crawl_scheduler(wait=True):
+    global _crawl_scheduler
+    with _crawl_scheduler_lock:
+        crawl_scheduler, _crawl_scheduler = _crawl_scheduler, None
+    if crawl_scheduler is not None:
+        crawl_scheduler.stop(wait=wait)
@@ -0,0 +1,218 @@
+"""
+Content-hash caches of parsed listing pages and job cards.
+
+Listing pages are often unchanged between scrapes, and a changed page
+mostly shows the same cards as before. parse_cached() therefore:
+
+  1. hashes the raw page; a byte-identical page returns its jobs without
+     any parsing;
+  2. otherwise finds the `job_selector` cards with a fast lxml parse and
+     hashes their HTML together; if the cards are the ones of a known page
+     (only CSRF tokens, timestamps, ads or other markup outside the cards
+     changed), its jobs are returned without the BeautifulSoup parse or
+     field extraction;
+  3. otherwise parses the page with BeautifulSoup, hashes each card's HTML
+     and only runs field extraction for unknown cards.
+
+Most real pages differ in bytes on every load, so step 1 mainly serves
+static boards and replays. Step 2 costs about a tenth of the BeautifulSoup
+parse (0.6 ms against 7.4 ms on the python_org benchmark fixture); pages
+whose cards changed pay for both parses. lxml and cssselect come with
+scrapy; without them, or for selectors cssselect does not support, step 2
+is skipped.
+
+Both caches are LRU, bounded per process (settings.yaml `parse_cache`), and
+keyed on the selectors too, so a changed sources.yaml never reuses stale
+results. Parsing runs on the scheduler's CPU pool, so each pool process
+has its own caches; per-call hit counts are returned in `stats` for the
+parent process to report.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from src.utils.config import get_config
+from src.utils.metrics import SCRAPE_PARSE_CACHE
+
+
+def get_parse_cache_settings() -> dict:
+    """Parse cache options from the `parse_cache` section of settings.yaml."""
+    cache_config = (get_config() or {}).get("parse_cache") or {}
+    return {
+        "enabled": bool(cache_config.get("enabled", True)),
+        "max_pages": int(cache_config.get("max_pages", 256)),
+        "max_cards": int(cache_config.get("max_cards", 20000)),
+    }
+
+
+class LRUCache:
+    """Small thread-safe LRU map."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+_settings = None
+_page_cache = None
+_card_cache = None
+
+
+def _caches():
+    global _settings, _page_cache, _card_cache
+    if _settings is None:
+        _settings = get_parse_cache_settings()
+        _page_cache = LRUCache(_settings["max_pages"])
+        _card_cache = LRUCache(_settings["max_cards"])
+    return _settings, _page_cache, _card_cache
+
+
+def clear_parse_caches():
+    _, page_cache, card_cache = _caches()
+    page_cache.clear()
+    card_cache.clear()
+
+
+def _digest(*parts) -> str:
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part if isinstance(part, bytes) else str(part).encode("utf-8", "surrogatepass"))
+        sha.update(b"\x1f")
+    return sha.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _card_selector(job_selector):
+    # Imported here, like bs4, to keep lxml out of API startup
+    try:
+        from lxml.cssselect import CSSSelector
+        return CSSSelector(job_selector)
+    except Exception:  # lxml or cssselect missing, or a selector only soupsieve supports
+        return None
+
+
+def _card_region(config_key, html, job_selector):
+    """
+    Digest of the job cards found by a fast lxml parse and how many there
+    are, or (None, 0) when the page or selector cannot be handled that way.
+    """
+    selector = _card_selector(job_selector)
+    if selector is None:
+        return None, 0
+    from lxml import html as lxml_html
+
+    try:
+        cards = [lxml_html.tostring(elem) for elem in selector(lxml_html.fromstring(html))]
+    except Exception:  # e.g. an empty page, or a str page with an encoding declaration
+        return None, 0
+    if not cards:
+        return None, 0
+    return _digest(config_key, "lxml", *cards), len(cards)
+
+
+def empty_stats() -> dict:
+    return {"page_hit": 0, "page_miss": 0, "card_hit": 0, "card_miss": 0}
+
+
+def record_parse_cache_stats(labels, stats):
+    """Count a parse's page and card hits and misses under a source's metric labels."""
+    for level in ("page", "card"):
+        for result in ("hit", "miss"):
+            count = stats[f"{level}_{result}"]
+            if count:
+                SCRAPE_PARSE_CACHE.labels(**labels, level=level, result=result).inc(count)
+
+
+def parse_cached(html, job_selector, fields, extract, namespace, stats=None) -> list:
+    """
+    Jobs of a listing page, reusing earlier results for unchanged pages and cards.
+
+    Args:
+        html: raw page (str or bytes)
+        extract: function(card element, fields) -> job dict
+        namespace: distinguishes extractors with different output for the same HTML
+        stats: optional dict (see empty_stats) that the call's hits and misses are added to
+
+    Returns:
+        list: new job dicts; callers may modify them
+    """
+    # Imported here so the scheduler can import this module without loading bs4 at API startup
+    from bs4 import BeautifulSoup
+
+    stats = stats if stats is not None else empty_stats()
+    settings, page_cache, card_cache = _caches()
+    if not settings["enabled"]:
+        stats["page_miss"] += 1
+        soup = BeautifulSoup(html, "html.parser")
+        return [extract(elem, fields) for elem in soup.select(job_selector)]
+
+    config_key = _digest(namespace, job_selector, json.dumps(fields, sort_keys=True, default=str))
+    raw_key = _digest(config_key, html)
+    jobs = page_cache.get(raw_key)
+    if jobs is not None:
+        stats["page_hit"] += 1
+        return [dict(job) for job in jobs]
+
+    region_key, region_cards = _card_region(config_key, html, job_selector)
+    if region_key is not None:
+        jobs = page_cache.get(region_key)
+        if jobs is not None:
+            stats["page_hit"] += 1
+            page_cache.put(raw_key, jobs)
+            return [dict(job) for job in jobs]
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = [(elem, str(elem)) for elem in soup.select(job_selector)]
+    # The lxml digest only stands for this page if both parsers see the same cards
+    region_key = region_key if region_cards == len(cards) else None
+    cards_key = _digest(config_key, *[markup for _, markup in cards])
+    jobs = page_cache.get(cards_key)
+    if jobs is not None:
+        stats["page_hit"] += 1
+        page_cache.put(raw_key, jobs)
+        if region_key is not None:
+            page_cache.put(region_key, jobs)
+        return [dict(job) for job in jobs]
+    stats["page_miss"] += 1
+
+    jobs = []
+    for elem, markup in cards:
+        card_key = _digest(config_key, markup)
+        job = card_cache.get(card_key)
+        if job is None:
+            stats["card_miss"] += 1
+            job = extract(elem, fields)
+            card_cache.put(card_key, job)
+        else:
+            stats["card_hit"] += 1
+        jobs.append(dict(job))
+    cached = [dict(job) for job in jobs]
+    page_cache.put(cards_key, cached)
+    page_cache.put(raw_key, cached)
+    if region_key is not None:
+        page_cache.put(region_key, cached)
+    return jobs
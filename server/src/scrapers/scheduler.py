@@ -0,0 +1,446 @@
+"""
+Scrape scheduler: routes each source to an executor for its resource class.
+
+    io       api and static sources; many threads, mostly waiting on the network
+    browser  Selenium sources; a few threads, each driving a Chrome instance
+             that also extracts the job cards
+    cpu      HTML parsing of static pages, on a process pool
+
+Every class has a concurrency quota (its worker count), a cap on how many of
+those workers batch work may hold, so interactive requests always find a
+free slot, and a bounded queue. Queued tasks run interactive first, then in
+submission order. Per-class queue depth, wait and run times are exposed by
+scheduler_metrics().
+
+Quotas come from the `scheduler` section of settings.yaml.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from src.scrapers.blocking import source_block
+from src.scrapers.parse_cache import record_parse_cache_stats
+from src.utils.config import get_config
+from src.utils.helpers import page_url
+from src.utils.logger import get_logger
+from src.utils.metrics import SCRAPE_JOBS, SCRAPE_PARSE_DURATION, source_labels
+from src.utils.profiling import current_profile, run_profiled
+from src.utils.tracing import record_span, tracer
+
+logger = get_logger(__name__)
+
+INTERACTIVE = 0
+BATCH = 10
+
+# Per-class defaults: workers, batch_workers (max held by batch work), max_queue
+DEFAULT_QUOTAS = {
+    "io": {"workers": 16, "batch_workers": 12, "max_queue": 1000},
+    "browser": {"workers": 2, "batch_workers": 1, "max_queue": 50},
+    "cpu": {"workers": 2, "batch_workers": 1, "max_queue": 1000},
+}
+
+# Scraper backends (selenium, webdriver_manager, bs4, requests) are imported on
+# first use so they stay out of API startup; the API warm-up preloads these
+SCRAPER_MODULES = (
+    "src.scrapers.static_scraper",
+    "src.scrapers.selenium_scraper",
+    "src.scrapers.api_scraper",
+)
+
+# Source type (sources.yaml) -> resource class that fetches it
+SOURCE_CLASSES = {
+    "static": "io",
+    "api": "io",
+    "dynamic": "browser",
+}
+
+
+class SchedulerFull(Exception):
+    """Raised when a resource class's queue is at its max_queue limit."""
+
+
+class _Task:
+    __slots__ = ("fn", "args", "kwargs", "priority", "future", "submitted_at", "context", "profile")
+
+    def __init__(self, fn, args, kwargs, priority):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.future = Future()
+        self.submitted_at = time.perf_counter()
+        # Trace context of the submitter, so spans in the worker join its trace
+        self.context = otel_context.get_current()
+        # Set when the submitting request is being profiled
+        self.profile = current_profile()
+
+
+class ClassExecutor:
+    """
+    Fixed set of worker threads serving a priority queue.
+
+    With process_pool=True each worker hands its task to a process pool of
+    the same size and waits for it, so CPU work gets real parallelism while
+    priorities, quotas and metrics work as for the thread classes.
+    """
+
+    def __init__(self, name, workers, batch_workers=None, max_queue=None, process_pool=False):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.batch_workers = max(1, min(int(batch_workers or self.workers), self.workers))
+        self.max_queue = max_queue
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._running = 0
+        self._running_batch = 0
+        self._shutdown = False
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                       "wait_seconds_sum": 0.0, "wait_seconds_max": 0.0, "run_seconds_sum": 0.0}
+        self._pool = None
+        if process_pool:
+            # spawn, not fork: the API process has threads and open database pools
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._threads = [threading.Thread(target=self._work, name=f"scrape-{name}-{i}", daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args, priority=BATCH, **kwargs) -> Future:
+        task = _Task(fn, args, kwargs, priority)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError(f"{self.name} executor is shut down")
+            if self.max_queue is not None and len(self._heap) >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise SchedulerFull(f"{self.name} queue is full ({self.max_queue} tasks)")
+            heapq.heappush(self._heap, (priority, next(self._sequence), task))
+            self._stats["submitted"] += 1
+            self._cond.notify()
+        return task.future
+
+    def _next_task(self):
+        with self._cond:
+            while True:
+                if self._heap:
+                    priority, _, task = self._heap[0]
+                    if priority <= INTERACTIVE or self._running_batch < self.batch_workers:
+                        heapq.heappop(self._heap)
+                        self._running += 1
+                        if priority > INTERACTIVE:
+                            self._running_batch += 1
+                        return task
+                elif self._shutdown:
+                    return None
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            started = time.perf_counter()
+            waited = started - task.submitted_at
+            failed = False
+            if task.future.set_running_or_notify_cancel():
+                token = otel_context.attach(task.context)
+                try:
+                    if self._pool is not None:
+                        result = self._pool.submit(task.fn, *task.args, **task.kwargs).result()
+                    elif task.profile is not None:
+                        result = run_profiled(task.profile, task.fn, *task.args, **task.kwargs)
+                    else:
+                        result = task.fn(*task.args, **task.kwargs)
+                    task.future.set_result(result)
+                except BaseException as e:
+                    failed = True
+                    task.future.set_exception(e)
+                finally:
+                    otel_context.detach(token)
+            with self._cond:
+                self._running -= 1
+                if task.priority > INTERACTIVE:
+                    self._running_batch -= 1
+                self._stats["completed" if not failed else "failed"] += 1
+                self._stats["wait_seconds_sum"] += waited
+                self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+                self._stats["run_seconds_sum"] += time.perf_counter() - started
+                # A batch slot may have freed up for a task at the head of the queue
+                self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            queued = [priority for priority, _, _ in self._heap]
+            running, running_batch = self._running, self._running_batch
+        finished = stats["completed"] + stats["failed"]
+        return {
+            "workers": self.workers,
+            "batch_workers": self.batch_workers,
+            "running": running,
+            "running_batch": running_batch,
+            "queued": len(queued),
+            "queued_interactive": sum(1 for priority in queued if priority <= INTERACTIVE),
+            "submitted": stats["submitted"],
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "rejected": stats["rejected"],
+            "wait_seconds_avg": stats["wait_seconds_sum"] / finished if finished else 0.0,
+            "wait_seconds_max": stats["wait_seconds_max"],
+            "run_seconds_avg": stats["run_seconds_sum"] / finished if finished else 0.0,
+        }
+
+    def shutdown(self, wait=True):
+        with self._cond:
+            self._shutdown = True
+            if not wait:
+                for _, _, task in self._heap:
+                    task.future.cancel()
+                self._heap.clear()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_scheduler_quotas():
+    """
+    Per-class quotas from the `scheduler` section of settings.yaml.
+
+    batch_workers must stay below workers, so interactive scrapes always find
+    a free worker; a class with a single worker cannot reserve one.
+    """
+    scheduler_config = (get_config() or {}).get("scheduler") or {}
+    quotas = {}
+    for name, defaults in DEFAULT_QUOTAS.items():
+        quota = {**defaults, **(scheduler_config.get(name) or {})}
+        if int(quota["workers"]) > 1 and int(quota["batch_workers"]) >= int(quota["workers"]):
+            raise ValueError(f"scheduler.{name}.batch_workers ({quota['batch_workers']}) must be below "
+                             f"workers ({quota['workers']})")
+        quotas[name] = quota
+    return quotas
+
+
+def get_executor(resource_class) -> ClassExecutor:
+    """The shared executor for a resource class, started on first use."""
+    with _executors_lock:
+        executor = _executors.get(resource_class)
+        if executor is None:
+            quota = get_scheduler_quotas()[resource_class]
+            executor = ClassExecutor(resource_class, quota["workers"], batch_workers=quota["batch_workers"],
+                                     max_queue=quota["max_queue"], process_pool=resource_class == "cpu")
+            _executors[resource_class] = executor
+            logger.info(f"Started {resource_class} scrape executor with {executor.workers} workers")
+        return executor
+
+
+def shutdown_scheduler(wait=True):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def scheduler_metrics() -> dict:
+    """Metrics of every executor started so far, by resource class."""
+    with _executors_lock:
+        executors = dict(_executors)
+    return {name: executor.metrics() for name, executor in executors.items()}
+
+
+def _then(future, fn) -> Future:
+    """Future of fn(result), where fn returns a value or another Future."""
+    chained = Future()
+
+    def resolve(done):
+        try:
+            value = fn(done.result())
+            if isinstance(value, Future):
+                value.add_done_callback(lambda inner: _copy_result(inner, chained))
+            else:
+                chained.set_result(value)
+        except BaseException as e:
+            chained.set_exception(e)
+
+    future.add_done_callback(resolve)
+    return chained
+
+
+def _copy_result(source, target):
+    try:
+        target.set_result(source.result())
+    except BaseException as e:
+        target.set_exception(e)
+
+
+def _fetch_static(url, source_id):
+    from src.scrapers.static_scraper import StaticScraper
+
+    scraper = StaticScraper()
+    scraper.source_id = source_id
+    return scraper.fetch_page(url)
+
+
+def _scrape_dynamic(url, scroll_count, source_id, block, job_selector, fields):
+    from src.scrapers.browser_pool import get_tab_pool, get_tab_settings
+    from src.scrapers.selenium_scraper import SeleniumScraper
+
+    # LinkedIn scrolls until no new cards appear, which only the
+    # one-page-per-browser path does
+    if source_id != "linkedin" and get_tab_settings()["enabled"]:
+        with tracer.start_as_current_span("browser.tab", attributes={"url.full": url}):
+            return get_tab_pool().submit(url, scroll_count, source_id, block, job_selector, fields).result()
+
+    scraper = SeleniumScraper(headless=True, block=block)
+    scraper.source_id = source_id
+    try:
+        return scraper.scrape_page(url, job_selector, fields, scroll_count=scroll_count, source_id=source_id)
+    finally:
+        scraper.close()
+
+
+def _scrape_api(api_url, data_mapping, source_id):
+    from src.scrapers.api_scraper import APIScraper
+
+    return APIScraper().scrape_jobs(api_url=api_url, data_mapping=data_mapping, source_id=source_id)
+
+
+# Runs in the cpu pool's processes, so it returns its own timing and parse
+# cache hits for the parent to record
+def _parse_static(html, job_selector, fields):
+    from src.scrapers.parse_cache import empty_stats
+    from src.scrapers.static_scraper import parse_static_jobs
+
+    started = time.perf_counter()
+    stats = empty_stats()
+    jobs = parse_static_jobs(html, job_selector, fields, stats=stats)
+    return jobs, time.perf_counter() - started, stats
+
+
+def submit_source(src_id, src, keyword, priority=BATCH, page=0) -> Future:
+    """
+    Schedule the scrape of one configured source.
+
+    `page` > 0 scrapes a later result page of a source with a `pagination`
+    config; the jobs' url stays the first page's, so fingerprints do not
+    depend on the page a posting was found on.
+
+    Returns:
+        Future: resolves to the list of scraped job dicts, with source (and,
+        for page sources, url) filled in
+    """
+    source_type = src["type"]
+    resource_class = SOURCE_CLASSES.get(source_type)
+    if resource_class is None:
+        raise ValueError(f"Unknown source type {source_type!r} for source {src_id}")
+
+    # Parent of the fetch, retry, browser and parse spans of the source's tasks;
+    # ends when its jobs are ready
+    span = tracer.start_span("scrape.source", attributes={"talenttrek.source": src_id,
+                                                          "talenttrek.source_type": source_type,
+                                                          "talenttrek.page": page})
+    source_context = trace.set_span_in_context(span)
+    token = otel_context.attach(source_context)
+    try:
+        if source_type == "api":
+            api_url = page_url(src["api_url"].replace("{keyword}", keyword), src.get("pagination"), page)
+            logger.info(f"API scraping URL: {api_url}")
+            scraped = get_executor("io").submit(_scrape_api, api_url, src["data_mapping"], src_id, priority=priority)
+            url = None
+        else:
+            url = src["search_url"].replace("{keyword}", keyword)
+            selectors = src["selectors"]
+            fields = {k: v for k, v in selectors.items() if k != "job_selector"}
+            fetch_url = page_url(url, src.get("pagination"), page)
+            if source_type == "static":
+                logger.info(f"Static scraping URL: {fetch_url}")
+                fetched = get_executor("io").submit(_fetch_static, fetch_url, src_id, priority=priority)
+                parsed = _then(fetched, lambda html: ([], 0.0, None) if html is None else get_executor("cpu").submit(
+                    _parse_static, html, selectors["job_selector"], fields, priority=priority))
+            else:
+                # Cards are extracted inside the browser, so there is no page to parse
+                logger.info(f"Dynamic scraping URL: {fetch_url}")
+                parsed = get_executor("browser").submit(_scrape_dynamic, fetch_url, src.get("scroll_count", 3), src_id,
+                                                        source_block(src), selectors["job_selector"], fields,
+                                                        priority=priority)
+
+            def record(outcome):
+                jobs, seconds, stats = outcome
+                labels = source_labels(src_id, source_type)
+                attributes = {"talenttrek.jobs": len(jobs)}
+                if stats:
+                    attributes["talenttrek.cards_reused"] = stats["card_hit"]
+                    record_parse_cache_stats(labels, stats)
+                if seconds:
+                    SCRAPE_PARSE_DURATION.labels(**labels).observe(seconds)
+                    record_span("scrape.parse", seconds, context=source_context, attributes=attributes)
+                SCRAPE_JOBS.labels(**labels).inc(len(jobs))
+                return jobs
+
+            scraped = _then(parsed, record)
+    except BaseException as e:
+        _end_span(span, e)
+        raise
+    finally:
+        otel_context.detach(token)
+
+    def label(jobs):
+        for job in jobs:
+            job["source"] = src["name"]
+            if url is not None:
+                job["url"] = url
+        return jobs
+
+    labelled = _then(scraped, label)
+    labelled.add_done_callback(lambda done: _end_span(span, done.exception()))
+    return labelled
+
+
+def _end_span(span, error=None):
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(trace.StatusCode.ERROR)
+    span.end()
+
+
+def scrape_sources(sources, source_ids, keyword, priority=BATCH):
+    """
+    Scrape several sources concurrently, each on its resource class.
+
+    A source that fails or cannot be queued is logged and skipped.
+
+    Returns:
+        list: (source config, scraped jobs) pairs, in source_ids order
+    """
+    pending = []
+    for src_id in source_ids:
+        src = sources.get(src_id)
+        if not src:
+            logger.warning(f"Source id not found: {src_id}")
+            continue
+        logger.info(f"Scraping source: {src['name']} ({src_id})")
+        try:
+            pending.append((src, submit_source(src_id, src, keyword, priority=priority)))
+        except (SchedulerFull, ValueError) as e:
+            logger.error(f"Could not schedule source {src_id}: {e}")
+
+    results = []
+    for src, future in pending:
+        try:
+            results.append((src, future.result()))
+        except Exception:
+            logger.exception(f"Scraping source {src['id']} failed")
+    return results
@@ -2,151 +2,396 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import json
 import time
 import os
 from dotenv import load_dotenv
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.blocking import (
+    apply_blocking,
+    blocked_url_patterns,
+    get_selenium_settings,
+    network_usage,
+    source_block,
+)
+from src.scrapers.browser_sessions import (
+    SITES,
+    CookieJar,
+    get_session_settings,
+    is_login_page,
+    login_lock,
+    restore_session,
+    save_session,
+)
+from src.scrapers.parse_cache import empty_stats, parse_cached, record_parse_cache_stats
 from src.utils.logger import get_logger
 from src.utils.helpers import random_delay
+from src.utils.metrics import (
+    BROWSER_BLOCKED_REQUESTS,
+    BROWSER_LIFETIME,
+    BROWSER_LOGINS,
+    BROWSER_NETWORK_BYTES,
+    BROWSERS_ACTIVE,
+    SCRAPE_BYTES,
+    SCRAPE_FETCH_DURATION,
+    SCRAPE_FETCHES,
+    SCRAPE_JOBS,
+    SCRAPE_PARSE_DURATION,
+    status_class,
+)
+from src.utils.tracing import record_span, tracer
 
 logger = get_logger(__name__)
 
+# Runs in the page with (job_selector, fields) and returns one {field: text}
+# object per card. Text is collected like BeautifulSoup's get_text(strip=True):
+# every text node outside scripts, styles and templates trimmed, empty ones
+# dropped, the rest joined without spaces.
+# LinkedIn titles repeat themselves for screen readers, so only the
+# aria-hidden copy is used.
+EXTRACT_JOBS_SCRIPT = """
+const [jobSelector, fields] = arguments;
+const skipped = new Set(["SCRIPT", "STYLE", "TEMPLATE"]);
+function text(node) {
+  if (!node) return null;
+  const parts = [];
+  const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+  for (let current = walker.nextNode(); current; current = walker.nextNode()) {
+    if (skipped.has(current.parentNode.nodeName)) continue;
+    const value = current.nodeValue.trim();
+    if (value) parts.push(value);
+  }
+  return parts.join("");
+}
+return Array.from(document.querySelectorAll(jobSelector), card => {
+  const job = {};
+  for (const [name, selector] of Object.entries(fields)) {
+    let target = card.querySelector(selector);
+    if (target && name === "title" && selector === ".artdeco-entity-lockup__title a") {
+      target = target.querySelector('span[aria-hidden="true"]') || target;
+    }
+    job[name] = text(target);
+  }
+  return job;
+});
+"""
+
 
 class SeleniumScraper(BaseScraper):
-    def __init__(self, headless=True, proxies=None, max_retries=3, delay_range=(1, 3)):
+    source_type = "dynamic"
+
+    def __init__(self, headless=True, proxies=None, max_retries=3, delay_range=(1, 3), block=None):
+        """
+        Start Chrome. `block` is the resource blocking config of the source to
+        scrape (see src.scrapers.blocking); None uses the settings.yaml defaults.
+        """
         load_dotenv()
         super().__init__(proxies, max_retries, delay_range)
+        settings = get_selenium_settings()
+        self.track_network = settings["track_network"]
         chrome_options = Options()
+        # "eager" returns from driver.get() once the DOM is ready instead of
+        # waiting for every subresource
+        chrome_options.page_load_strategy = settings["page_load_strategy"]
+        if self.track_network:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         if headless:
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--remote-debugging-port=9222")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 
-        # Use webdriver-manager to install and set up the right chromedriver
-        try:
-            chromedriver_dir = os.path.dirname(ChromeDriverManager().install())
-            logger.info(f"ChromeDriver directory: {chromedriver_dir}")
-            chromedriver_path = os.path.join(chromedriver_dir, "chromedriver")
+        with tracer.start_as_current_span("browser.start"):
+            # Use webdriver-manager to install and set up the right chromedriver
+            try:
+                chromedriver_dir = os.path.dirname(ChromeDriverManager().install())
+                logger.info("ChromeDriver directory: %s", chromedriver_dir)
+                chromedriver_path = os.path.join(chromedriver_dir, "chromedriver")
             
-            if not os.path.exists(chromedriver_path):
-                logger.error(f"ChromeDriver binary not found at: {chromedriver_path}")
-                raise FileNotFoundError(f"ChromeDriver not found at {chromedriver_path}")
+                if not os.path.exists(chromedriver_path):
+                    logger.error("ChromeDriver binary not found at: %s", chromedriver_path)
+                    raise FileNotFoundError(f"ChromeDriver not found at {chromedriver_path}")
             
-            logger.info(f"Using ChromeDriver: {chromedriver_path}")
-            try:
-                os.chmod(chromedriver_path, 0o755)
-            except Exception as e:
-                logger.warning(f"Could not set executable permissions: {e}")
+                logger.info("Using ChromeDriver: %s", chromedriver_path)
+                try:
+                    os.chmod(chromedriver_path, 0o755)
+                except Exception as e:
+                    logger.warning("Could not set executable permissions: %s", e)
             
-            self.driver = webdriver.Chrome(
-                service=Service(chromedriver_path),
-                options=chrome_options
-            )
-        except Exception as e:
-            logger.error(f"Failed to initialize Chrome driver: {e}")
-            # Fallback: try without specifying the path
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                logger.info("Chrome driver initialized with fallback method")
-            except Exception as fallback_error:
-                logger.error(f"Fallback Chrome driver initialization also failed: {fallback_error}")
-                raise
+                self.driver = webdriver.Chrome(
+                    service=Service(chromedriver_path),
+                    options=chrome_options
+                )
+            except Exception as e:
+                logger.error("Failed to initialize Chrome driver: %s", e)
+                # Fallback: try without specifying the path
+                try:
+                    self.driver = webdriver.Chrome(options=chrome_options)
+                    logger.info("Chrome driver initialized with fallback method")
+                except Exception as fallback_error:
+                    logger.error("Fallback Chrome driver initialization also failed: %s", fallback_error)
+                    raise
+            patterns = blocked_url_patterns(block if block is not None else source_block(settings=settings))
+            if patterns:
+                try:
+                    apply_blocking(self.driver, patterns)
+                    logger.info("Blocking %s URL patterns in Chrome", len(patterns))
+                except WebDriverException as e:
+                    logger.warning("Could not enable request blocking: %s", e)
+        # Sites this browser is signed in to
+        self._sessions = set()
+        self.started_at = time.perf_counter()
+        BROWSERS_ACTIVE.inc()
 
     def login_linkedin(self):
+        """Log in with LINKEDIN_EMAIL / LINKEDIN_PASSWORD; returns whether it worked."""
         email = os.environ.get('LINKEDIN_EMAIL')
         password = os.environ.get('LINKEDIN_PASSWORD')
         if not email or not password:
-            print("LinkedIn credentials not set in environment variables.")
+            logger.warning("LinkedIn credentials not set in environment variables.")
             return False
-        print("Logging in to LinkedIn...")
+        logger.info("Logging in to LinkedIn...")
         self.driver.get("https://www.linkedin.com/login")
         try:
             self.driver.find_element("id", "username").send_keys(email)
             self.driver.find_element("id", "password").send_keys(password)
             self.driver.find_element("xpath", "//button[@type='submit']").click()
-            time.sleep(5)  # Wait for login to complete
-            print("LinkedIn login attempted.")
-            return True
-        except Exception as e:
-            print("LinkedIn login failed:", e)
+            # Done once LinkedIn redirects away from the login form
+            WebDriverWait(self.driver, 15).until(lambda driver: not is_login_page("linkedin", driver.current_url))
+        except WebDriverException as e:
+            logger.error("LinkedIn login failed: %s", e)
             return False
+        logger.info("LinkedIn login succeeded.")
+        return True
 
-    def scrape_jobs(self, url, job_selector, fields, scroll_count=3, source_id=None):
-        # If scraping LinkedIn, perform login first
-        if source_id == 'linkedin':
-            self.login_linkedin()
-        logger.info(f"Opening dynamic page: {url}")
+    def ensure_session(self, site, force_login=False):
+        """
+        Sign this browser in to `site` (a key of browser_sessions.SITES).
+
+        Uses the site's saved session when it is still valid, otherwise logs
+        in with login_<site>() and saves the new session for other browsers.
+        force_login drops the saved session first, for when the site rejected it.
+        """
+        if site in self._sessions and not force_login:
+            return True
+        settings = get_session_settings()
+        with login_lock(site):
+            jar = CookieJar(site)
+            if force_login:
+                jar.discard()
+            elif settings["enabled"] and restore_session(self.driver, site, jar):
+                BROWSER_LOGINS.labels(site=site, result="restored").inc()
+                self._sessions.add(site)
+                return True
+            if not getattr(self, f"login_{site}")():
+                BROWSER_LOGINS.labels(site=site, result="failed").inc()
+                return False
+            BROWSER_LOGINS.labels(site=site, result="login").inc()
+            if settings["enabled"]:
+                save_session(self.driver, site, jar)
+            self._sessions.add(site)
+            return True
+
+    def open_page(self, url, scroll_count=3, source_id=None) -> bool:
+        """Open and scroll a listing page so its cards are rendered; False on failure."""
+        if source_id:
+            self.source_id = source_id
+        site = source_id if source_id in SITES else None
+        if site:
+            self.ensure_session(site)
+        logger.info("Opening dynamic page: %s", url)
+        if self.track_network:
+            self._drain_network_log()
+        started = time.perf_counter()
         try:
-            self.driver.get(url)
-            time.sleep(3)  # wait for initial content
-
-            if source_id == 'linkedin':
-                max_attempts = 15
-                attempts = 0
-                last_height = self.driver.execute_script("return document.body.scrollHeight")
-                while attempts < max_attempts:
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    new_height = self.driver.execute_script("return document.body.scrollHeight")
-                    if new_height == last_height:
-                        attempts += 1
-                    else:
-                        attempts = 0
-                        last_height = new_height
-                logger.debug(f"Dynamic scroll for LinkedIn completed after {max_attempts} attempts or no new content.")
-            else:
-                for i in range(scroll_count):
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    random_delay(self.delay_range)
-                    logger.debug(f"Scrolled page {i + 1}/{scroll_count} times.")
+            with tracer.start_as_current_span("browser.navigate", attributes={"url.full": url}):
+                self.driver.get(url)
+                if site and is_login_page(site, self.driver.current_url):
+                    logger.info("%s rejected the saved session; logging in again", site)
+                    if self.ensure_session(site, force_login=True):
+                        self.driver.get(url)
+                time.sleep(3)  # wait for initial content
+            with tracer.start_as_current_span("browser.scroll"):
+                if source_id == 'linkedin':
+                    max_attempts = 15
+                    attempts = 0
+                    last_height = self.driver.execute_script("return document.body.scrollHeight")
+                    while attempts < max_attempts:
+                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                        time.sleep(2)
+                        new_height = self.driver.execute_script("return document.body.scrollHeight")
+                        if new_height == last_height:
+                            attempts += 1
+                        else:
+                            attempts = 0
+                            last_height = new_height
+                    logger.debug("Dynamic scroll for LinkedIn completed after %s attempts or no new content.",
+                                 max_attempts)
+                else:
+                    for i in range(scroll_count):
+                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                        random_delay(self.delay_range)
+                        logger.debug("Scrolled page %s/%s times.", i + 1, scroll_count)
+
+            if self.track_network:
+                self._record_network_usage(url)
+            SCRAPE_FETCHES.labels(**self.metric_labels(), status_class=status_class(200)).inc()
+            return True
 
+        except WebDriverException as e:
+            SCRAPE_FETCHES.labels(**self.metric_labels(), status_class=status_class(None)).inc()
+            logger.error("Selenium error: %s", e)
+            return False
+        finally:
+            # Includes the waits and scrolling needed to load the listings
+            SCRAPE_FETCH_DURATION.labels(**self.metric_labels()).observe(time.perf_counter() - started)
+
+    def load_page(self, url, scroll_count=3, source_id=None):
+        """Open and scroll a listing page; returns the rendered HTML, or None on failure."""
+        if not self.open_page(url, scroll_count=scroll_count, source_id=source_id):
+            return None
+        try:
             page_source = self.driver.page_source
+        except WebDriverException as e:
+            logger.error("Selenium error: %s", e)
+            return None
+        SCRAPE_BYTES.labels(**self.metric_labels()).inc(len(page_source.encode("utf-8")))
+        return page_source
 
-            soup = BeautifulSoup(page_source, "html.parser")
-            job_elements = soup.select(job_selector)
-            jobs = []
-
-            logger.info(f"Found {len(job_elements)} jobs on dynamic page.")
-
-            for idx, elem in enumerate(job_elements):
-                job_data = {}
-                for field_name, selector in fields.items():
-                    target = elem.select_one(selector)
-                    # Special handling for LinkedIn job title to avoid duplicate text
-                    if field_name == "title" and selector == ".artdeco-entity-lockup__title a":
-                        if target:
-                            span = target.find("span", attrs={"aria-hidden": "true"})
-                            job_data[field_name] = span.get_text(strip=True) if span else target.get_text(strip=True)
-                        else:
-                            job_data[field_name] = None
-                    else:
-                        job_data[field_name] = target.get_text(strip=True) if target else None
-                # Remove title from start of company if present
-                if job_data.get('company') and job_data.get('title'):
-                    company = job_data['company']
-                    title = job_data['title']
-                    if company.startswith(title):
-                        job_data['company'] = company[len(title):].strip()
-                jobs.append(job_data)
-                logger.debug(f"[{idx + 1}] Job scraped: {job_data}")
-
-            logger.info(f"Scraped {len(jobs)} job postings from dynamic page: {url}")
-            return jobs
+    def extract_jobs(self, job_selector, fields):
+        """
+        Job dicts of the open page, extracted by one script run in the browser.
+
+        Gives the same values as parse_dynamic_jobs on the page's HTML, but only
+        the extracted fields cross the WebDriver connection.
+        """
+        jobs = self.driver.execute_script(EXTRACT_JOBS_SCRIPT, job_selector, fields)
+        SCRAPE_BYTES.labels(**self.metric_labels()).inc(len(json.dumps(jobs).encode("utf-8")))
+        return [clean_dynamic_job(job) for job in jobs]
+
+    def scrape_page(self, url, job_selector, fields, scroll_count=3, source_id=None):
+        """
+        Open a listing page and extract its jobs in the browser.
+
+        Falls back to fetching page_source and parsing it in Python if the
+        extraction script fails.
 
+        Returns:
+            tuple: (jobs, extraction seconds, parse cache stats or None);
+            ([], 0.0, None) if the page could not be loaded
+        """
+        if not self.open_page(url, scroll_count=scroll_count, source_id=source_id):
+            return [], 0.0, None
+        return self.extract_or_parse(job_selector, fields)
+
+    def extract_or_parse(self, job_selector, fields):
+        """Jobs of the open page: extract_jobs, or parse_dynamic_jobs on its page_source if that fails."""
+        started = time.perf_counter()
+        try:
+            with tracer.start_as_current_span("browser.extract"):
+                jobs = self.extract_jobs(job_selector, fields)
+            return jobs, time.perf_counter() - started, None
         except WebDriverException as e:
-            logger.error(f"Selenium error: {e}")
+            logger.warning("In-browser extraction failed, parsing the page source instead: %s", e)
+        try:
+            page_source = self.driver.page_source
+        except WebDriverException as e:
+            logger.error("Selenium error: %s", e)
+            return [], 0.0, None
+        SCRAPE_BYTES.labels(**self.metric_labels()).inc(len(page_source.encode("utf-8")))
+        started = time.perf_counter()
+        stats = empty_stats()
+        jobs = parse_dynamic_jobs(page_source, job_selector, fields, stats=stats)
+        return jobs, time.perf_counter() - started, stats
+
+    def _drain_network_log(self):
+        """Chrome performance log entries since the last call (reading empties the log)."""
+        try:
+            return self.driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug("Could not read the Chrome performance log: %s", e)
             return []
 
+    def _record_network_usage(self, url, log_entries=None):
+        usage = network_usage(self._drain_network_log() if log_entries is None else log_entries)
+        labels = self.metric_labels()
+        BROWSER_NETWORK_BYTES.labels(**labels).inc(usage["bytes"])
+        for resource_type, count in usage["blocked"].items():
+            BROWSER_BLOCKED_REQUESTS.labels(**labels, resource_type=resource_type).inc(count)
+        blocked = sum(usage["blocked"].values())
+        logger.info("Loaded %s: %s requests, %s KB downloaded, %s requests blocked", url, usage["requests"],
+                    round(usage["bytes"] / 1024, 1), blocked,
+                    extra={"source": self.source_id, "network_bytes": usage["bytes"], "blocked_requests": blocked})
+        return usage
+
+    def scrape_jobs(self, url, job_selector, fields, scroll_count=3, source_id=None):
+        jobs, parse_seconds, stats = self.scrape_page(url, job_selector, fields, scroll_count=scroll_count,
+                                                      source_id=source_id)
+        if not parse_seconds:
+            return jobs
+        SCRAPE_PARSE_DURATION.labels(**self.metric_labels()).observe(parse_seconds)
+        attributes = {"talenttrek.jobs": len(jobs)}
+        if stats:
+            attributes["talenttrek.cards_reused"] = stats["card_hit"]
+            record_parse_cache_stats(self.metric_labels(), stats)
+        record_span("scrape.parse", parse_seconds, attributes=attributes)
+        SCRAPE_JOBS.labels(**self.metric_labels()).inc(len(jobs))
+        logger.info("Scraped %s job postings from dynamic page: %s", len(jobs), url,
+                    extra={"source": self.source_id, "jobs": len(jobs)})
+        return jobs
+
     def close(self):
         logger.info("Closing Selenium WebDriver.")
-        self.driver.quit()
+        try:
+            self.driver.quit()
+        finally:
+            BROWSER_LIFETIME.observe(time.perf_counter() - self.started_at)
+            BROWSERS_ACTIVE.dec()
+
+
+def parse_dynamic_jobs(page_source, job_selector, fields, stats=None):
+    """
+    Extract job dicts from the rendered HTML of a dynamic listing page.
+
+    Unchanged pages and cards reuse earlier results (see
+    src.scrapers.parse_cache); pass a `stats` dict to get the hit counts.
+    """
+    jobs = parse_cached(page_source, job_selector, fields, extract_dynamic_job, "dynamic", stats=stats)
+    logger.info("Found %s jobs on dynamic page.", len(jobs))
+    return jobs
+
+
+def clean_dynamic_job(job_data):
+    """Remove the title from the start of the company, where some boards repeat it."""
+    if job_data.get('company') and job_data.get('title'):
+        company = job_data['company']
+        title = job_data['title']
+        if company.startswith(title):
+            job_data['company'] = company[len(title):].strip()
+    return job_data
+
+
+def extract_dynamic_job(elem, fields):
+    """Field values of one job card."""
+    job_data = {}
+    for field_name, selector in fields.items():
+        target = elem.select_one(selector)
+        # Special handling for LinkedIn job title to avoid duplicate text
+        if field_name == "title" and selector == ".artdeco-entity-lockup__title a":
+            if target:
+                span = target.find("span", attrs={"aria-hidden": "true"})
+                job_data[field_name] = span.get_text(strip=True) if span else target.get_text(strip=True)
+            else:
+                job_data[field_name] = None
+        else:
+            job_data[field_name] = target.get_text(strip=True) if target else None
+    clean_dynamic_job(job_data)
+    logger.debug("Job scraped: %s", job_data)
+    return job_data
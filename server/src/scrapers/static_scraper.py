@@ -1,68 +1,97 @@
-from bs4 import BeautifulSoup
+import time
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.parse_cache import empty_stats, parse_cached, record_parse_cache_stats
 from src.utils.logger import get_logger
+from src.utils.metrics import SCRAPE_JOBS, SCRAPE_PARSE_DURATION
+from src.utils.tracing import record_span
 
 logger = get_logger(__name__)
 
 
 class StaticScraper(BaseScraper):
+    source_type = "static"
+
     def __init__(self, proxies=None, max_retries=3, delay_range=(1, 3)):
         super().__init__(proxies, max_retries, delay_range)
 
-    def scrape_jobs(self, url, job_selector, fields, headers=None):
-        logger.info(f"Scraping static page: {url}")
+    def fetch_page(self, url, headers=None):
+        """Download a listing page; returns its raw HTML, or None on failure."""
+        logger.info("Scraping static page: %s", url)
         response = self.make_request(url, headers=headers)
         if not response or response.status_code != 200:
-            logger.warning(f"Failed to fetch {url} with status code: {getattr(response, 'status_code', None)}")
-            return []
+            logger.warning("Failed to fetch %s with status code: %s", url, getattr(response, 'status_code', None))
+            return None
+        return response.content
 
+    def scrape_jobs(self, url, job_selector, fields, headers=None):
+        html = self.fetch_page(url, headers=headers)
+        if html is None:
+            return []
+        started = time.perf_counter()
+        stats = empty_stats()
+        jobs = parse_static_jobs(html, job_selector, fields, stats=stats)
+        parse_seconds = time.perf_counter() - started
+        SCRAPE_PARSE_DURATION.labels(**self.metric_labels()).observe(parse_seconds)
+        record_span("scrape.parse", parse_seconds, attributes={"talenttrek.jobs": len(jobs),
+                                                               "talenttrek.cards_reused": stats["card_hit"]})
+        record_parse_cache_stats(self.metric_labels(), stats)
+        SCRAPE_JOBS.labels(**self.metric_labels()).inc(len(jobs))
+        logger.info("Scraped %s job postings from: %s", len(jobs), url,
+                    extra={"source": self.source_id, "jobs": len(jobs)})
+        return jobs
 
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        job_elements = soup.select(job_selector)
-        jobs = []
+def parse_static_jobs(html, job_selector, fields, stats=None):
+    """
+    Extract job dicts from a static listing page.
 
-        logger.info(f"Found {len(job_elements)} jobs on page.")
+    A module-level function so the scrape scheduler can run it on its CPU
+    process pool, apart from the network-bound download. Unchanged pages
+    and cards reuse earlier results (see src.scrapers.parse_cache); pass a
+    `stats` dict to get the hit counts.
+    """
+    jobs = parse_cached(html, job_selector, fields, extract_static_job, "static", stats=stats)
+    logger.info("Found %s jobs on page.", len(jobs))
+    return jobs
 
-        for idx, elem in enumerate(job_elements):
-            job_data = {}
-            for field_name, field in fields.items():
-                if field_name == "company" and field == "span.listing-company-name":
-                    target = elem.select_one(field)
-                    company = None
-                    if target:
-                        for child in target.children:
-                            if getattr(child, 'name', None) == 'br':
-                                company = child.next_sibling
-                                if company:
-                                    company = company.strip()
-                                break
-                        if not company:
-                            company = target.get_text(strip=True)
-                    job_data[field_name] = company
-                elif isinstance(field, dict) and field.get("type") == "multiple":
-                    targets = elem.select(field["selector"])
-                    texts = [t.get_text(strip=True) for t in targets]
-                    job_data[field_name] = texts
-                else:
-                    target = elem.select_one(field)
-                    job_data[field_name] = target.get_text(strip=True) if target else None
 
-            if "employment_type" in job_data and isinstance(job_data["employment_type"], list):
-                salary_text = next(
-                    (t for t in job_data["employment_type"] if "$" in t),
-                    None
-                )
-                job_data["salary"] = salary_text
+def extract_static_job(elem, fields):
+    """Field values of one job card."""
+    job_data = {}
+    for field_name, field in fields.items():
+        if field_name == "company" and field == "span.listing-company-name":
+            target = elem.select_one(field)
+            company = None
+            if target:
+                for child in target.children:
+                    if getattr(child, 'name', None) == 'br':
+                        company = child.next_sibling
+                        if company:
+                            company = company.strip()
+                        break
+                if not company:
+                    company = target.get_text(strip=True)
+            job_data[field_name] = company
+        elif isinstance(field, dict) and field.get("type") == "multiple":
+            targets = elem.select(field["selector"])
+            texts = [t.get_text(strip=True) for t in targets]
+            job_data[field_name] = texts
+        else:
+            target = elem.select_one(field)
+            job_data[field_name] = target.get_text(strip=True) if target else None
 
-            if job_data.get('company') and job_data.get('title'):
-                company = job_data['company']
-                title = job_data['title']
-                if company.startswith(title):
-                    job_data['company'] = company[len(title):].strip()
+    if "employment_type" in job_data and isinstance(job_data["employment_type"], list):
+        salary_text = next(
+            (t for t in job_data["employment_type"] if "$" in t),
+            None
+        )
+        job_data["salary"] = salary_text
 
-            jobs.append(job_data)
-            logger.debug(f"[{idx + 1}] Job scraped: {job_data}")
+    if job_data.get('company') and job_data.get('title'):
+        company = job_data['company']
+        title = job_data['title']
+        if company.startswith(title):
+            job_data['company'] = company[len(title):].strip()
 
-        logger.info(f"Scraped {len(jobs)} job postings from: {url}")
-        return jobs
+    logger.debug("Job scraped: %s", job_data)
+    return job_data
@@ -1,7 +1,11 @@
 import os
-from supabase import create_client, Client
+import threading
+from typing import TYPE_CHECKING
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = get_logger(__name__)
 
 class SupabaseConfig:
@@ -17,19 +21,34 @@ class SupabaseConfig:
         if self.url and self.anon_key:
             self.use_supabase_auth = os.getenv("USE_SUPABASE_AUTH", "false").lower() == "true"
         
-        self.client: Client = None
-        self._initialize_client()
+        # The supabase package is slow to import and creating the client can
+        # block on a misconfigured project, so both wait until first use
+        self._client = None
+        self._client_initialized = False
+        self._client_lock = threading.Lock()
+        if not self.url or not self.anon_key:
+            logger.info("Supabase URL or anon key not provided. Supabase features will be disabled.")
+            self.use_supabase_auth = False
+    
+    @property
+    def client(self) -> "Client":
+        if not self._client_initialized:
+            with self._client_lock:
+                if not self._client_initialized:
+                    self._initialize_client()
+                    self._client_initialized = True
+        return self._client
     
     def _initialize_client(self):
         """Initialize Supabase client."""
         if not self.url or not self.anon_key:
-            logger.info("Supabase URL or anon key not provided. Supabase features will be disabled.")
-            self.use_supabase_auth = False
             return
         
         try:
+            from supabase import create_client
+            
             # Use the basic create_client method
-            self.client = create_client(self.url, self.anon_key)
+            self._client = create_client(self.url, self.anon_key)
             logger.info("Supabase client initialized successfully")
             if self.use_supabase_auth:
                 logger.info("Supabase Auth is ENABLED - using Supabase authentication")
@@ -37,16 +56,18 @@ class SupabaseConfig:
                 logger.info("Supabase Auth is DISABLED - using local JWT authentication")
         except Exception as e:
             logger.error(f"Failed to initialize Supabase client: {e}")
-            self.client = None
+            self._client = None
             self.use_supabase_auth = False
     
-    def get_client(self) -> Client:
+    def get_client(self) -> "Client":
         """Get the Supabase client instance."""
         return self.client
     
     def is_configured(self) -> bool:
         """Check if Supabase is properly configured."""
-        return self.client is not None and self.url and self.anon_key
+        # Checked before touching the client so an unconfigured project never
+        # imports the supabase package
+        return bool(self.url and self.anon_key) and self.client is not None
     
     def use_supabase_auth_enabled(self) -> bool:
         """Check if Supabase Auth should be used instead of local auth."""
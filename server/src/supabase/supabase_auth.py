@@ -1,10 +1,12 @@
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import Client
 from src.supabase.supabase import supabase_config
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = get_logger(__name__)
 
 security = HTTPBearer()
@@ -13,7 +15,14 @@ class SupabaseAuth:
     """Supabase authentication utilities."""
     
     def __init__(self):
-        self.client: Optional[Client] = supabase_config.get_client()
+        self._client: Optional["Client"] = None
+    
+    @property
+    def client(self) -> Optional["Client"]:
+        """The shared Supabase client, created on first use."""
+        if self._client is None:
+            self._client = supabase_config.get_client()
+        return self._client
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify a Supabase JWT token."""
@@ -0,0 +1,120 @@
+import gzip
+import zlib
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional, gzip is always available
+    zstandard = None
+
+logger = get_logger(__name__)
+
+# Header bytes prefixed to compressed payloads. Uncompressed JSON always starts
+# with '[', '{' or whitespace, so rows written before compression existed are
+# recognised by the absence of a header and read back unchanged.
+HEADER_GZIP = b"\x01"
+HEADER_ZSTD = b"\x02"
+
+CODEC_HEADERS = {"gzip": HEADER_GZIP, "zstd": HEADER_ZSTD}
+HEADER_CODECS = {header: codec for codec, header in CODEC_HEADERS.items()}
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def get_report_compression():
+    """Return (codec, min_bytes) for report payloads from settings.yaml."""
+    reports_config = (get_config() or {}).get("reports") or {}
+    codec = str(reports_config.get("compression", "none")).lower()
+    min_bytes = int(reports_config.get("compression_min_bytes", 1024))
+    if codec == "zstd" and zstandard is None:
+        logger.warning("zstandard is not installed, falling back to gzip for report payloads")
+        codec = "gzip"
+    if codec not in CODEC_HEADERS:
+        codec = "none"
+    return codec, min_bytes
+
+
+def compress_payload(text, codec="gzip", min_bytes=0):
+    """
+    Encode a text payload for storage.
+
+    Payloads smaller than min_bytes, or with codec "none", are stored as plain
+    UTF-8 without a header.
+    """
+    raw = text.encode("utf-8") if isinstance(text, str) else bytes(text)
+    if codec == "none" or len(raw) < min_bytes:
+        return raw
+    if codec == "gzip":
+        return HEADER_GZIP + gzip.compress(raw, compresslevel=6)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requested but zstandard is not installed")
+        return HEADER_ZSTD + zstandard.ZstdCompressor(level=6).compress(raw)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def payload_codec(data):
+    """Return the codec a stored payload was written with, or None if uncompressed."""
+    if not data or isinstance(data, str):
+        return None
+    return HEADER_CODECS.get(bytes(data[:1]))
+
+
+def decompress_payload(data):
+    """Decode a stored payload (compressed or legacy plain text) back to text."""
+    if data is None:
+        return None
+    if isinstance(data, str):
+        return data
+    data = bytes(data)
+    codec = payload_codec(data)
+    if codec == "gzip":
+        return gzip.decompress(data[1:]).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data[1:]).decode("utf-8")
+    return data.decode("utf-8")
+
+
+def iter_decompressed(data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the decoded payload as UTF-8 byte chunks without building the whole string."""
+    if data is None:
+        return
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data = bytes(data)
+    codec = payload_codec(data)
+    if codec is None:
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset:offset + chunk_size]
+        return
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif zstandard is not None:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        raise RuntimeError("Payload is zstd-compressed but zstandard is not installed")
+    body = memoryview(data)[1:]
+    for offset in range(0, len(body), chunk_size):
+        chunk = decompressor.decompress(body[offset:offset + chunk_size])
+        if chunk:
+            yield chunk
+    if codec == "gzip":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def accepts_encoding(accept_encoding, codec):
+    """Check whether an Accept-Encoding header value allows the given codec."""
+    if not accept_encoding or not codec:
+        return False
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() != codec:
+            continue
+        params = params.replace(" ", "")
+        return params not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
@@ -2,6 +2,7 @@ import random
 import time
 import yaml
 import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 
 def random_delay(delay_range=(1, 3)):
@@ -9,8 +10,29 @@ def random_delay(delay_range=(1, 3)):
     time.sleep(delay)
 
 def load_sources_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "sources.yaml")
+    # SOURCES_CONFIG_PATH points the scrapers at another sources file, e.g.
+    # local stand-in job boards for load tests
+    config_path = os.getenv("SOURCES_CONFIG_PATH") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "sources.yaml")
     with open(config_path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
     # Return as dict by id for easy lookup
     return {src['id']: src for src in data['sources']}
+
+
+def page_url(url, pagination, page):
+    """
+    URL of result page `page` (0-based) of a listing or API search.
+
+    `pagination` is a source's pagination config from sources.yaml:
+    {"param": query parameter, "start": value for the first page,
+    "step": increment per page}. The first page is the URL as configured.
+    """
+    if not page or not pagination:
+        return url
+    value = pagination.get("start", 1) + page * pagination.get("step", 1)
+    parts = urlsplit(url)
+    query = [(key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True)
+             if key != pagination["param"]]
+    query.append((pagination["param"], str(value)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
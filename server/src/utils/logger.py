@@ -1,12 +1,140 @@
+"""
+Central logging setup, configured from the `logging` section of settings.yaml.
+
+Records are put on a queue by the thread that logs them and written by a
+QueueListener thread, so formatting output and writing to the stream never
+hold up a request or a scrape. The message itself (msg % args) is rendered
+before the hand-off, and only for records that pass the level check, so
+pass values as arguments instead of building f-strings:
+
+    logger.debug("Job scraped: %s", job_data)
+
+Output is one JSON object per line by default (format: json), with any
+`extra={...}` fields and the current trace and span ids alongside the
+message; format: text gives the plain "[time] [LEVEL] name: message" lines.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, timezone
+
+from opentelemetry import trace
+
+from src.utils.config import get_config
+
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+
+# Chatty below WARNING; kept there whatever the configured level
+QUIET_LOGGERS = ("urllib3", "httpx", "httpcore", "selenium", "WDM", "matplotlib", "PIL", "filelock")
+
+# Standard LogRecord attributes; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener = None
+_handler = None
+_setup_lock = threading.Lock()
+
+
+def get_logging_settings() -> dict:
+    """Logging options from the `logging` section of settings.yaml."""
+    logging_config = (get_config() or {}).get("logging") or {}
+    return {
+        "level": str(logging_config.get("level", "INFO")).upper(),
+        "format": logging_config.get("format", "json"),
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and extra fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for the listener thread.
+
+    Renders the message and traceback on the logging thread (arguments may
+    change once the call returns) but leaves output formatting to the
+    listener's handler.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            record.trace_id = format(span_context.trace_id, "032x")
+            record.span_id = format(span_context.span_id, "016x")
+        return record
+
+
+def setup_logging():
+    """
+    Route all logging through a queue to a stderr handler, at the configured level.
+
+    Runs once per process; get_logger() calls it, so importing any module
+    that logs is enough.
+    """
+    global _handler, _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+        settings = get_logging_settings()
+        stream = logging.StreamHandler()
+        stream.setFormatter(JsonFormatter() if settings["format"] == "json" else logging.Formatter(TEXT_FORMAT))
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        _handler = LogQueueHandler(log_queue)
+        root.addHandler(_handler)
+        root.setLevel(settings["level"])
+        quiet_level = max(logging.WARNING, root.level)
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(quiet_level)
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread."""
+    global _handler, _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+        if _handler is not None:
+            logging.getLogger().removeHandler(_handler)
+            _handler = None
+    if listener is not None:
+        listener.stop()
 
 
 def get_logger(name=__name__):
-    logger = logging.getLogger(name)
-    if not logger.hasHandlers():
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
+    setup_logging()
+    return logging.getLogger(name)
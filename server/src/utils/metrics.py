@@ -0,0 +1,125 @@
+"""
+Prometheus metrics for the API and the scrape pipeline, served at /metrics.
+
+Labels are limited to low-cardinality values: route templates (never raw
+paths), source ids from sources.yaml, source types and HTTP status classes
+("2xx", "4xx", ...), so a scrape of /metrics stays small and cheap.
+"""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+# Latency buckets in seconds; scrapes and browser sessions get longer ones
+API_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+BROWSER_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1800)
+
+HTTP_REQUESTS = Counter(
+    "talenttrek_http_requests_total", "API requests handled", ["method", "route", "status_class"])
+HTTP_REQUEST_DURATION = Histogram(
+    "talenttrek_http_request_duration_seconds", "API request latency", ["method", "route"],
+    buckets=API_BUCKETS)
+
+SCRAPE_FETCHES = Counter(
+    "talenttrek_scrape_fetches_total", "Page and API fetch attempts by outcome",
+    ["source", "type", "status_class"])
+SCRAPE_FETCH_DURATION = Histogram(
+    "talenttrek_scrape_fetch_duration_seconds", "Network time of one fetch attempt",
+    ["source", "type"], buckets=FETCH_BUCKETS)
+SCRAPE_RETRIES = Counter(
+    "talenttrek_scrape_retries_total", "Fetch attempts that were retried", ["source", "type"])
+SCRAPE_BYTES = Counter(
+    "talenttrek_scrape_downloaded_bytes_total", "Bytes of pages and API responses downloaded",
+    ["source", "type"])
+SCRAPE_PARSE_DURATION = Histogram(
+    "talenttrek_scrape_parse_duration_seconds", "Time to extract jobs from one page", ["source", "type"],
+    buckets=PARSE_BUCKETS)
+SCRAPE_JOBS = Counter(
+    "talenttrek_scrape_jobs_extracted_total", "Jobs extracted from pages and API responses",
+    ["source", "type"])
+SCRAPE_PARSE_CACHE = Counter(
+    "talenttrek_scrape_parse_cache_total", "Pages and job cards looked up in the parse cache (hit = not re-parsed)",
+    ["source", "type", "level", "result"])
+
+BROWSER_LIFETIME = Histogram(
+    "talenttrek_selenium_browser_lifetime_seconds", "How long each Selenium browser ran",
+    buckets=BROWSER_BUCKETS)
+BROWSERS_ACTIVE = Gauge("talenttrek_selenium_browsers_active", "Selenium browsers currently running")
+BROWSER_LOGINS = Counter(
+    "talenttrek_selenium_logins_total", "Browser sign-ins by outcome (restored = saved session reused)",
+    ["site", "result"])
+BROWSER_TABS_OPEN = Gauge("talenttrek_selenium_tabs_open", "Tabs loading pages in multi-tab browsers")
+BROWSER_MEMORY = Gauge(
+    "talenttrek_selenium_browser_memory_bytes", "Resident memory of each multi-tab Chrome, all processes",
+    ["browser"])
+BROWSER_NETWORK_BYTES = Counter(
+    "talenttrek_selenium_network_bytes_total", "Bytes Chrome downloaded for dynamic pages, subresources included",
+    ["source", "type"])
+BROWSER_BLOCKED_REQUESTS = Counter(
+    "talenttrek_selenium_blocked_requests_total", "Browser requests blocked by resource type",
+    ["source", "type", "resource_type"])
+
+CACHE_REQUESTS = Counter(
+    "talenttrek_cache_requests_total", "Lookups in application caches", ["cache", "result"])
+
+
+def status_class(status_code) -> str:
+    """'2xx', '4xx', ... for an HTTP status, 'error' when there was no response."""
+    return f"{status_code // 100}xx" if status_code else "error"
+
+
+def source_labels(source_id, source_type):
+    return {"source": source_id or "unknown", "type": source_type or "unknown"}
+
+
+class _RuntimeCollector:
+    """Values read at scrape time: DB pool, scrape executors and parse caches."""
+
+    def describe(self):
+        # Keeps registration from calling collect() while the app is still importing
+        return []
+
+    def collect(self):
+        # Imported here: these modules import this one
+        from src.analysis.statistics import parse_salary_text
+        from src.analysis.trends import _parse_text
+        from src.data.database import engine_pool_status
+        from src.scrapers.scheduler import scheduler_metrics
+
+        pool = GaugeMetricFamily("talenttrek_db_pool_connections", "Database pool connections by state",
+                                 labels=["state"])
+        for state, value in engine_pool_status().items():
+            pool.add_metric([state], value)
+        yield pool
+
+        queued = GaugeMetricFamily("talenttrek_scheduler_queued_tasks", "Tasks waiting per scrape executor",
+                                   labels=["resource_class"])
+        running = GaugeMetricFamily("talenttrek_scheduler_running_tasks", "Tasks running per scrape executor",
+                                    labels=["resource_class"])
+        waited = GaugeMetricFamily("talenttrek_scheduler_wait_seconds_avg",
+                                   "Mean time tasks waited in the queue", labels=["resource_class"])
+        for name, stats in scheduler_metrics().items():
+            queued.add_metric([name], stats["queued"])
+            running.add_metric([name], stats["running"])
+            waited.add_metric([name], stats["wait_seconds_avg"])
+        yield queued
+        yield running
+        yield waited
+
+        # functools caches keep their own counters
+        lookups = CounterMetricFamily("talenttrek_parse_cache_requests", "Lookups in the text parse caches",
+                                      labels=["cache", "result"])
+        for cache, function in (("salary_text", parse_salary_text), ("date_text", _parse_text)):
+            info = function.cache_info()
+            lookups.add_metric([cache, "hit"], info.hits)
+            lookups.add_metric([cache, "miss"], info.misses)
+        yield lookups
+
+
+REGISTRY.register(_RuntimeCollector())
+
+
+def metrics_payload():
+    """(body, content type) of the current metrics in the Prometheus text format."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
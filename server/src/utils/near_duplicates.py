@@ -0,0 +1,310 @@
+import glob
+import os
+import re
+import threading
+import time
+import uuid
+import zlib
+import numpy as np
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 4
+DEFAULT_INDEX_DIR = os.path.join("data_output", "processed", "near_duplicates")
+# Version of the posting fingerprints (src.data.job_store.fingerprint_job) the
+# index is keyed on; segments of another version are skipped, and an index
+# left empty is rebuilt from job_postings
+KEY_VERSION = 2
+
+
+def get_dedup_settings():
+    """Near-duplicate settings from the `deduplication` section of settings.yaml."""
+    dedup_config = (get_config() or {}).get("deduplication") or {}
+    return {
+        "enabled": bool(dedup_config.get("near_duplicates", True)),
+        "threshold": float(dedup_config.get("similarity_threshold", DEFAULT_THRESHOLD)),
+        "num_perm": int(dedup_config.get("num_perm", DEFAULT_NUM_PERM)),
+        "index_dir": dedup_config.get("index_dir", DEFAULT_INDEX_DIR),
+    }
+
+
+# Abbreviations expanded before comparison, so "Sr. Python Dev" matches "Senior Python Developer"
+ABBREVIATIONS = {
+    "sr": "senior", "jr": "junior", "snr": "senior", "jnr": "junior",
+    "dev": "developer", "eng": "engineer", "mgr": "manager", "swe": "software engineer",
+}
+# Legal suffixes dropped from company names ("Acme Corp." == "Acme Corporation")
+COMPANY_SUFFIXES = {"inc", "corp", "corporation", "co", "company", "llc", "ltd", "limited", "gmbh", "plc", "sa", "ag"}
+# Tokens that make two otherwise similar titles different roles
+SENIORITY_TOKENS = {
+    "intern", "junior", "associate", "mid", "senior", "staff", "principal", "lead", "head",
+    "director", "vp", "chief", "i", "ii", "iii", "iv",
+}
+
+
+def _tokens(value) -> list:
+    text = re.sub(r"[^\w\s]", " ", str(value or "").lower())
+    return [ABBREVIATIONS.get(token, token) for token in text.split()]
+
+
+def job_text(job: dict) -> str:
+    """Text a posting is compared on: title, company and location, normalized."""
+    title = _tokens(job.get("title"))
+    company = [token for token in _tokens(job.get("company")) if token not in COMPANY_SUFFIXES]
+    location = _tokens(job.get("location"))
+    return " ".join(" ".join(title + company + location).split())
+
+
+def job_guard(job: dict) -> str:
+    """Seniority tokens of the title; near-duplicates must agree on them exactly."""
+    return " ".join(sorted(set(_tokens(job.get("title"))) & SENIORITY_TOKENS))
+
+
+def shingle(text: str, size=DEFAULT_SHINGLE_SIZE) -> np.ndarray:
+    """Hash every character n-gram of the text into a unique uint64 array."""
+    if len(text) <= size:
+        grams = [text] if text else []
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+
+def optimal_bands(threshold, num_perm, false_positive_weight=0.5):
+    """
+    Pick the (bands, rows) LSH split whose S-curve best separates pairs above
+    and below the similarity threshold, weighting false positives and false
+    negatives as given.
+    """
+    similarities = np.linspace(0.0, 1.0, 201)
+    below = similarities < threshold
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        probability = 1.0 - (1.0 - similarities ** rows) ** bands
+        false_positive = np.trapz(np.where(below, probability, 0.0), similarities)
+        false_negative = np.trapz(np.where(below, 0.0, 1.0 - probability), similarities)
+        error = false_positive_weight * false_positive + (1 - false_positive_weight) * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over job postings using MinHash signatures and LSH banding.
+
+    A query only hashes its own signature into the band tables and compares
+    against the keys that share a bucket, so lookup cost does not grow with the
+    size of the indexed corpus. Entries added since the last save are written
+    as a new segment file, so persisting the index is incremental as well, and
+    refresh() picks up the segments other processes have written since.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._tables = [dict() for _ in range(self.bands)]
+        self._signatures = {}
+        self._guards = {}
+        self._pending = []
+        # Segment files already loaded or written, and the index directory's
+        # modification time when it was last scanned
+        self._segments = set()
+        self._scanned_mtime = None
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingle(text, self.shingle_size)
+        if hashes.size == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key, text=None, signature=None, guard=""):
+        """
+        Add a key to the index; re-inserting an existing key is a no-op.
+
+        The guard is an exact-match string checked after the LSH lookup, for
+        differences that matter more than their share of the text.
+        """
+        if key in self._signatures:
+            return
+        if signature is None:
+            signature = self.signature(text)
+        self._signatures[key] = signature
+        self._guards[key] = guard
+        for band, band_key in self._band_keys(signature):
+            self._tables[band].setdefault(band_key, []).append(key)
+        self._pending.append(key)
+
+    def remove(self, keys):
+        """Drop keys from the index, e.g. those inserted for a write that was rolled back."""
+        keys = [key for key in keys if key in self._signatures]
+        for key in keys:
+            signature = self._signatures.pop(key)
+            del self._guards[key]
+            for band, band_key in self._band_keys(signature):
+                bucket = self._tables[band][band_key]
+                bucket.remove(key)
+                if not bucket:
+                    del self._tables[band][band_key]
+        if keys:
+            removed = set(keys)
+            self._pending = [key for key in self._pending if key not in removed]
+
+    def query(self, text=None, signature=None, threshold=None, guard=""):
+        """
+        Find indexed keys similar to the text whose guard matches.
+
+        Returns:
+            list: (key, estimated Jaccard similarity) pairs at or above the
+            threshold, most similar first
+        """
+        if signature is None:
+            signature = self.signature(text)
+        threshold = self.threshold if threshold is None else threshold
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._tables[band].get(band_key, ()))
+        matches = []
+        for key in candidates:
+            if self._guards[key] != guard:
+                continue
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def save(self, index_dir, keys=None):
+        """
+        Write entries added since the last save as a new segment in index_dir.
+
+        With `keys`, only those entries are written (and no longer count as
+        unsaved), e.g. the ones of a write that has been committed.
+        """
+        keys = list(self._pending) if keys is None else [key for key in keys if key in self._signatures]
+        if not keys:
+            return None
+        os.makedirs(index_dir, exist_ok=True)
+        # Unique per process and save, so concurrent writers never pick the same
+        # name; written under a name refresh() ignores and renamed into place
+        name = f"segment-{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.npz"
+        path = os.path.join(index_dir, name)
+        temporary = os.path.join(index_dir, f".{name}.tmp")
+        with open(temporary, "wb") as f:
+            np.savez_compressed(
+                f,
+                keys=np.array(keys),
+                guards=np.array([self._guards[key] for key in keys]),
+                signatures=np.stack([self._signatures[key] for key in keys]),
+                params=np.array([self.num_perm, self.shingle_size, self.seed, KEY_VERSION]),
+            )
+        os.replace(temporary, path)
+        self._segments.add(name)
+        saved = set(keys)
+        self._pending = [key for key in self._pending if key not in saved]
+        logger.info(f"Saved {len(keys)} near-duplicate signatures to {path}")
+        return path
+
+    def refresh(self, index_dir) -> int:
+        """
+        Load the segments in index_dir that are not loaded yet, such as those
+        saved by other processes; the directory is only scanned when its
+        modification time has changed.
+
+        Returns:
+            int: number of entries added
+        """
+        try:
+            mtime = os.stat(index_dir).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+        if mtime == self._scanned_mtime:
+            return 0
+        self._scanned_mtime = mtime
+        before = len(self)
+        # Loaded entries are saved already; keep them out of the unsaved ones
+        pending, self._pending = self._pending, []
+        try:
+            for path in sorted(glob.glob(os.path.join(index_dir, "segment-*.npz"))):
+                name = os.path.basename(path)
+                if name in self._segments:
+                    continue
+                self._segments.add(name)
+                with np.load(path) as segment:
+                    if tuple(segment["params"]) != (self.num_perm, self.shingle_size, self.seed, KEY_VERSION):
+                        logger.warning(f"Skipping near-duplicate segment with different parameters: {path}")
+                        continue
+                    for key, guard, signature in zip(segment["keys"].tolist(), segment["guards"].tolist(),
+                                                     segment["signatures"]):
+                        self.insert(key, signature=signature, guard=guard)
+        finally:
+            self._pending = pending
+        return len(self) - before
+
+    @classmethod
+    def load(cls, index_dir, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM):
+        """Load every segment in index_dir; returns an empty index if there are none."""
+        index = cls(threshold=threshold, num_perm=num_perm)
+        index.refresh(index_dir)
+        return index
+
+
+_index = None
+# Guards the shared index; scrape requests run on FastAPI's worker threads
+index_lock = threading.RLock()
+
+
+def get_near_duplicate_index(session=None):
+    """
+    Return the process-wide index, loading it from disk on first use.
+
+    If nothing has been saved yet but job_postings already has rows, the index
+    is rebuilt from the database once and persisted.
+    """
+    global _index
+    with index_lock:
+        if _index is None:
+            _index = _load_index(session)
+    return _index
+
+
+def _load_index(session):
+    settings = get_dedup_settings()
+    index = MinHashLSH.load(settings["index_dir"], threshold=settings["threshold"], num_perm=settings["num_perm"])
+    if len(index) == 0 and session is not None:
+        from src.data.models import JobPosting
+
+        query = session.query(JobPosting.fingerprint, JobPosting.title, JobPosting.company, JobPosting.location)
+        for fingerprint, title, company, location in query.yield_per(5000):
+            job = {"title": title, "company": company, "location": location}
+            index.insert(fingerprint, job_text(job), guard=job_guard(job))
+        if len(index):
+            logger.info(f"Rebuilt near-duplicate index from {len(index)} stored postings")
+            index.save(settings["index_dir"])
+    return index
@@ -9,7 +9,7 @@ def normalize_title(title: str) -> str:
         return ""
     title = title.strip().lower()
     title = re.sub(r'[^\w\s]', '', title)
-    return title
+    return re.sub(r'\s+', ' ', title).strip()
 
 
 def clean_job_posting(job: dict) -> dict:
@@ -20,7 +20,7 @@ def clean_job_posting(job: dict) -> dict:
                'date_posted': job.get('date_posted', '').strip() if job.get('date_posted') else None,
                'description': job.get('description', '').strip() if job.get('description') else None,
                'url': job.get('url', '').strip() if job.get('url') else None}
-    logger.debug(f"Cleaned job: {cleaned}")
+    logger.debug("Cleaned job: %s", cleaned)
     return cleaned
 
 
@@ -34,3 +34,4 @@ def deduplicate_jobs(jobs: list) -> list:
             unique_jobs.append(job)
     logger.info(f"Deduplicated jobs: {len(jobs)} -> {len(unique_jobs)}")
     return unique_jobs
+
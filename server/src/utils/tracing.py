@@ -0,0 +1,164 @@
+"""
+OpenTelemetry tracing of API requests and scrapes.
+
+Spans follow the OpenTelemetry conventions: a SERVER span per API request,
+a CLIENT span per HTTP fetch attempt (named after the method, with
+url.full, http.response.status_code, http.request.resend_count), plus
+internal spans for the scrape stages:
+
+    scrape.source     one configured source, from scheduling to labelled jobs
+    scrape.backoff    sleep before retrying a failed fetch
+    scrape.delay      politeness delay after a successful fetch
+    browser.start     Chrome and chromedriver startup
+    browser.navigate  page load and the wait for initial content
+    browser.scroll    scrolling for more listings
+    scrape.parse      BeautifulSoup / JSON extraction of the jobs
+    scrape.dedupe     near-duplicate matching before storage
+    db.upsert, db.commit
+
+Nothing needs a collector: finished spans go to a JSON-lines file or the
+console (`tracing` section of settings.yaml). Until setup_tracing() runs,
+`tracer` is OpenTelemetry's no-op tracer, so instrumented code costs next
+to nothing with tracing off.
+
+With tracing on, a request sent with `X-Debug-Timing: 1` gets a
+Server-Timing header summing its spans by name, e.g.
+    Server-Timing: GET;dur=812.4;desc="x3", scrape.parse;dur=35.1, total;dur=905.2
+Stages of concurrently scraped sources overlap, so they can add up to
+more than `total`.
+"""
+
+import os
+import re
+import threading
+import time
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+
+from src.utils.config import get_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEBUG_TIMING_HEADER = "X-Debug-Timing"
+
+# A proxy: real spans once setup_tracing() has installed a provider
+tracer = trace.get_tracer("talenttrek")
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_tracing_settings() -> dict:
+    """Tracing options from the `tracing` section of settings.yaml."""
+    tracing_config = (get_config() or {}).get("tracing") or {}
+    return {
+        "enabled": bool(tracing_config.get("enabled", False)),
+        "exporter": tracing_config.get("exporter", "file"),
+        "path": tracing_config.get("path", "data_output/traces/spans.jsonl"),
+        "service_name": tracing_config.get("service_name", "talenttrek-api"),
+    }
+
+
+class TimingCollector(SpanProcessor):
+    """Keeps the finished spans of traces that asked for a timing breakdown."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._traces = {}
+
+    def start(self, trace_id):
+        with self._lock:
+            self._traces[trace_id] = []
+
+    def finish(self, trace_id) -> list:
+        """The finished spans of a trace; stops collecting it."""
+        with self._lock:
+            return self._traces.pop(trace_id, [])
+
+    def on_end(self, span):
+        with self._lock:
+            spans = self._traces.get(span.context.trace_id)
+            if spans is not None:
+                spans.append(span)
+
+
+timing_collector = TimingCollector()
+
+
+def _settings_exporter(settings):
+    if settings["exporter"] == "console":
+        return ConsoleSpanExporter()
+    os.makedirs(os.path.dirname(os.path.abspath(settings["path"])), exist_ok=True)
+    out = open(settings["path"], "a", buffering=1)
+    return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + os.linesep)
+
+
+def setup_tracing(exporter=None):
+    """
+    Install the tracer provider, exporting to `exporter` (synchronously) or,
+    by default, to the exporter configured in settings.yaml (in batches).
+
+    May be called again to add exporters; the provider is created once.
+    """
+    global _provider
+    settings = get_tracing_settings()
+    with _provider_lock:
+        if _provider is None:
+            _provider = TracerProvider(resource=Resource.create({"service.name": settings["service_name"]}))
+            _provider.add_span_processor(timing_collector)
+            trace.set_tracer_provider(_provider)
+        if exporter is not None:
+            _provider.add_span_processor(SimpleSpanProcessor(exporter))
+        else:
+            _provider.add_span_processor(BatchSpanProcessor(_settings_exporter(settings)))
+            logger.info(f"Tracing enabled, exporting spans to {settings['exporter']}"
+                        + (f" ({settings['path']})" if settings["exporter"] == "file" else ""))
+    return _provider
+
+
+def tracing_enabled() -> bool:
+    return _provider is not None
+
+
+def shutdown_tracing():
+    """Flush and stop the exporters."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def record_span(name, seconds, context=None, attributes=None):
+    """
+    Add a span for work timed elsewhere, ending now and lasting `seconds`.
+
+    For stages that run in another process (the scheduler's parse pool),
+    where spans cannot reach this process's exporters.
+    """
+    if not tracing_enabled():
+        return
+    end = time.time_ns()
+    span = tracer.start_span(name, context=context, attributes=attributes, start_time=end - int(seconds * 1e9))
+    span.end(end_time=end)
+
+
+def _token(name):
+    # Server-Timing metric names are HTTP tokens
+    return re.sub(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]", "_", name)
+
+
+def server_timing(spans, root_span_id, total_seconds) -> str:
+    """Server-Timing header value summing the durations of a trace's spans by name."""
+    by_name = {}
+    for span in spans:
+        if span.context.span_id == root_span_id or span.end_time is None:
+            continue
+        entry = by_name.setdefault(_token(span.name), [0.0, 0])
+        entry[0] += (span.end_time - span.start_time) / 1e6
+        entry[1] += 1
+    metrics = [f'{name};dur={ms:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+               for name, (ms, count) in sorted(by_name.items(), key=lambda item: -item[1][0])]
+    metrics.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(metrics)
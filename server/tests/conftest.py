@@ -0,0 +1,13 @@
+import pytest
+from src.utils import near_duplicates
+
+
+@pytest.fixture(autouse=True)
+def isolated_near_duplicate_index(tmp_path, monkeypatch):
+    """Give every test a fresh near-duplicate index persisted under tmp_path."""
+    settings = {**near_duplicates.get_dedup_settings(), "index_dir": str(tmp_path / "near_duplicates")}
+    monkeypatch.setattr("src.data.job_store.get_dedup_settings", lambda: settings)
+    monkeypatch.setattr(near_duplicates, "_index", near_duplicates.MinHashLSH(
+        threshold=settings["threshold"], num_perm=settings["num_perm"]
+    ))
+    return near_duplicates._index
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(tmp_path, monkeypatch):
+    # The pipeline writes its report to ./reports; keep it out of the checkout
+    monkeypatch.chdir(tmp_path)
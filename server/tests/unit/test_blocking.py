@@ -0,0 +1,68 @@
+import json
+import re
+
+import pytest
+
+from src.scrapers.blocking import apply_blocking, blocked_url_patterns, network_usage, source_block
+
+SETTINGS = {"block": {"resource_types": ["image", "font"], "url_patterns": ["*doubleclick.net*"]}}
+
+
+def log_entry(method, **params):
+    return {"level": "INFO", "message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def blocks(patterns, url):
+    """Whether Chrome's Network.setBlockedURLs would block url: `*` is the only wildcard, matching the whole URL."""
+    return any(re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) for pattern in patterns)
+
+
+def test_sources_override_the_default_block_config():
+    assert source_block({"id": "board"}, SETTINGS) == SETTINGS["block"]
+    assert source_block({"block": {"resource_types": ["media"]}}, SETTINGS) == \
+        {"resource_types": ["media"], "url_patterns": ["*doubleclick.net*"]}
+    assert blocked_url_patterns(source_block({"block": False}, SETTINGS)) == []
+
+
+def test_block_config_becomes_url_patterns():
+    patterns = blocked_url_patterns({"resource_types": ["font", "font"], "url_patterns": ["*hotjar.com*"]})
+    assert "*.woff2" in patterns and "*.woff2?*" in patterns and "*.png" not in patterns
+    assert patterns[-1] == "*hotjar.com*"
+    assert len(patterns) == len(set(patterns))
+    with pytest.raises(ValueError):
+        blocked_url_patterns({"resource_types": ["video"]})
+
+
+def test_resource_patterns_only_match_path_extensions():
+    patterns = blocked_url_patterns({"resource_types": ["image", "stylesheet"]})
+    assert blocks(patterns, "https://cdn.example.com/logo.png")
+    assert blocks(patterns, "https://cdn.example.com/site.css?v=3")
+    assert not blocks(patterns, "https://x.icons.example/app.js")
+    assert not blocks(patterns, "https://cdn.example.com/css-vars.js")
+    assert not blocks(patterns, "https://api.example.com/jobs?format=svg.json")
+
+
+def test_apply_blocking_sends_cdp_commands():
+    class Driver:
+        commands = []
+
+        def execute_cdp_cmd(self, command, params):
+            self.commands.append((command, params))
+
+    driver = Driver()
+    apply_blocking(driver, ["*.png*"])
+    assert driver.commands == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": ["*.png*"]})]
+
+
+def test_network_usage_counts_bytes_and_blocked_requests():
+    usage = network_usage([
+        log_entry("Network.requestWillBeSent", requestId="1", type="Document"),
+        log_entry("Network.loadingFinished", requestId="1", encodedDataLength=5120),
+        log_entry("Network.loadingFinished", requestId="2", encodedDataLength=1024.0),
+        log_entry("Network.loadingFailed", requestId="3", type="Image", blockedReason="inspector"),
+        log_entry("Network.loadingFailed", requestId="4", type="Image", blockedReason="inspector"),
+        log_entry("Network.loadingFailed", requestId="5", type="Font", blockedReason="inspector"),
+        log_entry("Network.loadingFailed", requestId="6", type="XHR", errorText="net::ERR_ABORTED"),
+        {"level": "INFO", "message": "not json"},
+    ])
+    assert usage == {"requests": 2, "bytes": 6144, "blocked": {"image": 2, "font": 1}}
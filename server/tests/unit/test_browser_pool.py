@@ -0,0 +1,129 @@
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchWindowException
+
+from src.scrapers import browser_pool, selenium_scraper
+from src.scrapers.browser_pool import TabbedBrowser
+from src.scrapers.selenium_scraper import EXTRACT_JOBS_SCRIPT
+
+BLOCK = {"resource_types": ["font"], "url_patterns": []}
+
+
+class FakeChrome:
+    """One WebDriver session with tabs; pages under /never/ stay blank."""
+
+    started = []
+
+    def __init__(self, *args, options=None, **kwargs):
+        self.arguments = list(options.arguments) if options else []
+        self.urls = {"home": "about:blank"}
+        self.current = "home"
+        self.most_tabs = 0
+        self.blocked = {}
+        self.switch_to = self
+        self.service = type("Service", (), {"process": type("Process", (), {"pid": 1})()})()
+        self.started.append(self)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def new_window(self, kind):
+        self.current = f"tab{len(self.blocked)}"
+        self.urls[self.current] = "about:blank"
+        self.most_tabs = max(self.most_tabs, len(self.urls) - 1)
+
+    def window(self, handle):
+        if handle not in self.urls:
+            raise NoSuchWindowException(handle)
+        self.current = handle
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.setBlockedURLs":
+            self.blocked[self.current] = params["urls"]
+
+    def execute_script(self, script, *args):
+        url = self.urls[self.current]
+        if script.startswith("window.location.href"):
+            if "/never/" not in args[0]:
+                self.urls[self.current] = args[0]
+        elif script.startswith("return [document.readyState"):
+            return ["complete", url]
+        elif script == EXTRACT_JOBS_SCRIPT:
+            return [{"title": url}]
+
+    def get_log(self, log_type):
+        return []
+
+    def close(self):
+        del self.urls[self.current]
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def chrome(monkeypatch):
+    def no_driver_manager():
+        raise RuntimeError("offline")
+
+    FakeChrome.started = []
+    monkeypatch.setattr(selenium_scraper, "ChromeDriverManager", no_driver_manager)
+    monkeypatch.setattr(selenium_scraper.webdriver, "Chrome", FakeChrome)
+    return FakeChrome
+
+
+def scrape(browser, urls):
+    futures = [browser.submit(url, 2, "board", BLOCK, "li", {"title": "h2"}) for url in urls]
+    return [future.result(timeout=10) for future in futures]
+
+
+def test_one_browser_renders_pages_in_tabs(chrome):
+    browser = TabbedBrowser("test-tabs", max_tabs=2, settle_seconds=0, delay_range=(0, 0)).start()
+    urls = [f"https://board.example/jobs?page={page}" for page in range(3)]
+    try:
+        results = scrape(browser, urls)
+    finally:
+        browser.shutdown()
+
+    assert [jobs for jobs, _, _ in results] == [[{"title": url}] for url in urls]
+    assert len(chrome.started) == 1
+    driver = chrome.started[0]
+    assert driver.most_tabs == 2
+    assert list(driver.urls) == ["home"]
+    assert all("*.woff" in patterns for patterns in driver.blocked.values())
+    # Pooled browsers run side by side, so none may claim a fixed DevTools port
+    assert not any(argument.startswith("--remote-debugging-port") for argument in driver.arguments)
+
+
+def test_pages_that_never_load_time_out(chrome):
+    browser = TabbedBrowser("test-tabs", max_tabs=2, settle_seconds=0, delay_range=(0, 0),
+                            page_timeout_seconds=0.3).start()
+    try:
+        stuck, loaded = scrape(browser, ["https://board.example/never/", "https://board.example/jobs"])
+    finally:
+        browser.shutdown()
+
+    assert stuck == ([], 0.0, None)
+    assert loaded[0] == [{"title": "https://board.example/jobs"}]
+
+
+def test_browser_over_its_memory_limit_takes_one_page_and_restarts(chrome, monkeypatch):
+    monkeypatch.setattr(browser_pool, "MEMORY_CHECK_SECONDS", 0)
+    monkeypatch.setattr(browser_pool, "process_tree_rss", lambda pid: 4 * 1024 * 1024)
+    browser = TabbedBrowser("test-tabs", max_tabs=3, max_memory_mb=2, settle_seconds=0, delay_range=(0, 0)).start()
+    try:
+        results = scrape(browser, [f"https://board.example/jobs?page={page}" for page in range(3)])
+    finally:
+        browser.shutdown()
+
+    assert all(jobs for jobs, _, _ in results)
+    # An empty browser always takes one page, then a second one would go over the limit
+    assert max(driver.most_tabs for driver in chrome.started) == 1
+    assert len(chrome.started) >= 2
+
+
+def test_process_tree_rss_counts_this_process():
+    rss = browser_pool.process_tree_rss(os.getpid())
+    assert rss is None or rss > 0
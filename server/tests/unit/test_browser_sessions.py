@@ -0,0 +1,136 @@
+import os
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.scrapers import browser_sessions, selenium_scraper
+from src.scrapers.browser_sessions import CookieJar, is_login_page, session_is_valid
+from src.scrapers.selenium_scraper import SeleniumScraper
+
+DAY = 24 * 3600
+
+
+def auth_cookie(expires_in=30 * DAY):
+    return {"name": "li_at", "value": "token", "domain": ".linkedin.com", "expiry": int(time.time() + expires_in)}
+
+
+class FakeLinkedIn:
+    """WebDriver stand-in; `accepted` is the li_at value LinkedIn currently accepts."""
+
+    accepted = "token"
+    logins = 0
+
+    def __init__(self, *args, **kwargs):
+        self.cookies = []
+        self.current_url = "about:blank"
+
+    def get(self, url):
+        signed_in = any(cookie["name"] == "li_at" and cookie["value"] == self.accepted for cookie in self.cookies)
+        self.current_url = url if signed_in or "robots.txt" in url or "/login" in url else \
+            "https://www.linkedin.com/authwall"
+
+    def find_element(self, by, value):
+        driver = self
+
+        class Element:
+            def send_keys(self, text):
+                pass
+
+            def click(self):
+                FakeLinkedIn.logins += 1
+                driver.cookies = [{**auth_cookie(), "value": FakeLinkedIn.accepted}]
+                driver.current_url = "https://www.linkedin.com/feed/"
+
+        return Element()
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def execute_script(self, script, *args):
+        return 0
+
+    def execute_cdp_cmd(self, command, params):
+        pass
+
+    def get_log(self, log_type):
+        return []
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def linkedin(monkeypatch, tmp_path):
+    def no_driver_manager():
+        raise RuntimeError("offline")
+
+    monkeypatch.setenv("LINKEDIN_EMAIL", "scraper@example.com")
+    monkeypatch.setenv("LINKEDIN_PASSWORD", "secret")
+    monkeypatch.setattr(browser_sessions, "get_session_settings",
+                        lambda: {"enabled": True, "dir": str(tmp_path), "min_remaining_minutes": 60})
+    monkeypatch.setattr(selenium_scraper, "ChromeDriverManager", no_driver_manager)
+    monkeypatch.setattr(selenium_scraper, "get_session_settings", browser_sessions.get_session_settings)
+    monkeypatch.setattr(selenium_scraper.webdriver, "Chrome", FakeLinkedIn)
+    monkeypatch.setattr(selenium_scraper.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(selenium_scraper, "random_delay", lambda delay_range: None)
+    monkeypatch.setattr(FakeLinkedIn, "accepted", "token")
+    monkeypatch.setattr(FakeLinkedIn, "logins", 0)
+    return tmp_path
+
+
+def open_search():
+    scraper = SeleniumScraper(delay_range=(0, 0))
+    try:
+        # The scroll loop stops once the page height stops changing
+        assert scraper.open_page("https://www.linkedin.com/jobs/search?keywords=python", source_id="linkedin")
+        return scraper.driver.current_url
+    finally:
+        scraper.close()
+
+
+def logins(result):
+    return REGISTRY.get_sample_value("talenttrek_selenium_logins_total", {"site": "linkedin", "result": result}) or 0
+
+
+def test_cookie_jar_round_trip_is_private(tmp_path):
+    jar = CookieJar("linkedin", str(tmp_path / "sessions"))
+    assert jar.load() is None
+    jar.save([auth_cookie()])
+    assert jar.load()[0]["name"] == "li_at"
+    assert os.stat(jar.path).st_mode & 0o777 == 0o600
+    jar.discard()
+    assert jar.load() is None
+
+
+def test_session_validity():
+    assert session_is_valid("linkedin", [auth_cookie()], min_remaining_minutes=60)
+    assert not session_is_valid("linkedin", [auth_cookie(expires_in=600)], min_remaining_minutes=60)
+    assert not session_is_valid("linkedin", [{"name": "JSESSIONID", "value": "x"}], min_remaining_minutes=0)
+    assert not session_is_valid("linkedin", None)
+    assert is_login_page("linkedin", "https://www.linkedin.com/authwall?trk=x")
+    assert not is_login_page("linkedin", "https://www.linkedin.com/jobs/search")
+
+
+def test_later_browsers_reuse_the_saved_login(linkedin):
+    restored = logins("restored")
+    assert "jobs/search" in open_search()
+    assert FakeLinkedIn.logins == 1
+    assert CookieJar("linkedin", str(linkedin)).load()
+
+    assert "jobs/search" in open_search()
+    assert "jobs/search" in open_search()
+    assert FakeLinkedIn.logins == 1
+    assert logins("restored") == restored + 2
+
+
+def test_rejected_session_logs_in_again(linkedin):
+    open_search()
+    FakeLinkedIn.accepted = "rotated"
+
+    assert "jobs/search" in open_search()
+    assert FakeLinkedIn.logins == 2
+    assert CookieJar("linkedin", str(linkedin)).load()[0]["value"] == "rotated"
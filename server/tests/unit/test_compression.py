@@ -0,0 +1,52 @@
+import json
+import pytest
+from src.data.models import UserReport
+from src.utils.compression import (
+    accepts_encoding,
+    compress_payload,
+    decompress_payload,
+    iter_decompressed,
+    payload_codec,
+    zstandard,
+)
+
+CODECS = ["gzip"] + (["zstd"] if zstandard is not None else [])
+
+
+@pytest.fixture
+def jobs_json():
+    return json.dumps([{"title": f"Python Developer {i}", "description": "Build things. " * 50} for i in range(20)])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip(codec, jobs_json):
+    payload = compress_payload(jobs_json, codec=codec)
+    assert payload_codec(payload) == codec
+    assert len(payload) < len(jobs_json)
+    assert decompress_payload(payload) == jobs_json
+    assert b"".join(iter_decompressed(payload, chunk_size=128)).decode("utf-8") == jobs_json
+
+
+def test_legacy_payloads_are_read_unchanged(jobs_json):
+    assert decompress_payload(jobs_json) == jobs_json
+    assert decompress_payload(jobs_json.encode("utf-8")) == jobs_json
+    assert payload_codec(jobs_json.encode("utf-8")) is None
+
+
+def test_small_payloads_are_not_compressed():
+    assert compress_payload("[]", codec="gzip", min_bytes=1024) == b"[]"
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("br;q=1.0, zstd;q=0.5", "zstd")
+    assert not accepts_encoding("gzip;q=0", "gzip")
+    assert not accepts_encoding("br", "gzip")
+    assert not accepts_encoding(None, "gzip")
+
+
+def test_user_report_decompresses_lazily(jobs_json):
+    report = UserReport(title="Report")
+    report.store_jobs_data(jobs_json, codec="gzip")
+    assert payload_codec(report.jobs_data_raw) == "gzip"
+    assert report.jobs_data == jobs_json
@@ -0,0 +1,104 @@
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.data import job_store
+from src.data.crawl_store import get_crawl_watermark, list_crawl_schedules, save_crawl_schedule
+from src.data.models import Base, CrawlSchedule, JobPosting
+from src.scrapers import crawls
+from src.utils.helpers import page_url
+
+SOURCE = {"id": "board", "name": "Board", "type": "static", "search_url": "https://board.example/jobs?q={keyword}",
+          "selectors": {"job_selector": "li"}, "pagination": {"param": "page", "start": 1, "step": 1}}
+
+
+def posting(number, days_ago):
+    return {"title": f"Role {number}", "company": f"Company {number}", "location": "Remote",
+            "date_posted": f"{days_ago} days ago", "url": "https://board.example/jobs?q=python"}
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(job_store, "get_dedup_settings", lambda: {"enabled": False})
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def board(monkeypatch):
+    """Serves board.pages (a list of job lists) and records the pages requested."""
+
+    class Board:
+        pages = []
+        requested = []
+
+    def submit_source(src_id, src, keyword, priority, page=0):
+        Board.requested.append(page)
+        future = Future()
+        future.set_result([dict(job) for job in Board.pages[page]] if page < len(Board.pages) else [])
+        return future
+
+    monkeypatch.setattr(crawls, "submit_source", submit_source)
+    return Board
+
+
+def test_page_url():
+    pagination = {"param": "start", "start": 0, "step": 50}
+    assert page_url("https://api.example/jobs?keywords=python&count=50", pagination, 0) == \
+        "https://api.example/jobs?keywords=python&count=50"
+    assert page_url("https://api.example/jobs?keywords=python&count=50", pagination, 2) == \
+        "https://api.example/jobs?keywords=python&count=50&start=100"
+    assert page_url("https://board.example/jobs?page=1", {"param": "page"}, 1) == "https://board.example/jobs?page=2"
+    assert page_url("https://board.example/jobs", None, 3) == "https://board.example/jobs"
+
+
+def test_later_crawls_stop_at_known_postings(session_factory, board):
+    session = session_factory()
+    board.pages = [[posting(n, n) for n in range(page * 3, page * 3 + 3)] for page in range(3)]
+    first = crawls.crawl_source(session, SOURCE, "Python", max_pages=10, stop_known_ratio=0.5)
+    assert first == {"pages": 4, "scraped": 9, "inserted": 9, "updated": 0, "stopped": "empty_page"}
+    watermark = get_crawl_watermark(session, "python", "board")
+    assert watermark.pages_fetched == 4
+    assert watermark.newest_fingerprint == job_store.fingerprint_job(posting(0, 0))
+
+    # Two new postings push the listing down by two places
+    board.requested.clear()
+    board.pages = [[posting(100, 0), posting(101, 0), posting(0, 0)],
+                   [posting(1, 1), posting(2, 2), posting(3, 3)],
+                   [posting(4, 4), posting(5, 5), posting(6, 6)]]
+    second = crawls.crawl_source(session, SOURCE, "python", max_pages=10, stop_known_ratio=0.5)
+    assert second["stopped"] == "reached_known"
+    assert board.requested == [0, 1]
+    assert second["inserted"] == 2
+    assert session.query(JobPosting).count() == 11
+
+
+def test_sources_without_pagination_fetch_one_page(session_factory, board):
+    board.pages = [[posting(1, 1)], [posting(2, 2)]]
+    summary = crawls.crawl_source(session_factory(), {**SOURCE, "pagination": None}, "python", max_pages=5)
+    assert summary["pages"] == 1
+    assert board.requested == [0]
+
+
+def test_due_schedules_run_once_per_interval(session_factory, board, monkeypatch):
+    monkeypatch.setattr(crawls, "get_session", session_factory)
+    board.pages = [[posting(1, 1), posting(2, 2)]]
+    session = session_factory()
+    save_crawl_schedule(session, "Python", "board", interval_minutes=60, max_pages=3)
+    save_crawl_schedule(session, "python", "missing", interval_minutes=60, max_pages=3)
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    assert crawls.run_due_crawls(now=now, sources={"board": SOURCE}) == 1
+    assert crawls.run_due_crawls(now=now, sources={"board": SOURCE}) == 0
+
+    by_source = {crawl["source"]: crawl for crawl in list_crawl_schedules(session_factory())}
+    assert by_source["board"]["last_status"] == "ok"
+    assert by_source["board"]["next_run_at"] == now + timedelta(minutes=60)
+    assert by_source["board"]["watermark"]["pages_fetched"] == 2
+    assert by_source["missing"]["last_status"] == "failed"
+    assert session_factory().query(CrawlSchedule).count() == 2
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api import app
+from src.data import export, job_store
+from src.data.export import iter_report_jobs, report_batches, report_column_types, stream_export
+from src.data.job_store import store_scrape_results
+from src.data.models import Base
+from src.utils.compression import compress_payload
+
+PYTHON_ORG = {"id": "python_org", "name": "Python.org", "search_url": "https://www.python.org/jobs/"}
+BOARD = {"id": "board", "name": "Board", "search_url": "https://board.example/jobs"}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(job_store, "get_dedup_settings", lambda: {"enabled": False})
+    monkeypatch.setattr(export, "get_session", factory)
+    session = factory()
+    store_scrape_results(session, [
+        (PYTHON_ORG, [{"title": f"Python Developer {i}", "company": "Acme", "location": "Remote" if i % 2 else "NYC",
+                       "date_posted": "2 days ago"} for i in range(7)]),
+        (BOARD, [{"title": "Go Developer", "company": "Globex", "location": "Remote"}]),
+    ], keyword="python")
+    session.close()
+    return TestClient(app)
+
+
+def test_postings_export_as_csv_with_columns_and_filters(client):
+    response = client.get("/api/jobs/export", params={"columns": "title,source", "location": "remote",
+                                                      "source": "python_org"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="job_postings.csv"' in response.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [["title", "source"]] + [[f"Python Developer {i}", "python_org"] for i in (1, 3, 5)]
+
+
+def test_postings_export_as_parquet_and_arrow(client):
+    parquet = pq.read_table(io.BytesIO(client.get("/api/jobs/export", params={"format": "parquet"}).content))
+    assert parquet.num_rows == 8
+    assert parquet.schema.field("posted_at").type == pa.timestamp("us", tz="UTC")
+    assert parquet.schema.field("id").type == pa.int64()
+
+    response = client.get("/api/jobs/export", params={"format": "arrow", "columns": "id,title", "title": "go"})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["id", "title"]
+    assert table.column("title").to_pylist() == ["Go Developer"]
+
+
+def test_unknown_columns_and_formats_are_rejected(client):
+    assert client.get("/api/jobs/export", params={"columns": "title,password"}).status_code == 400
+    assert client.get("/api/jobs/export", params={"format": "xlsx"}).status_code == 422
+
+
+def test_report_payloads_are_decoded_incrementally():
+    jobs = [{"title": f"Ingénieur données {i}", "source": "LinkedIn" if i % 2 else "Board", "tags": ["a"]}
+            for i in range(50)]
+    text = json.dumps([*jobs[:10], "junk", *jobs[10:]], ensure_ascii=False)
+    for payload in (text.encode("utf-8"), compress_payload(text, codec="gzip")):
+        assert list(iter_report_jobs(payload, chunk_size=7)) == jobs
+    with pytest.raises(ValueError):
+        list(iter_report_jobs(b'{"title": "not a list"}'))
+
+    batches = list(report_batches(compress_payload(text), ["title", "tags"], source="linkedin", batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[0][0] == ("Ingénieur données 1", '["a"]')
+
+
+def test_parquet_export_writes_a_row_group_per_batch():
+    batches = [[("a",), ("b",)], [("c",)], [(None,)]]
+    chunks = list(stream_export(iter(batches), report_column_types(["title"]), "parquet"))
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("title").to_pylist() == ["a", "b", "c", None]
@@ -0,0 +1,112 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data import job_store
+from src.data.models import Base, JobPosting, Source
+from src.data.job_store import fingerprint_job, store_scrape_results, upsert_job_postings
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def source_config():
+    return {
+        "id": "python_org",
+        "name": "Python.org",
+        "type": "static",
+        "search_url": "https://www.python.org/jobs/?q={keyword}",
+    }
+
+
+@pytest.fixture
+def scraped_jobs():
+    return [
+        {"title": "Python Developer", "company": "Company A", "location": "Remote",
+         "url": "https://www.python.org/jobs/", "salary": None},
+        {"title": "Data Engineer", "company": "Company B", "location": "NYC",
+         "url": "https://www.python.org/jobs/", "salary": "$100,000"},
+    ]
+
+
+def test_fingerprint_ignores_formatting_noise():
+    a = {"title": "  PYTHON  Developer!!! ", "company": " Company  A", "location": "Remote",
+         "url": "HTTPS://Example.com/job/1/#apply"}
+    b = {"title": "python developer", "company": "company a", "location": "remote ",
+         "url": "https://example.com/job/1"}
+    assert fingerprint_job(a) == fingerprint_job(b)
+    assert fingerprint_job(a) != fingerprint_job({**b, "location": "NYC"})
+
+
+def test_repeat_scrapes_refresh_instead_of_duplicating(session, source_config, scraped_jobs):
+    first = store_scrape_results(session, [(source_config, scraped_jobs)])
+    assert first == {"inserted": 2, "updated": 0}
+
+    scraped_jobs[0]["salary"] = "$90,000"
+    second = store_scrape_results(session, [(source_config, scraped_jobs)])
+    assert second == {"inserted": 0, "updated": 2}
+
+    assert session.query(Source).count() == 1
+    assert session.query(JobPosting).count() == 2
+    posting = session.query(JobPosting).filter(JobPosting.title == "Python Developer").one()
+    assert posting.salary == "$90,000"
+    assert posting.source_id == session.query(Source).one().id
+
+
+def test_same_posting_under_two_keywords_is_stored_once(session, source_config, monkeypatch):
+    # The fingerprint alone must match, without near-duplicate detection
+    monkeypatch.setattr(job_store, "get_dedup_settings", lambda: {"enabled": False})
+
+    def search(keyword):
+        url = source_config["search_url"].replace("{keyword}", keyword)
+        return [{"title": "Python Developer", "company": "Company A", "location": "Remote", "url": url}]
+
+    store_scrape_results(session, [(source_config, search("python"))], keyword="python")
+    second = store_scrape_results(session, [(source_config, search("django"))], keyword="django")
+
+    assert second == {"inserted": 0, "updated": 1}
+    posting = session.query(JobPosting).one()
+    assert posting.keyword == "python"
+
+
+def test_last_seen_at_is_refreshed(session, scraped_jobs):
+    earlier = datetime.now(timezone.utc) - timedelta(days=1)
+    upsert_job_postings(session, scraped_jobs, seen_at=earlier)
+    upsert_job_postings(session, scraped_jobs[:1])
+    session.commit()
+
+    rows = {row.title: row for row in session.query(JobPosting)}
+    assert rows["Python Developer"].last_seen_at > rows["Data Engineer"].last_seen_at
+    assert rows["Python Developer"].created_at == rows["Data Engineer"].created_at
+
+
+def test_batch_duplicates_and_untitled_jobs_are_collapsed(session, scraped_jobs):
+    summary = upsert_job_postings(session, scraped_jobs + scraped_jobs + [{"title": ""}, {}])
+    session.commit()
+    assert summary["inserted"] == 2
+    assert session.query(JobPosting).count() == 2
+
+
+def test_posted_at_is_parsed_once_against_seen_at(session):
+    seen_at = datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+    jobs = [
+        {"title": "Python Developer", "date_posted": "2 days ago"},
+        {"title": "Data Engineer", "date_posted": "April 10, 2025"},
+        {"title": "QA Engineer", "date_posted": "recently"},
+    ]
+    upsert_job_postings(session, jobs, seen_at=seen_at)
+    # A later scrape resolves "2 days ago" to a later date; the first value is kept
+    upsert_job_postings(session, jobs[:1], seen_at=seen_at + timedelta(days=3))
+    session.commit()
+
+    posted = {row.title: row.posted_at for row in session.query(JobPosting)}
+    assert posted["Python Developer"].replace(tzinfo=None) == datetime(2025, 6, 29, 12)
+    assert posted["Data Engineer"].replace(tzinfo=None) == datetime(2025, 4, 10)
+    assert posted["QA Engineer"] is None
@@ -0,0 +1,79 @@
+import json
+import logging
+import logging.handlers
+import queue
+
+from src.utils.logger import JsonFormatter, LogQueueHandler, setup_logging
+from src.utils.tracing import tracer
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def queued_logger(name):
+    """A logger writing JSON through a LogQueueHandler and its own listener."""
+    log_queue = queue.SimpleQueue()
+    output = ListHandler()
+    output.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, output)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [LogQueueHandler(log_queue)]
+    return logger, listener, output
+
+
+def test_json_lines_carry_extra_fields_and_trace_ids():
+    logger, listener, output = queued_logger("test.logging.json")
+    listener.start()
+    with tracer.start_as_current_span("test.span"):
+        logger.info("Scraped %s job postings", 3, extra={"source": "python_org", "jobs": 3})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Scrape failed")
+    listener.stop()
+
+    first, second = [json.loads(line) for line in output.lines]
+    assert first["message"] == "Scraped 3 job postings"
+    assert first["level"] == "INFO"
+    assert first["logger"] == "test.logging.json"
+    assert first["source"] == "python_org" and first["jobs"] == 3
+    assert second["message"] == "Scrape failed"
+    assert "ValueError: boom" in second["exc_info"]
+
+
+def test_messages_render_at_call_time_and_only_when_enabled():
+    logger, listener, output = queued_logger("test.logging.lazy")
+
+    class Expensive:
+        calls = 0
+
+        def __str__(self):
+            Expensive.calls += 1
+            return "job"
+
+    job = {"title": "Analyst"}
+    logger.info("Job scraped: %s", job)
+    job["title"] = "changed after the call"
+    logger.debug("Job scraped: %s", Expensive())
+    listener.start()
+    listener.stop()
+
+    assert [json.loads(line)["message"] for line in output.lines] == ["Job scraped: {'title': 'Analyst'}"]
+    assert Expensive.calls == 0
+
+
+def test_setup_routes_the_root_logger_through_one_queue():
+    setup_logging()
+    setup_logging()
+    root = logging.getLogger()
+    assert sum(isinstance(handler, LogQueueHandler) for handler in root.handlers) == 1
+    assert root.level == logging.INFO
+    assert logging.getLogger("urllib3").level == logging.WARNING
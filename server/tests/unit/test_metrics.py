@@ -0,0 +1,49 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api import app
+from src.scrapers.static_scraper import StaticScraper
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+
+
+def test_request_metrics_use_route_templates():
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/api/supabase-auth/reports/{report_id}/stats"}
+    before = sample("talenttrek_http_request_duration_seconds_count", **labels)
+    client.get("/api/supabase-auth/reports/41/stats")
+    client.get("/api/supabase-auth/reports/42/stats")
+    assert sample("talenttrek_http_request_duration_seconds_count", **labels) == before + 2
+
+    body = client.get("/metrics").text
+    assert "talenttrek_db_pool_connections" in body
+    assert "/reports/41/" not in body
+
+
+def test_scraper_records_fetches_retries_bytes_and_jobs(monkeypatch):
+    html = b"<ul><li class='job'><h2>Data Engineer</h2></li><li class='job'><h2>Analyst</h2></li></ul>"
+    responses = iter([FakeResponse(503), FakeResponse(200, html)])
+    scraper = StaticScraper(max_retries=2, delay_range=(0, 0))
+    scraper.source_id = "metrics_board"
+    monkeypatch.setattr(scraper.session, "request", lambda **kwargs: next(responses))
+    monkeypatch.setattr("src.scrapers.base_scraper.time.sleep", lambda seconds: None)
+    labels = {"source": "metrics_board", "type": "static"}
+
+    jobs = scraper.scrape_jobs("https://board.example/jobs", "li.job", {"title": "h2"})
+
+    assert len(jobs) == 2
+    assert sample("talenttrek_scrape_fetches_total", **labels, status_class="5xx") == 1
+    assert sample("talenttrek_scrape_fetches_total", **labels, status_class="2xx") == 1
+    assert sample("talenttrek_scrape_retries_total", **labels) == 1
+    assert sample("talenttrek_scrape_downloaded_bytes_total", **labels) == len(html)
+    assert sample("talenttrek_scrape_fetch_duration_seconds_count", **labels) == 2
+    assert sample("talenttrek_scrape_parse_duration_seconds_count", **labels) == 1
+    assert sample("talenttrek_scrape_jobs_extracted_total", **labels) == 2
@@ -0,0 +1,146 @@
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data import job_store
+from src.data.models import Base, JobPosting
+from src.data.job_store import store_scrape_results
+from src.utils.near_duplicates import MinHashLSH, index_lock, job_guard, job_text
+
+
+def index_job(index, key, job):
+    index.insert(key, job_text(job), guard=job_guard(job))
+
+
+@pytest.fixture
+def linkedin_job():
+    return {"title": "Senior Python Developer", "company": "Acme Corp", "location": "Remote"}
+
+
+def test_reworded_posting_is_found(linkedin_job):
+    index = MinHashLSH(threshold=0.8)
+    index_job(index, "linkedin-1", linkedin_job)
+    reworded = {"title": "Sr. Python Developer", "company": "Acme Corporation", "location": "Remote"}
+    matches = index.query(job_text(reworded), guard=job_guard(reworded))
+    assert [key for key, _ in matches] == ["linkedin-1"]
+
+
+def test_different_roles_are_not_matched(linkedin_job):
+    index = MinHashLSH(threshold=0.8)
+    index_job(index, "linkedin-1", linkedin_job)
+    for other in (
+        {"title": "Junior Python Developer", "company": "Acme Corp", "location": "Remote"},
+        {"title": "Senior Python Developer", "company": "Beta Labs", "location": "Remote"},
+        {"title": "Frontend Engineer", "company": "Acme Corp", "location": "Remote"},
+    ):
+        assert index.query(job_text(other), guard=job_guard(other)) == []
+
+
+def test_index_persists_incrementally(tmp_path, linkedin_job):
+    index = MinHashLSH()
+    index_job(index, "a", linkedin_job)
+    first = index.save(tmp_path)
+    assert index.save(tmp_path) is None  # nothing new to write
+
+    index_job(index, "b", {"title": "Data Engineer", "company": "Company B", "location": "NYC"})
+    second = index.save(tmp_path)
+    assert first != second
+
+    reloaded = MinHashLSH.load(tmp_path)
+    assert len(reloaded) == 2
+    assert reloaded.query(job_text(linkedin_job), guard=job_guard(linkedin_job))[0][0] == "a"
+
+
+def test_cross_source_near_duplicates_share_one_row(isolated_near_duplicate_index):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    linkedin = {"id": "linkedin_api", "name": "LinkedIn", "api_url": "https://api.linkedin.com/v2/jobs"}
+    ziprecruiter = {"id": "ziprecruiter", "name": "ZipRecruiter", "search_url": "https://www.ziprecruiter.com/"}
+    store_scrape_results(session, [
+        (linkedin, [{"title": "Senior Python Developer", "company": "Acme Corp", "location": "Remote"}]),
+    ])
+    summary = store_scrape_results(session, [
+        (ziprecruiter, [
+            {"title": "Sr. Python Developer", "company": "Acme Corporation", "location": "Remote",
+             "salary": "$150,000"},
+            {"title": "Junior Python Developer", "company": "Acme Corp", "location": "Remote"},
+        ]),
+    ])
+
+    assert summary == {"inserted": 1, "updated": 1}
+    assert session.query(JobPosting).count() == 2
+    merged = session.query(JobPosting).filter(JobPosting.title == "Senior Python Developer").one()
+    assert merged.salary == "$150,000"
+    session.close()
+
+
+def test_rolled_back_run_leaves_no_index_entries(isolated_near_duplicate_index, monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(job_store, "upsert_job_postings", fail)
+    ziprecruiter = {"id": "ziprecruiter", "name": "ZipRecruiter", "search_url": "https://www.ziprecruiter.com/"}
+    with pytest.raises(RuntimeError):
+        store_scrape_results(session, [(ziprecruiter, [{"title": "Data Engineer", "company": "Company B"}])])
+
+    assert len(isolated_near_duplicate_index) == 0
+    session.close()
+
+
+def test_concurrent_saves_write_separate_segments(tmp_path, linkedin_job):
+    first, second = MinHashLSH(), MinHashLSH()
+    index_job(first, "a", linkedin_job)
+    index_job(second, "b", {"title": "Data Engineer", "company": "Company B", "location": "NYC"})
+
+    assert first.save(tmp_path) != second.save(tmp_path)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".npz", ".npz"]
+    assert len(MinHashLSH.load(tmp_path)) == 2
+
+
+def test_refresh_loads_segments_saved_by_other_processes(tmp_path, linkedin_job):
+    ours, theirs = MinHashLSH(), MinHashLSH()
+    index_job(ours, "a", linkedin_job)
+    ours.save(tmp_path)
+    assert ours.refresh(tmp_path) == 0
+
+    index_job(theirs, "b", {"title": "Data Engineer", "company": "Company B", "location": "NYC"})
+    theirs.save(tmp_path)
+
+    assert ours.refresh(tmp_path) == 1
+    assert "b" in ours
+    # Loaded entries are not written out again as this index's own
+    assert ours.save(tmp_path) is None
+
+
+def test_index_lock_is_released_during_upsert(isolated_near_duplicate_index, monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    upsert = job_store.upsert_job_postings
+    lock_free = []
+
+    def checked_upsert(*args, **kwargs):
+        def probe():
+            acquired = index_lock.acquire(blocking=False)
+            if acquired:
+                index_lock.release()
+            lock_free.append(acquired)
+
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return upsert(*args, **kwargs)
+
+    monkeypatch.setattr(job_store, "upsert_job_postings", checked_upsert)
+    ziprecruiter = {"id": "ziprecruiter", "name": "ZipRecruiter", "search_url": "https://www.ziprecruiter.com/"}
+    store_scrape_results(session, [(ziprecruiter, [{"title": "Data Engineer", "company": "Company B"}])])
+
+    assert lock_free == [True]
+    assert len(isolated_near_duplicate_index) == 1
+    session.close()
@@ -0,0 +1,102 @@
+from prometheus_client import REGISTRY
+
+from src.scrapers import parse_cache
+from src.scrapers.parse_cache import empty_stats, parse_cached, record_parse_cache_stats
+from src.scrapers.static_scraper import extract_static_job, parse_static_jobs
+
+FIELDS = {"title": "h2", "company": "span.co"}
+
+
+def listing(*cards):
+    items = "".join(f"<li class='job'><h2>{title}</h2><span class='co'>{company}</span></li>"
+                    for title, company in cards)
+    return f"<html><body><p>rendered at {len(cards)}</p><ul>{items}</ul></body></html>"
+
+
+def counting_extract():
+    calls = []
+
+    def extract(elem, fields):
+        calls.append(elem.select_one("h2").get_text())
+        return extract_static_job(elem, fields)
+
+    return extract, calls
+
+
+def test_unchanged_page_is_not_parsed_again():
+    parse_cache.clear_parse_caches()
+    extract, calls = counting_extract()
+    html = listing(("Data Engineer", "Acme"), ("Analyst", "Globex"))
+    first = parse_cached(html, "li.job", FIELDS, extract, "test")
+    stats = empty_stats()
+    second = parse_cached(html, "li.job", FIELDS, extract, "test", stats=stats)
+
+    assert second == first == [{"title": "Data Engineer", "company": "Acme"},
+                               {"title": "Analyst", "company": "Globex"}]
+    assert calls == ["Data Engineer", "Analyst"]
+    assert stats == {"page_hit": 1, "page_miss": 0, "card_hit": 0, "card_miss": 0}
+    # Callers get copies they can label
+    second[0]["source"] = "Board"
+    assert "source" not in parse_cached(html, "li.job", FIELDS, extract, "test")[0]
+
+
+def test_page_with_the_same_cards_is_not_extracted_again():
+    parse_cache.clear_parse_caches()
+    extract, calls = counting_extract()
+    cards = (("Data Engineer", "Acme"), ("Analyst", "Globex"))
+    first = parse_cached(listing(*cards).replace("rendered at", "token=a1"), "li.job", FIELDS, extract, "test")
+    stats = empty_stats()
+    second = parse_cached(listing(*cards).replace("rendered at", "token=b2"), "li.job", FIELDS, extract, "test",
+                          stats=stats)
+
+    assert second == first
+    assert calls == ["Data Engineer", "Analyst"]
+    assert stats == {"page_hit": 1, "page_miss": 0, "card_hit": 0, "card_miss": 0}
+
+
+def test_page_with_the_same_cards_skips_the_full_parse(monkeypatch):
+    parse_cache.clear_parse_caches()
+    extract, _ = counting_extract()
+    cards = (("Data Engineer", "Acme"), ("Analyst", "Globex"))
+    first = parse_cached(listing(*cards).replace("rendered at", "token=a1"), "li.job", FIELDS, extract, "test")
+
+    def no_soup(*args, **kwargs):
+        raise AssertionError("page was parsed with BeautifulSoup")
+
+    monkeypatch.setattr("bs4.BeautifulSoup", no_soup)
+    second = parse_cached(listing(*cards).replace("rendered at", "token=b2"), "li.job", FIELDS, extract, "test")
+    assert second == first
+
+
+def test_changed_page_only_extracts_new_cards():
+    parse_cache.clear_parse_caches()
+    extract, calls = counting_extract()
+    parse_cached(listing(("Data Engineer", "Acme"), ("Analyst", "Globex")), "li.job", FIELDS, extract, "test")
+    calls.clear()
+    stats = empty_stats()
+    jobs = parse_cached(listing(("ML Engineer", "Initech"), ("Data Engineer", "Acme"), ("Analyst", "Globex")),
+                        "li.job", FIELDS, extract, "test", stats=stats)
+
+    assert [job["title"] for job in jobs] == ["ML Engineer", "Data Engineer", "Analyst"]
+    assert calls == ["ML Engineer"]
+    assert stats == {"page_hit": 0, "page_miss": 1, "card_hit": 2, "card_miss": 1}
+
+
+def test_selectors_are_part_of_the_key():
+    parse_cache.clear_parse_caches()
+    html = listing(("Data Engineer", "Acme"))
+    assert parse_static_jobs(html, "li.job", {"title": "h2"}) == [{"title": "Data Engineer"}]
+    assert parse_static_jobs(html, "li.job", {"company": "span.co"}) == [{"company": "Acme"}]
+
+
+def test_hits_are_counted_per_source():
+    labels = {"source": "cache_board", "type": "static"}
+    record_parse_cache_stats(labels, {"page_hit": 1, "page_miss": 1, "card_hit": 4, "card_miss": 0})
+
+    def sample(level, result):
+        return REGISTRY.get_sample_value("talenttrek_scrape_parse_cache_total",
+                                         {**labels, "level": level, "result": result})
+
+    assert sample("page", "hit") == 1
+    assert sample("card", "hit") == 4
+    assert sample("card", "miss") is None
@@ -0,0 +1,27 @@
+import pytest
+from src.utils.processors import clean_job_posting, deduplicate_jobs, normalize_title
+
+
+@pytest.fixture
+def scrape_result():
+    return [
+        {"title": "  PYTHON  DEVELOPER!!!  ", "company": "  Test Co ", "location": " Remote ",
+         "salary": None, "date_posted": "today", "description": " A messy job posting. ",
+         "url": " http://example.com/job1 "},
+        {"title": "python developer", "company": "Test Co", "location": "Remote", "salary": "",
+         "date_posted": "today", "description": " Another messy job posting.", "url": "http://example.com/job1"},
+        {"title": "Développeur C++ (Zürich) ", "company": " ", "location": "Zürich"},
+        {"title": "QA Engineer", "company": "Test Co"},
+    ]
+
+
+def test_normalize_title_collapses_whitespace():
+    assert normalize_title("  PYTHON  DEVELOPER!!!  ") == "python developer"
+    assert normalize_title("Développeur C++ (Zürich) ") == "développeur c zürich"
+
+
+def test_cleaned_duplicates_collapse(scrape_result):
+    cleaned = [clean_job_posting(job) for job in scrape_result]
+    assert cleaned[0]["company"] == "Test Co"
+    assert cleaned[1]["salary"] is None
+    assert len(deduplicate_jobs(cleaned)) == 3  # the two "python developer" postings collapse
@@ -0,0 +1,62 @@
+import os
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import app
+from src.api.v1 import actions
+from src.scrapers import scheduler
+from src.utils import profiling
+
+PAYLOAD = {"keyword": "python", "sources": ["python_org"]}
+
+
+def fetch_listing_page():
+    return sum(range(1000))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    monkeypatch.setattr(profiling, "get_profiling_settings", lambda: {"output_dir": str(tmp_path)})
+    monkeypatch.setattr(scheduler, "get_scheduler_quotas", lambda: {
+        "io": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+    })
+
+    def scrape_sources(sources, source_ids, keyword, priority):
+        scheduler.get_executor("io").submit(fetch_listing_page, priority=priority).result(timeout=5)
+        return []
+
+    monkeypatch.setattr(actions, "scrape_sources", scrape_sources)
+    yield TestClient(app)
+    scheduler.shutdown_scheduler()
+
+
+def test_profile_covers_the_endpoint_and_its_scheduler_tasks(client, tmp_path):
+    response = client.post("/api/scrape/jobs", json=PAYLOAD, headers={"X-Profile-Token": "s3cret"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    path = tmp_path / f"{profile_id}.pstats"
+    assert path.exists()
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert "scrape_jobs" in functions
+    # Ran on a scheduler io thread, not the request thread
+    assert "fetch_listing_page" in functions
+
+
+def test_query_parameter_token_works(client, tmp_path):
+    response = client.post("/api/scrape/jobs?profile_token=s3cret", json=PAYLOAD)
+    assert (tmp_path / f"{response.headers['X-Profile-Id']}.pstats").exists()
+
+
+def test_no_profile_without_the_right_token(client, tmp_path, monkeypatch):
+    assert "X-Profile-Id" not in client.post("/api/scrape/jobs", json=PAYLOAD).headers
+    wrong = client.post("/api/scrape/jobs", json=PAYLOAD, headers={"X-Profile-Token": "guess"})
+    assert "X-Profile-Id" not in wrong.headers
+
+    monkeypatch.delenv("PROFILING_TOKEN")
+    unset = client.post("/api/scrape/jobs", json=PAYLOAD, headers={"X-Profile-Token": ""})
+    assert "X-Profile-Id" not in unset.headers
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,192 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from src.analysis import rendering, reports
+from src.utils.compression import compress_payload
+
+STATS = {
+    "total_jobs": 2,
+    "unique_companies": 2,
+    "top_titles": {"Data Engineer": 1, "Analyst": 1},
+    "top_companies": {"Acme": 1, "Globex": 1},
+}
+
+
+def _frames():
+    trends = pd.DataFrame({"date": pd.to_datetime(["2025-01-01", "2025-01-02"]), "job_count": [1, 1]})
+    jobs = pd.DataFrame([{"title": "Data Engineer", "salary": "$100,000 - $120,000"},
+                         {"title": "Analyst", "salary": "$40/hour"}])
+    return trends, jobs
+
+
+def test_cache_key_changes_with_input():
+    trends, jobs = _frames()
+    key = reports.report_cache_key(STATS, trends, jobs, "r.html")
+    assert key == reports.report_cache_key(dict(STATS), trends.copy(), jobs.copy(), "r.html")
+    assert key != reports.report_cache_key({**STATS, "total_jobs": 3}, trends, jobs, "r.html")
+    assert key != reports.report_cache_key(STATS, trends, jobs.head(1), "r.html")
+
+
+def test_render_report_reuses_cached_render(tmp_path, monkeypatch):
+    trends, jobs = _frames()
+    calls = []
+
+    def fake_render(stats, trends_df, jobs_df, report_name, progress):
+        calls.append(report_name)
+        progress("template", 1.0)
+        return "<html>report</html>"
+
+    monkeypatch.setattr(reports, "_render_html", fake_render)
+    cache_dir = tmp_path / "cache"
+    first = reports.render_report(STATS, trends, jobs, "r.html", str(tmp_path / "a"), cache_dir=str(cache_dir))
+    second = reports.render_report(STATS, trends, jobs, "r.html", str(tmp_path / "b"), cache_dir=str(cache_dir))
+
+    assert calls == ["r.html"]
+    assert not first["cache_hit"] and second["cache_hit"]
+    assert "render" not in second["timings"]
+    with open(second["path"], encoding="utf-8") as f:
+        assert f.read() == "<html>report</html>"
+
+
+def test_render_cache_drops_least_recently_used(tmp_path):
+    for age, name in enumerate(["newest", "middle", "oldest"]):
+        path = tmp_path / f"{name}.html"
+        path.write_text("x" * 1024)
+        os.utime(path, (time.time() - age * 60,) * 2)
+
+    assert reports.prune_render_cache(str(tmp_path), max_entries=2, max_mb=1) == 1
+    assert sorted(p.stem for p in tmp_path.iterdir()) == ["middle", "newest"]
+    assert reports.prune_render_cache(str(tmp_path), max_entries=10, max_mb=1.5 / 1024) == 1
+    assert [p.stem for p in tmp_path.iterdir()] == ["newest"]
+
+
+def test_cache_hit_marks_render_used_and_leaves_no_partial_files(tmp_path, monkeypatch):
+    trends, jobs = _frames()
+    monkeypatch.setattr(reports, "_render_html", lambda *args: "<html>report</html>")
+    cache_dir = tmp_path / "cache"
+    first = reports.render_report(STATS, trends, jobs, "r.html", str(tmp_path / "out"), cache_dir=str(cache_dir))
+    cached = cache_dir / f"{first['cache_key']}.html"
+    os.utime(cached, (0, 0))
+
+    reports.render_report(STATS, trends, jobs, "r.html", str(tmp_path / "out"), cache_dir=str(cache_dir))
+    assert cached.stat().st_mtime > 0
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_render_report_draws_charts(tmp_path):
+    trends, jobs = _frames()
+    stages = []
+    result = reports.render_report(STATS, trends, jobs, "full.html", str(tmp_path), cache_dir=False,
+                                   progress=lambda stage, fraction: stages.append((stage, fraction)))
+    with open(result["path"], encoding="utf-8") as f:
+        html = f.read()
+    assert html.count("data:image/png;base64,") == 3
+    assert stages[-1] == ("template", 1.0)
+    assert [fraction for _, fraction in stages] == sorted(fraction for _, fraction in stages)
+
+
+def test_report_escapes_scraped_text():
+    stats = dict(STATS, top_companies={"<img src=x onerror=alert(1)>": 1})
+    html = reports.REPORT_TEMPLATE.render(title="<script>alert(1)</script>", stats=stats,
+                                          tables=[("Top companies", stats["top_companies"])], charts=[])
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "&lt;img src=x onerror=alert(1)&gt;" in html
+
+
+def test_submit_render_runs_on_process_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(rendering, "get_render_settings",
+                        lambda: {"cache_dir": str(tmp_path / "cache"), "render_workers": 1})
+    trends, jobs = _frames()
+    try:
+        job = rendering.submit_render(STATS, trends, jobs, "pooled.html", str(tmp_path), owner=7)
+        job.future.result(timeout=120)
+        deadline = time.time() + 10
+        while job.status != "done" and time.time() < deadline:
+            time.sleep(0.05)
+        status = rendering.get_render_job(job.id).to_dict()
+        assert status["status"] == "done"
+        assert status["progress"] == 1.0
+        assert status["cache_hit"] is False
+        assert set(status["timings"]) == {"hash", "render", "total"}
+
+        # Same input again is served from the cache without the pool
+        cached = rendering.submit_render(STATS, trends, jobs, "pooled.html", str(tmp_path / "again"))
+        assert cached.future is None
+        assert cached.status == "done" and cached.cache_hit
+    finally:
+        rendering.shutdown_render_pool()
+
+
+def test_payload_render_decodes_in_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(rendering, "get_render_settings",
+                        lambda: {"cache_dir": str(tmp_path / "cache"), "render_workers": 1})
+    payload = compress_payload(json.dumps([{"title": "Data Engineer", "date_posted": "2025-01-01",
+                                            "salary": "$100,000"}]), codec="gzip")
+    reference = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    try:
+        job = rendering.submit_payload_render(STATS, payload, reference, "payload.html", str(tmp_path), owner=7)
+        assert job.future is not None
+        assert job.future.result(timeout=120)["cache_hit"] is False
+        with open(tmp_path / "payload.html", encoding="utf-8") as f:
+            html = f.read()
+        # Both charts come from the decoded jobs
+        assert "Jobs posted per day" in html and "Salary distribution" in html
+
+        cached = rendering.submit_payload_render(STATS, payload, reference, "payload.html", str(tmp_path / "again"))
+        assert cached.future is None
+        assert cached.status == "done" and cached.cache_hit
+    finally:
+        rendering.shutdown_render_pool()
+
+
+def test_get_render_job_unknown_id():
+    assert rendering.get_render_job("missing") is None
+
+
+def test_importing_reports_does_not_load_matplotlib():
+    code = "import sys, src.analysis.reports; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_rendered_report_is_served_with_a_restrictive_policy(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from src.api import app
+    from src.data.database import get_db
+    from src.data.models import Base, User
+    from src.supabase.supabase import supabase_config
+    from src.supabase.supabase_auth import supabase_auth
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(email="a@example.com", username="a", hashed_password="x"))
+    session.commit()
+    path = tmp_path / "report.html"
+    path.write_text("<html>report</html>", encoding="utf-8")
+    job = rendering.RenderJob("report.html", owner=1)
+    rendering._finish(job, result={"path": str(path), "cache_hit": False, "timings": {}})
+    rendering._track(job)
+
+    monkeypatch.setattr(supabase_config, "use_supabase_auth_enabled", lambda: True)
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[supabase_auth.get_current_user] = lambda: {"email": "a@example.com"}
+    try:
+        response = TestClient(app).get(f"/api/supabase-auth/render-jobs/{job.id}/html")
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+    assert response.status_code == 200
+    assert response.headers["content-security-policy"].startswith("default-src 'none'")
+    assert response.headers["x-content-type-options"] == "nosniff"
@@ -0,0 +1,97 @@
+import pytest
+from datetime import date, datetime, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from src.api import app
+from src.data.database import get_db
+from src.data.job_store import store_scrape_results, upsert_job_postings
+from src.data.models import Base, JobPosting, JobPostingDailyRollup, SalaryDailyRollup
+from src.data.rollups import query_trends, rebuild_rollups
+
+SEEN_AT = datetime(2025, 7, 10, 12, tzinfo=timezone.utc)
+PYTHON_ORG = {"id": "python_org", "name": "Python.org", "search_url": "https://www.python.org/jobs/"}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database so the rebuild's worker threads share the data
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def store(session, jobs, keyword="Python", seen_at=SEEN_AT):
+    upsert_job_postings(session, jobs, keyword=keyword, seen_at=seen_at)
+    session.commit()
+
+
+def rollup_rows(session):
+    counts = session.execute(select(JobPostingDailyRollup.day, JobPostingDailyRollup.keyword,
+                                    JobPostingDailyRollup.source_id, JobPostingDailyRollup.location,
+                                    JobPostingDailyRollup.job_count)).all()
+    salaries = session.execute(select(SalaryDailyRollup.day, SalaryDailyRollup.keyword,
+                                      SalaryDailyRollup.source_id, SalaryDailyRollup.salary_sum)).all()
+    return sorted(counts), sorted(salaries)
+
+
+def test_new_postings_are_counted_once(session):
+    jobs = [
+        {"title": "Python Developer", "location": "Remote", "date_posted": "today", "salary": "$100,000"},
+        {"title": "Data Engineer", "location": "Berlin", "date_posted": "2 days ago", "salary": "$80k"},
+        {"title": "QA Engineer", "location": "Remote", "date_posted": "soon"},
+    ]
+    store(session, jobs)
+    store(session, jobs[:1], seen_at=SEEN_AT.replace(day=11))  # a refresh, not a new posting
+
+    trends = query_trends(session, date(2025, 7, 8), date(2025, 7, 11), keyword="python")
+    assert [point["job_count"] for point in trends["series"]] == [1, 0, 2, 0]
+    assert trends["total_jobs"] == 3
+    assert trends["salary"]["count"] == 2
+    assert trends["salary"]["median"] == 90_000
+
+    remote = query_trends(session, date(2025, 7, 8), date(2025, 7, 11), location="remote")
+    assert remote["total_jobs"] == 2 and remote["salary"] is None
+    assert query_trends(session, date(2025, 7, 8), date(2025, 7, 11), keyword="java")["total_jobs"] == 0
+
+
+def test_rebuild_matches_incremental_rollups(session, session_factory):
+    store_scrape_results(session, [(PYTHON_ORG, [
+        {"title": f"Python Developer {i}", "location": "Remote" if i % 2 else "NYC",
+         "date_posted": f"{i % 4} days ago", "salary": f"${60 + i},000" if i % 3 else None}
+        for i in range(25)
+    ])], keyword="python")
+    store(session, [{"title": "Go Developer", "date_posted": "April 1, 2025", "salary": "$50/hr"}], keyword="go")
+    incremental = rollup_rows(session)
+
+    summary = rebuild_rollups(session_factory, chunk_size=4, workers=3)
+    assert summary["chunks"] > 1
+    assert summary["postings"] == session.query(JobPosting).count()
+    assert rollup_rows(session) == incremental
+
+    # Rebuilding a range leaves the other days alone
+    rebuild_rollups(session_factory, start=date(2025, 4, 1), end=date(2025, 4, 1), chunk_size=10)
+    assert rollup_rows(session) == incremental
+
+
+def test_trends_endpoint(session):
+    store(session, [{"title": "Python Developer", "date_posted": "today"}])
+    app.dependency_overrides[get_db] = lambda: session
+    try:
+        client = TestClient(app)
+        response = client.get("/api/analytics/trends",
+                              params={"start": "2025-07-09", "end": "2025-07-10", "keyword": "python"})
+        assert response.status_code == 200
+        assert response.json()["series"] == [{"date": "2025-07-09", "job_count": 0},
+                                             {"date": "2025-07-10", "job_count": 1}]
+        bad = client.get("/api/analytics/trends", params={"start": "2025-07-10", "end": "2025-07-01"})
+        assert bad.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from src.scrapers import scheduler
+from src.scrapers.scheduler import BATCH, INTERACTIVE, ClassExecutor, SchedulerFull
+from src.scrapers.static_scraper import parse_static_jobs
+
+
+@pytest.fixture
+def blocked_executor():
+    executor = ClassExecutor("test", workers=1, batch_workers=1, max_queue=3)
+    release = threading.Event()
+    executor.submit(release.wait, priority=BATCH)
+    yield executor, release
+    release.set()
+    executor.shutdown()
+
+
+def test_interactive_tasks_run_before_queued_batch(blocked_executor):
+    executor, release = blocked_executor
+    order = []
+    batch = executor.submit(order.append, "batch", priority=BATCH)
+    interactive = executor.submit(order.append, "interactive", priority=INTERACTIVE)
+    release.set()
+    batch.result(timeout=5)
+    interactive.result(timeout=5)
+    assert order == ["interactive", "batch"]
+
+
+def test_queue_limit_rejects_tasks(blocked_executor):
+    executor, _ = blocked_executor
+    deadline = time.time() + 5
+    while executor.metrics()["running"] != 1 and time.time() < deadline:
+        time.sleep(0.01)
+    for _ in range(3):
+        executor.submit(time.sleep, 0)
+    with pytest.raises(SchedulerFull):
+        executor.submit(time.sleep, 0)
+    metrics = executor.metrics()
+    assert metrics["queued"] == 3
+    assert metrics["rejected"] == 1
+
+
+def test_batch_quota_keeps_a_worker_for_interactive():
+    executor = ClassExecutor("test", workers=2, batch_workers=1)
+    release = threading.Event()
+    try:
+        executor.submit(release.wait, priority=BATCH)
+        second_batch = executor.submit(lambda: "batch", priority=BATCH)
+        interactive = executor.submit(lambda: "interactive", priority=INTERACTIVE)
+        assert interactive.result(timeout=5) == "interactive"
+        assert not second_batch.done()
+        release.set()
+        assert second_batch.result(timeout=5) == "batch"
+        metrics = executor.metrics()
+        assert metrics["completed"] == 3
+        assert metrics["wait_seconds_max"] > 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_failures_are_counted_and_raised():
+    executor = ClassExecutor("test", workers=1)
+    try:
+        future = executor.submit(lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            future.result(timeout=5)
+        assert executor.metrics()["failed"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_scrape_sources_routes_by_source_type(monkeypatch):
+    html = b"<ul><li class='job'><h2>Data Engineer</h2><span class='co'>Acme</span></li></ul>"
+    monkeypatch.setattr(scheduler, "get_scheduler_quotas", lambda: {
+        "io": {"workers": 2, "batch_workers": 2, "max_queue": 10},
+        "browser": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+        "cpu": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+    })
+    monkeypatch.setattr(scheduler, "_fetch_static", lambda url, source_id: html)
+    monkeypatch.setattr(scheduler, "_scrape_api", lambda url, mapping, src_id: [{"title": "API job"}])
+    sources = {
+        "board": {"id": "board", "name": "Board", "type": "static", "search_url": "https://board/{keyword}",
+                  "selectors": {"job_selector": "li.job", "title": "h2", "company": "span.co"}},
+        "feed": {"id": "feed", "name": "Feed", "type": "api", "api_url": "https://feed/{keyword}",
+                 "data_mapping": {"title": "name"}},
+    }
+    try:
+        results = scheduler.scrape_sources(sources, ["feed", "missing", "board"], "python",
+                                           priority=INTERACTIVE)
+        assert [src["id"] for src, _ in results] == ["feed", "board"]
+        assert results[0][1] == [{"title": "API job", "source": "Feed"}]
+        assert results[1][1] == [{"title": "Data Engineer", "company": "Acme", "source": "Board",
+                                  "url": "https://board/python"}]
+        metrics = scheduler.scheduler_metrics()
+        assert metrics["io"]["completed"] == 2
+        assert metrics["cpu"]["completed"] == 1
+    finally:
+        scheduler.shutdown_scheduler()
+
+
+def test_parse_static_jobs():
+    html = "<div class='job'><h2>Analyst</h2><p class='emp'>Full-time</p><p class='emp'>$50,000</p></div>"
+    jobs = parse_static_jobs(html, "div.job", {"title": "h2",
+                                               "employment_type": {"type": "multiple", "selector": "p.emp"}})
+    assert jobs == [{"title": "Analyst", "employment_type": ["Full-time", "$50,000"], "salary": "$50,000"}]
+
+
+def test_quotas_keep_a_worker_free_for_interactive_scrapes(monkeypatch):
+    quotas = scheduler.get_scheduler_quotas()
+    assert all(quota["batch_workers"] < quota["workers"] for quota in quotas.values())
+
+    monkeypatch.setattr(scheduler, "get_config", lambda: {"scheduler": {"cpu": {"workers": 4, "batch_workers": 4}}})
+    with pytest.raises(ValueError, match="cpu"):
+        scheduler.get_scheduler_quotas()
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data.models import Base, JobPosting
+from src.data.job_store import store_scrape_results, upsert_job_postings
+from src.data.search import search_job_postings
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def stored_jobs(session):
+    python_org = {"id": "python_org", "name": "Python.org", "search_url": "https://www.python.org/jobs/"}
+    zip_recruiter = {"id": "ziprecruiter", "name": "ZipRecruiter", "search_url": "https://www.ziprecruiter.com/"}
+    store_scrape_results(session, [
+        (python_org, [
+            {"title": "Senior Python Developer", "company": "Company A", "location": "Remote",
+             "description": "Django and FastAPI services"},
+            {"title": "Data Engineer", "company": "Company B", "location": "Berlin",
+             "description": "Pipelines in Python and Spark"},
+        ]),
+        (zip_recruiter, [
+            {"title": "Python Engineer", "company": "Company C", "location": "Remote, US",
+             "description": "Backend work"},
+            {"title": "Frontend Developer", "company": "Company D", "location": "Remote",
+             "description": "React and TypeScript"},
+        ]),
+    ])
+
+
+def test_title_matches_rank_above_description_matches(session, stored_jobs):
+    results = search_job_postings(session, "python")["results"]
+    titles = [job["title"] for job in results]
+    assert set(titles) == {"Senior Python Developer", "Python Engineer", "Data Engineer"}
+    assert titles[-1] == "Data Engineer"
+
+
+def test_stemming_and_multiple_terms(session, stored_jobs):
+    results = search_job_postings(session, "developers remote")["results"]
+    assert {job["title"] for job in results} == {"Senior Python Developer", "Frontend Developer"}
+
+
+def test_filters(session, stored_jobs):
+    assert [job["title"] for job in search_job_postings(session, "python", source="ziprecruiter")["results"]] == \
+        ["Python Engineer"]
+    assert [job["title"] for job in search_job_postings(session, "python", location="berlin")["results"]] == \
+        ["Data Engineer"]
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+    assert search_job_postings(session, "python", posted_after=tomorrow)["results"] == []
+
+
+def test_date_filters_use_parsed_posting_date(session):
+    seen_at = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    upsert_job_postings(session, [
+        {"title": "Python Developer", "date_posted": "30+ days ago"},
+        {"title": "Python Engineer", "date_posted": "today"},
+        {"title": "Python Tester", "date_posted": "unknown"},
+    ], seen_at=seen_at)
+    session.commit()
+    recent = search_job_postings(session, "python", posted_after=seen_at - timedelta(days=7))["results"]
+    assert {job["title"] for job in recent} == {"Python Engineer", "Python Tester"}
+    older = search_job_postings(session, "python", posted_before=seen_at - timedelta(days=7))["results"]
+    assert [job["title"] for job in older] == ["Python Developer"]
+
+
+def test_cursor_pagination_visits_every_match_once(session, stored_jobs):
+    seen = []
+    cursor = None
+    while True:
+        page = search_job_postings(session, "python", limit=1, cursor=cursor)
+        seen += [job["id"] for job in page["results"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 3
+    assert len(set(seen)) == 3
+
+
+def test_index_follows_updates(session, stored_jobs):
+    upsert_job_postings(session, [{"title": "Frontend Developer", "company": "Company D", "location": "Remote",
+                                   "description": "Now with Rust"}])
+    session.commit()
+    assert session.query(JobPosting).count() == 4
+    assert search_job_postings(session, "react")["results"] == []
+    assert [job["title"] for job in search_job_postings(session, "rust")["results"]] == ["Frontend Developer"]
+
+
+def test_invalid_cursor_and_query(session, stored_jobs):
+    with pytest.raises(ValueError):
+        search_job_postings(session, "python", cursor="not-a-cursor")
+    assert search_job_postings(session, "!!!")["results"] == []
@@ -0,0 +1,153 @@
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from src.scrapers import selenium_scraper
+from src.scrapers.selenium_scraper import EXTRACT_JOBS_SCRIPT, SeleniumScraper, parse_dynamic_jobs
+
+PAGE = ("<ul><li class='job'><h2 class='title'>Data Engineer</h2><span class='co'>Data Engineer Acme</span></li>"
+        "<li class='job'><h2 class='title'>Analyst</h2><span class='co'>Globex</span></li></ul>")
+
+
+class FakeDriver:
+    """WebDriver stand-in; `cards` is what the extraction script returns (an exception is raised)."""
+
+    cards = []
+
+    def __init__(self, *args, **kwargs):
+        self.scripts = []
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if script != EXTRACT_JOBS_SCRIPT:
+            return 1000
+        if isinstance(self.cards, Exception):
+            raise self.cards
+        return [dict(card) for card in self.cards]
+
+    def execute_cdp_cmd(self, command, params):
+        pass
+
+    def get_log(self, log_type):
+        return []
+
+    @property
+    def page_source(self):
+        return PAGE
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    def no_driver_manager():
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(selenium_scraper, "ChromeDriverManager", no_driver_manager)
+    monkeypatch.setattr(selenium_scraper.webdriver, "Chrome", FakeDriver)
+    monkeypatch.setattr(selenium_scraper.time, "sleep", lambda seconds: None)
+    scraper = SeleniumScraper(delay_range=(0, 0))
+    yield scraper
+    scraper.close()
+
+
+FIELDS = {"title": "h2.title", "company": "span.co"}
+
+
+def test_cards_are_extracted_in_the_browser(scraper, monkeypatch):
+    monkeypatch.setattr(FakeDriver, "cards", [{"title": "Data Engineer", "company": "Data Engineer Acme"},
+                                              {"title": "Analyst", "company": "Globex"}])
+    jobs, seconds, stats = scraper.scrape_page("https://board.example/jobs", "li.job", FIELDS, scroll_count=1)
+
+    assert jobs == [{"title": "Data Engineer", "company": "Acme"}, {"title": "Analyst", "company": "Globex"}]
+    assert stats is None
+    assert seconds > 0
+    assert (EXTRACT_JOBS_SCRIPT, ("li.job", FIELDS)) in scraper.driver.scripts
+
+
+def test_failed_extraction_falls_back_to_the_page_source(scraper, monkeypatch):
+    monkeypatch.setattr(FakeDriver, "cards", JavascriptException("blocked by CSP"))
+    jobs, _, stats = scraper.scrape_page("https://board.example/jobs", "li.job", FIELDS, scroll_count=1)
+
+    assert jobs == parse_dynamic_jobs(PAGE, "li.job", FIELDS)
+    assert jobs[0] == {"title": "Data Engineer", "company": "Acme"}
+    assert stats is not None
+
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# Cards exercising the field mapping: nested markup, whitespace, scripts
+# inside a card, missing fields, a company repeating the title and
+# LinkedIn's visually hidden title text
+BOARD_PAGE = """<html><body><script>window.jobs = "<li class='job_result'>";</script><ul>
+<li class="job_result"><h2 class="job_title"><a href="/j/1">
+    Python Developer </a></h2><span class="company_name">Python Developer <b>Acme</b>
+    <script>track()</script></span><span class="location">Remote</span><span class="job_age">2 days ago</span></li>
+<li class="job_result"><h2 class="job_title"><a href="/j/2">Data Engineer</a></h2>
+    <span class="location">Berlin, <i>DE</i></span></li>
+</ul>
+<div class="base-card"><h3 class="artdeco-entity-lockup__title"><a href="/j/3">
+    <span aria-hidden="true">Analyst</span><span class="visually-hidden">Analyst (verified)</span></a></h3>
+    <h4 class="company">Globex</h4></div>
+</body></html>"""
+BOARD_FIELDS = {"title": ".job_title", "company": ".company_name", "location": ".location",
+                "date_posted": ".job_age", "url": ".job_title a"}
+LINKEDIN_FIELDS = {"title": ".artdeco-entity-lockup__title a", "company": ".company"}
+
+
+@pytest.fixture(scope="module")
+def chrome():
+    """A real headless Chrome; the tests using it are skipped where there is none."""
+    import shutil
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+
+    binary = next((path for path in map(shutil.which, CHROME_BINARIES) if path), None)
+    if binary is None:
+        pytest.skip("Chrome is not installed")
+    options = Options()
+    options.binary_location = binary
+    for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"):
+        options.add_argument(argument)
+    try:
+        driver = webdriver.Chrome(options=options)
+    except WebDriverException as e:
+        pytest.skip(f"Chrome could not be started: {e.msg}")
+    yield driver
+    driver.quit()
+
+
+def python_org_source():
+    from src.utils.helpers import load_sources_config
+
+    selectors = dict(load_sources_config()["python_org"]["selectors"])
+    return selectors.pop("job_selector"), selectors
+
+
+@pytest.mark.parametrize("page, job_selector, fields", [
+    ("python_org", None, None),
+    (BOARD_PAGE, ".job_result", BOARD_FIELDS),
+    (BOARD_PAGE, ".base-card", LINKEDIN_FIELDS),
+])
+def test_extraction_script_matches_beautifulsoup(chrome, tmp_path, page, job_selector, fields):
+    from pathlib import Path
+    from src.scrapers.parse_cache import clear_parse_caches
+    from src.scrapers.selenium_scraper import clean_dynamic_job
+
+    if page == "python_org":
+        page = (Path(__file__).parents[2] / "benchmarks" / "scrapers" / "fixtures" / "python_org.html").read_text()
+        job_selector, fields = python_org_source()
+    path = tmp_path / "listing.html"
+    path.write_text(page, encoding="utf-8")
+    chrome.get(path.as_uri())
+
+    in_browser = [clean_dynamic_job(job) for job in chrome.execute_script(EXTRACT_JOBS_SCRIPT, job_selector, fields)]
+    clear_parse_caches()
+    parsed = parse_dynamic_jobs(page, job_selector, fields)
+
+    assert parsed
+    assert in_browser == parsed
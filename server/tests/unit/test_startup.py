@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import src.api.v1 as api
+from src.supabase.supabase import SupabaseConfig
+
+
+def test_api_import_leaves_backends_unloaded():
+    code = ("import sys, src.api; "
+            "print(sorted(m for m in ('selenium', 'bs4', 'webdriver_manager', 'supabase', 'matplotlib', 'pandas') "
+            "if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+@patch.dict('os.environ', {'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_ANON_KEY': 'test-anon-key'})
+def test_supabase_client_created_on_first_use():
+    with patch('supabase.create_client') as create_client:
+        config = SupabaseConfig()
+        create_client.assert_not_called()
+        assert config.get_client() is create_client.return_value
+        config.get_client()
+        create_client.assert_called_once_with('https://test.supabase.co', 'test-anon-key')
+
+
+def test_lifespan_runs_warm_up_when_enabled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(api, "get_config", lambda: {"api": {"warmup": True}})
+    monkeypatch.setattr(api, "warm_up", lambda: calls.append("warm_up"))
+    monkeypatch.setattr(api, "shutdown_render_pool", lambda wait=True: calls.append("shutdown"))
+    with TestClient(api.app) as client:
+        assert client.get("/api/").status_code == 200
+    assert calls == ["warm_up", "shutdown"]
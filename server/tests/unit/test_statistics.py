@@ -0,0 +1,70 @@
+import math
+import pytest
+from src.analysis.statistics import (
+    extract_numeric_salaries,
+    extract_numeric_salary,
+    generate_basic_stats,
+    parse_salaries,
+    parse_salary_text,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$70,000 - $80,000 per year", 75_000),
+    ("USD 120000 annually", 120_000),
+    ("€50k", 50_000),
+    ("$70-80k", 75_000),
+    ("£40 - £50 per hour", 45 * 2080),
+    ("$25/hr", 25 * 2080),
+    ("5.000 € / month", 60_000),
+    ("$1.2M", 1_200_000),
+    ("50,000 per year", 50_000),
+    ("Not disclosed", None),
+    ("", None),
+    (None, None),
+])
+def test_extract_numeric_salary(text, expected):
+    assert extract_numeric_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", ["401k match", "2 years experience", "40 hours per week", "Python 3"])
+def test_numbers_that_are_not_pay_are_ignored(text):
+    assert parse_salary_text(text) is None
+
+
+def test_hours_per_week_do_not_set_the_pay_period():
+    assert parse_salary_text("30-40 hours per week, $20/hr") == (20, 20, "hour", "USD")
+    assert parse_salary_text("3+ years, $120k + 401k match") == (120_000, 120_000, "year", "USD")
+
+
+def test_small_amount_without_period_is_not_assumed_hourly():
+    assert parse_salary_text("$25") is None
+
+
+def test_mixed_currencies_are_not_averaged():
+    assert parse_salary_text("$50,000 - €45,000") is None
+
+
+def test_column_parse_matches_single_values():
+    values = ["€50k", None, "$70-80k", "Not disclosed", "€50k", "USD 120000 annually"]
+    result = parse_salaries(values)
+    assert list(result["currency"]) == ["EUR", None, "USD", None, "EUR", "USD"]
+    assert list(result["period"]) == ["year", None, "year", None, "year", "year"]
+    mids = extract_numeric_salaries(values)
+    for value, mid in zip(values, mids):
+        single = extract_numeric_salary(value)
+        assert (single is None and math.isnan(mid)) or single == mid
+
+
+def test_basic_stats_summarize_salaries():
+    stats = generate_basic_stats([
+        {"title": "python developer", "company": "A", "salary": "$80,000"},
+        {"title": "python developer", "company": "B", "salary": "$100,000"},
+        {"title": "data engineer", "company": "B", "salary": None},
+    ])
+    assert stats["total_jobs"] == 3
+    assert stats["unique_companies"] == 2
+    assert stats["top_titles"] == {"python developer": 2, "data engineer": 1}
+    salary = {key: value for key, value in stats["salary"].items() if key != "percentiles"}
+    assert salary == {"count": 2, "mean": 90_000, "median": 90_000, "min": 80_000, "max": 100_000}
+    assert stats["salary"]["percentiles"]["p50"] == 90_000
@@ -0,0 +1,67 @@
+import json
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.analysis.statistics import generate_basic_stats
+from src.analysis.streaming import KLLSketch, StreamingStats, report_stats
+from src.data.models import Base, User, UserReport
+
+
+def rank_error(sketch, data, fractions):
+    ordered = np.sort(data)
+    ranks = np.searchsorted(ordered, sketch.quantiles(fractions)) / len(ordered)
+    return np.abs(ranks - np.asarray(fractions)).max()
+
+
+def test_sketch_is_exact_until_it_compacts():
+    sketch = KLLSketch().update([3.0, 1.0, np.nan, 2.0, 4.0])
+    assert sketch.count == 4
+    assert sketch.quantile(0.5) == 2.5
+    assert (sketch.min, sketch.max) == (1.0, 4.0)
+
+
+def test_merged_sketches_stay_accurate_and_small():
+    data = np.random.default_rng(0).lognormal(11, 0.5, 200_000)
+    merged = KLLSketch()
+    for chunk in np.array_split(data, 8):
+        merged.merge(KLLSketch().update(chunk))
+    fractions = [0.01, 0.1, 0.5, 0.9, 0.99]
+    assert merged.count == len(data)
+    assert sum(len(level) for level in merged.levels) < 1000
+    assert rank_error(merged, data, fractions) < 0.02
+
+    restored = KLLSketch.from_dict(json.loads(json.dumps(merged.to_dict())))
+    assert np.array_equal(restored.quantiles(fractions), merged.quantiles(fractions))
+
+
+def test_incremental_updates_match_a_full_recompute():
+    batches = [
+        [{"title": "python developer", "company": "A", "source": "LinkedIn", "salary": "$80,000"},
+         {"title": "data engineer", "company": "B", "source": "LinkedIn", "salary": None}],
+        [{"title": "python developer", "company": "B", "location": "Remote", "salary": "$100k"}],
+    ]
+    incremental = StreamingStats()
+    for batch in batches:
+        worker = StreamingStats.from_json(StreamingStats().update(batch).to_json())
+        incremental.merge(worker)
+    assert incremental.summary() == generate_basic_stats(batches[0] + batches[1])
+    assert incremental.summary()["top_titles"] == {"python developer": 2, "data engineer": 1}
+
+
+def test_report_stats_are_backfilled_once():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="a@example.com", username="a", hashed_password="x")
+    session.add(user)
+    session.flush()
+    report = UserReport(user_id=user.id, title="Legacy",
+                        jobs_data=json.dumps([{"title": "qa engineer", "salary": "$50/hr"}, "junk"]))
+    session.add(report)
+    session.commit()
+
+    assert report.stats_data is None
+    assert report_stats(report).summary()["salary"]["median"] == 50 * 2080
+    session.commit()
+    assert StreamingStats.from_json(session.get(UserReport, report.id).stats_data).total_jobs == 1
+    session.close()
@@ -0,0 +1,104 @@
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from src.api import app
+from src.api.v1 import actions
+from src.scrapers import scheduler
+from src.scrapers.scheduler import INTERACTIVE
+from src.scrapers.static_scraper import StaticScraper
+from src.utils.tracing import record_span, setup_tracing, tracer
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    exporter = InMemorySpanExporter()
+    setup_tracing(exporter)
+    return exporter
+
+
+@pytest.fixture
+def spans(exporter):
+    exporter.clear()
+    return exporter.get_finished_spans
+
+
+def test_fetch_attempts_backoff_and_delay_are_spans(spans, monkeypatch):
+    responses = iter([FakeResponse(503), FakeResponse(200, b"<html></html>")])
+    scraper = StaticScraper(max_retries=2, delay_range=(0, 0))
+    monkeypatch.setattr(scraper.session, "request", lambda **kwargs: next(responses))
+    monkeypatch.setattr("src.scrapers.base_scraper.time.sleep", lambda seconds: None)
+
+    with tracer.start_as_current_span("test.scrape") as parent:
+        assert scraper.fetch_page("https://board.example/jobs") == b"<html></html>"
+
+    finished = {span.name: [] for span in spans()}
+    for span in spans():
+        finished[span.name].append(span)
+    assert [span.attributes["http.response.status_code"] for span in finished["GET"]] == [503, 200]
+    assert [span.attributes["http.request.resend_count"] for span in finished["GET"]] == [0, 1]
+    assert finished["GET"][0].attributes["error.type"] == "503"
+    assert len(finished["scrape.backoff"]) == 1
+    assert len(finished["scrape.delay"]) == 1
+    trace_id = parent.get_span_context().trace_id
+    assert all(span.context.trace_id == trace_id for span in spans())
+
+
+def test_scheduled_scrape_spans_join_the_callers_trace(spans, monkeypatch):
+    monkeypatch.setattr(scheduler, "get_scheduler_quotas", lambda: {
+        "io": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+        "browser": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+        "cpu": {"workers": 1, "batch_workers": 1, "max_queue": 10},
+    })
+
+    def fetch(url, source_id):
+        with tracer.start_as_current_span("GET"):
+            return b"<ul><li class='job'><h2>Data Engineer</h2></li></ul>"
+
+    monkeypatch.setattr(scheduler, "_fetch_static", fetch)
+    sources = {"board": {"id": "board", "name": "Board", "type": "static", "search_url": "https://board/{keyword}",
+                         "selectors": {"job_selector": "li.job", "title": "h2"}}}
+    try:
+        with tracer.start_as_current_span("test.request") as parent:
+            results = scheduler.scrape_sources(sources, ["board"], "python", priority=INTERACTIVE)
+    finally:
+        scheduler.shutdown_scheduler()
+
+    assert results[0][1][0]["title"] == "Data Engineer"
+    by_name = {span.name: span for span in spans()}
+    source = by_name["scrape.source"]
+    assert source.parent.span_id == parent.get_span_context().span_id
+    assert source.attributes["talenttrek.source"] == "board"
+    # Fetched on an io thread, parsed in a pool process: both still children of the source
+    assert by_name["GET"].parent.span_id == source.context.span_id
+    assert by_name["scrape.parse"].parent.span_id == source.context.span_id
+    assert by_name["scrape.parse"].attributes["talenttrek.jobs"] == 1
+
+
+def test_debug_header_returns_server_timing(spans, monkeypatch):
+    def scrape_sources(sources, source_ids, keyword, priority):
+        with tracer.start_as_current_span("scrape.source"):
+            record_span("scrape.parse", 0.02)
+        return []
+
+    monkeypatch.setattr(actions, "scrape_sources", scrape_sources)
+    client = TestClient(app)
+    payload = {"keyword": "python", "sources": ["python_org"]}
+
+    response = client.post("/api/scrape/jobs", json=payload, headers={"X-Debug-Timing": "1"})
+    timing = response.headers["Server-Timing"]
+    assert "scrape.source;dur=" in timing
+    assert "scrape.parse;dur=2" in timing
+    assert "total;dur=" in timing
+
+    assert "Server-Timing" not in client.post("/api/scrape/jobs", json=payload).headers
+    server_spans = [span for span in spans() if span.name == "POST /api/scrape/jobs"]
+    assert len(server_spans) == 2
+    assert server_spans[0].attributes["http.route"] == "/api/scrape/jobs"
+    assert server_spans[0].attributes["http.response.status_code"] == 200
@@ -0,0 +1,29 @@
+import numpy as np
+from datetime import datetime, timezone
+from src.analysis.trends import generate_time_trends, normalize_dates, parse_date
+
+REFERENCE = datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+
+
+def test_normalize_dates_matches_parse_date():
+    values = ["today", "2 days ago", "April 10, 2025", 1719792000000, "1719792000000", None, "garbage",
+              "2 days ago", "Posted 3 weeks ago", "yesterday", "2025-06-30"]
+    result = normalize_dates(values, reference=REFERENCE)
+    assert result.dtype == np.dtype("datetime64[us]")
+    for value, normalized in zip(values, result.tolist()):
+        assert normalized == parse_date(value, reference=REFERENCE)
+    assert result[1] == np.datetime64("2025-06-29T12:00:00")
+    assert result[3] == np.datetime64("2024-07-01T00:00:00")
+    assert np.isnat(result[5]) and np.isnat(result[6])
+
+
+def test_trends_prefer_stored_posted_at():
+    jobs = [
+        {"date_posted": "today", "posted_at": datetime(2025, 6, 1)},
+        {"date_posted": "1 day ago"},
+        {"date_posted": "yesterday"},
+        {"date_posted": None},
+    ]
+    trends = generate_time_trends(jobs, reference=REFERENCE)
+    assert trends["date"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-01", "2025-06-30"]
+    assert trends["job_count"].tolist() == [1, 2]